@@ -0,0 +1,186 @@
+"""
+Timetable analytics for PyAutoScheduler.
+
+The statistics of a professor are computed from the clock time of their
+lectures, as lecture numbers of departments with other start times or
+lecture lengths are different times. NumPy is optional: when it is installed
+the lectures are kept in flat arrays sorted by professor, day and start, and
+the statistics are grouped reductions over them; without it the same numbers
+are computed with plain Python loops. Scheduling itself and the timetable
+score do not use NumPy.
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class LectureIntervals:
+    """
+    NumPy arrays of the lectures of every professor by clock time.
+
+    Entry `i` is one lecture of professor `professors[i]` (by interned ID in
+    the timetable) on day `days[i]`, from minute `starts[i]` to `ends[i]`
+    since midnight. Entries are sorted by professor, day and start.
+    """
+
+    def __init__(self, timetable, slot_interval) -> None:
+        if np is None:
+            raise ImportError("LectureIntervals needs NumPy")
+
+        self.timetable = timetable
+        entries = [
+            (prof, day_idx, *slot_interval(year, lec_num))
+            for year, year_days in zip(timetable, timetable.grid)
+            for day_idx, lectures in enumerate(year_days)
+            for lec_num, lecture in enumerate(lectures)
+            if lecture is not None
+            for prof in lecture.professors
+        ]
+        entries.sort()
+        columns = np.array(entries, dtype=np.int64).reshape(-1, 4).T
+        self.professors, self.days, self.starts, self.ends = columns
+        self.size = len(timetable.professors)
+
+    def lectures_per_professor(self):
+        """Returns the lectures per week of every professor ID."""
+        return np.bincount(self.professors, minlength=self.size)
+
+    def _day_starts(self):
+        """Returns the index of the first entry of every (professor, day)."""
+        new_day = np.ones(len(self.days), dtype=bool)
+        new_day[1:] = (self.professors[1:] != self.professors[:-1]) | (
+            self.days[1:] != self.days[:-1]
+        )
+        return np.flatnonzero(new_day)
+
+    def teaching_days(self):
+        """Returns the number of days every professor ID teaches on."""
+        return np.bincount(self.professors[self._day_starts()], minlength=self.size)
+
+    def idle_minutes(self):
+        """
+        Returns the free minutes between the start of the first and the end
+        of the last lecture of each day, summed over the week, for every
+        professor ID.
+        """
+        if not len(self.days):
+            return np.zeros(self.size, dtype=np.int64)
+
+        # shift every (professor, day) past the previous one, so a running
+        # maximum of the ends never carries over from another day
+        group = np.zeros(len(self.days), dtype=np.int64)
+        day_starts = self._day_starts()
+        group[day_starts[1:]] = 1
+        offset = np.cumsum(group) * (self.ends.max() + 1)
+        starts, ends = self.starts + offset, self.ends + offset
+
+        covered_until = np.maximum.accumulate(ends)
+        previous = np.concatenate(([0], covered_until[:-1]))
+        busy = np.maximum(ends - np.maximum(starts, previous), 0)
+
+        day_ends = np.maximum.reduceat(ends, day_starts)
+        span = day_ends - starts[day_starts]
+        idle = span - np.add.reduceat(busy, day_starts)
+        return np.bincount(
+            self.professors[day_starts], weights=idle, minlength=self.size
+        ).astype(np.int64)
+
+
+def _professor_stats(scheduler) -> dict[str, tuple[int, int, int]]:
+    """Returns (lectures, teaching days, idle minutes) per professor name."""
+    timetable = scheduler.ttlist
+    if np is not None:
+        intervals = LectureIntervals(timetable, scheduler.slot_interval)
+        return {
+            name: stats
+            for name, *stats in zip(
+                timetable.professors.names,
+                intervals.lectures_per_professor().tolist(),
+                intervals.teaching_days().tolist(),
+                intervals.idle_minutes().tolist(),
+            )
+        }
+
+    busy: dict[tuple[int, int], list[tuple[int, int]]] = {}
+    for year, year_days in zip(timetable, timetable.grid):
+        for day_idx, lectures in enumerate(year_days):
+            for lec_num, lecture in enumerate(lectures):
+                if lecture is None:
+                    continue
+                interval = scheduler.slot_interval(year, lec_num)
+                for prof in lecture.professors:
+                    busy.setdefault((prof, day_idx), []).append(interval)
+
+    stats = {name: [0, 0, 0] for name in timetable.professors.names}
+    for (prof, _), intervals in busy.items():
+        prof_stats = stats[timetable.professors.names[prof]]
+        prof_stats[0] += len(intervals)
+        prof_stats[1] += 1
+
+        intervals.sort()
+        covered_until = intervals[0][0]
+        for start, end in intervals:
+            prof_stats[2] += max(start - covered_until, 0)
+            covered_until = max(covered_until, end)
+    return {name: tuple(prof_stats) for name, prof_stats in stats.items()}
+
+
+def professor_report(scheduler) -> dict[str, dict[str, float]]:
+    """
+    Returns, for every professor, their lectures per week, teaching days,
+    utilisation (lectures in % of the week's slots of their departments)
+    and idle minutes (free time between a day's first and last lecture).
+    """
+    stats = _professor_stats(scheduler)
+    no_of_days = len(scheduler.ttlist.days)
+    report = {}
+
+    for professor in scheduler.profs:
+        lectures, days, idle = stats.get(professor, (0, 0, 0))
+        departments = scheduler.get_departments_by_prof(professor)
+        slots = max(
+            (
+                scheduler.slot_table(department).count
+                for department in departments
+                if department in scheduler.settings
+            ),
+            default=0,
+        )
+        capacity = slots * no_of_days
+        report[professor] = {
+            "lectures": lectures,
+            "days": days,
+            "utilisation": lectures / capacity * 100 if capacity else 0.0,
+            "idle_minutes": idle,
+        }
+
+    return report
+
+
+def department_report(scheduler, report: dict | None = None) -> dict[str, dict]:
+    """
+    Returns the mean utilisation and the total idle minutes of the professors
+    of every department.
+    """
+    if report is None:
+        report = professor_report(scheduler)
+
+    departments = {}
+    for department in scheduler.all_departments:
+        profs = [
+            report[prof]
+            for prof in scheduler.get_professors_by_department(department)
+            if prof in report
+        ]
+        departments[department] = {
+            "utilisation": (
+                sum(prof["utilisation"] for prof in profs) / len(profs)
+                if profs
+                else 0.0
+            ),
+            "idle_minutes": sum(prof["idle_minutes"] for prof in profs),
+        }
+
+    return departments
@@ -0,0 +1,311 @@
+"""
+Benchmarks PyAutoScheduler on synthetic institutions of increasing size.
+
+Every size is generated with `make_institution`, written out as an
+"Input Template.csv" style file and then run through CSV import,
+auto_schedule, reschedule and CSV/PDF export (PDFs one by one, across a
+process pool and as a single document). Each phase records its wall time,
+its peak memory (tracemalloc, in a second run, as tracing slows it down)
+and the fill rate of the timetable, so runs can be compared before rolling
+out to larger colleges:
+
+    python benchmark.py --sizes 6,24,96 --json benchmark.json
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+import exporter
+from scheduler import Scheduler, read_profs_csv
+
+YEARS = ("FY", "SY", "TY")
+
+
+def make_institution(
+    departments: int = 6,
+    years: tuple[str, ...] = YEARS,
+    professors: int = 8,
+    subjects_per_professor: int = 3,
+    electives: int = 1,
+    practical_slots: tuple[int, ...] = (0, 1),
+    workload: int = 4,
+    lecture_lengths: tuple[int, ...] = (40,),
+    shared: float = 0.1,
+    seed: int = 0,
+) -> tuple[dict, dict]:
+    """
+    Generates professors and settings for a synthetic institution.
+
+    Args:
+        departments (int): Number of departments.
+        years (tuple[str, ...]): College years of every department.
+        professors (int): Professors per department.
+        subjects_per_professor (int): Subjects every professor teaches.
+        electives (int): Elective groups of two professors per year.
+        practical_slots (tuple[int, ...]): Practical slots of every department.
+        workload (int): Workload of every subject.
+        lecture_lengths (tuple[int, ...]): Lecture lengths in minutes, used
+            round-robin over departments.
+        shared (float): Share of subjects taught by a professor of another
+            department.
+        seed (int): Seed of the generator.
+
+    Returns:
+        tuple[dict, dict]: The professors and settings dicts.
+    """
+    rng = random.Random(seed)
+    profs: dict[str, dict[str, list]] = {}
+    settings: dict[str, dict] = {}
+    all_names = [
+        [f"Prof {dept}-{idx}" for idx in range(professors)]
+        for dept in range(departments)
+    ]
+
+    for dept in range(departments):
+        department = f"D{dept:03d}"
+        minutes_lecture = lecture_lengths[dept % len(lecture_lengths)]
+        end_minute = 7 * 60 + 20 + 6 * minutes_lecture
+        settings[department] = {
+            "start_time": "07:20",
+            "end_time": f"{end_minute // 60:02d}:{end_minute % 60:02d}",
+            "minutes_lecture": minutes_lecture,
+            "practical_slots": list(practical_slots),
+        }
+
+        for idx, own_name in enumerate(all_names[dept]):
+            for subject_idx in range(subjects_per_professor):
+                name = own_name
+                if departments > 1 and rng.random() < shared:
+                    other = rng.choice([d for d in range(departments) if d != dept])
+                    name = rng.choice(all_names[other])
+                year = f"{years[(idx + subject_idx) % len(years)]} {department}"
+                subject = {
+                    "Type": (
+                        "Practical"
+                        if subject_idx == 0 and practical_slots
+                        else "Theory"
+                    ),
+                    "Workload": workload,
+                    "Subject": f"Subject {dept}-{idx}-{subject_idx}",
+                }
+                profs.setdefault(name, {}).setdefault(year, []).append(subject)
+
+        for year_name in years:
+            year = f"{year_name} {department}"
+            teaching = [name for name in all_names[dept] if year in profs.get(name, {})]
+            for group in range(min(electives, len(teaching) // 2)):
+                first, second = teaching[2 * group], teaching[2 * group + 1]
+                first_sub = {
+                    "Type": "Theory",
+                    "Workload": workload,
+                    "Subject": f"Elective {dept}-{year_name}-{group}-A",
+                }
+                second_sub = {
+                    "Type": "Theory",
+                    "Workload": workload,
+                    "Subject": f"Elective {dept}-{year_name}-{group}-B",
+                }
+                first_sub["Options"] = {second: second_sub["Subject"]}
+                second_sub["Options"] = {first: first_sub["Subject"]}
+                profs[first][year].append(first_sub)
+                profs[second][year].append(second_sub)
+
+    return profs, settings
+
+
+def write_csv(profs: dict, csv_file: str) -> None:
+    """Writes professors as an "Input Template.csv" style file."""
+    written: set = set()
+
+    with open(csv_file, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(
+            [
+                "Subject",
+                "Professor",
+                "Department",
+                "College Year",
+                "Subject Type",
+                "Workload",
+            ]
+        )
+        for professor, years in profs.items():
+            for year, subjects in years.items():
+                college_year, department = year.split(" ", 1)
+                for sub in subjects:
+                    members = [(professor, sub["Subject"])]
+                    members += list(sub.get("Options", {}).items())
+                    key = (year, sub["Type"], frozenset(members))
+                    if key in written:
+                        continue
+                    written.add(key)
+                    writer.writerow(
+                        [
+                            "/".join(subject for _, subject in members),
+                            "/".join(prof for prof, _ in members),
+                            department,
+                            college_year,
+                            sub["Type"],
+                            sub.get("Workload", ""),
+                        ]
+                    )
+
+
+def measure(phase: str, func, scheduler=None, setup=None) -> dict:
+    """
+    Runs a phase and returns its wall time, peak memory and fill rate.
+
+    tracemalloc slows allocation-heavy phases down several times over, so the
+    wall time comes from an untraced run and the peak memory from a second,
+    traced one. `setup` is called before each run, so both start from the
+    same state.
+    """
+    if setup is not None:
+        setup()
+    start = time.perf_counter()
+    func()
+    wall = time.perf_counter() - start
+
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    result = {"phase": phase, "seconds": round(wall, 4), "peak_kb": peak // 1024}
+    if scheduler is not None and len(scheduler.ttlist):
+        result["fill_rate"] = round(scheduler.tt_score_calc()[2], 2)
+    return result
+
+
+def run_size(departments: int, args, directory: str) -> list[dict]:
+    """Benchmarks every phase for one institution size."""
+    profs, settings = make_institution(
+        departments=departments,
+        years=tuple(args.years),
+        professors=args.professors,
+        subjects_per_professor=args.subjects,
+        electives=args.electives,
+        practical_slots=tuple(args.practical_slots),
+        workload=args.workload,
+        lecture_lengths=tuple(args.lecture_lengths),
+        seed=args.seed,
+    )
+    csv_file = os.path.join(directory, "institution.csv")
+    write_csv(profs, csv_file)
+
+    scheduler = Scheduler(profs, settings)
+    results = [
+        measure("csv_import", lambda: read_profs_csv(csv_file)),
+        measure("auto_schedule", scheduler.auto_schedule, scheduler),
+    ]
+
+    busiest = max(
+        scheduler.profs,
+        key=lambda prof: sum(map(len, scheduler.get_lec_number(prof, "Mon").values())),
+    )
+    results.append(
+        measure(
+            "reschedule",
+            lambda: scheduler.reschedule(busiest, "Mon"),
+            scheduler,
+            setup=scheduler.auto_schedule,
+        )
+    )
+
+    def export_all(export) -> None:
+        for year in scheduler.all_years:
+            export(scheduler, year, directory)
+
+    results.append(measure("csv_export", lambda: export_all(exporter.export_csv)))
+    if not args.skip_pdf:
+        try:
+            results.append(
+                measure("pdf_export", lambda: export_all(exporter.export_pdf))
+            )
+            results.append(
+                measure(
+                    "pdf_parallel",
+                    lambda: exporter.export_pdfs(
+                        scheduler, scheduler.all_years, directory
+                    ),
+                )
+            )
+            results.append(
+                measure(
+                    "pdf_master",
+                    lambda: exporter.export_master_pdf(
+                        scheduler, scheduler.all_years, directory
+                    ),
+                )
+            )
+        except ImportError:
+            print("reportlab is not installed, skipping pdf_export")
+
+    for result in results:
+        result.update(
+            departments=departments,
+            professors=len(profs),
+            years=len(scheduler.all_years),
+        )
+    return results
+
+
+def main() -> None:
+    """Runs the benchmark suite from the command line."""
+
+    def int_list(text: str) -> list[int]:
+        return [int(value) for value in text.split(",") if value]
+
+    def str_list(text: str) -> list[str]:
+        return [value.strip() for value in text.split(",") if value.strip()]
+
+    parser = argparse.ArgumentParser(description="PyAutoScheduler benchmarks")
+    parser.add_argument("--sizes", type=int_list, default=[6, 24, 96])
+    parser.add_argument(
+        "--years",
+        type=str_list,
+        default=list(YEARS),
+        help="comma separated college years of every department",
+    )
+    parser.add_argument("--professors", type=int, default=8)
+    parser.add_argument("--subjects", type=int, default=3)
+    parser.add_argument("--electives", type=int, default=1)
+    parser.add_argument("--practical-slots", type=int_list, default=[0, 1])
+    parser.add_argument("--workload", type=int, default=4)
+    parser.add_argument("--lecture-lengths", type=int_list, default=[40, 50, 60])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-pdf", action="store_true")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    results = []
+    print(
+        f"{'depts':>6} {'profs':>6} {'phase':<14} {'seconds':>9} {'peak KB':>9} {'fill %':>7}"
+    )
+    for departments in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            for result in run_size(departments, args, directory):
+                results.append(result)
+                print(
+                    f"{result['departments']:>6} {result['professors']:>6} "
+                    f"{result['phase']:<14} {result['seconds']:>9.4f} "
+                    f"{result['peak_kb']:>9} {result.get('fill_rate', ''):>7}"
+                )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
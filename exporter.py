@@ -0,0 +1,485 @@
+"""
+CSV and PDF export of timetables.
+
+CSV files only need the standard library. reportlab is imported when a PDF
+is built, so the module can be used on a server without it. `export_pdfs`
+spreads the PDFs of many years across a process pool and `export_master_pdf`
+puts them, and optionally every professor's week, into a single document.
+
+The `*_jobs` functions take the text of the files from the timetable and the
+`write_*` functions only write it, so `ExportJob` can run them in the
+background while the timetable is edited.
+"""
+
+import csv
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import as_completed
+
+
+def lecture_text(timetable, lecture) -> str:
+    """Returns the subject, type and professor of a lecture on three lines."""
+    cell = timetable.to_dict(lecture)
+    return f"{cell['subject']}\n{cell['subtype']}\n{cell['professor']}"
+
+
+def csv_rows(scheduler, year: str) -> list[list[str]]:
+    """
+    Returns the header and the time and lectures of every lecture number of a
+    year, the input of `write_csv`.
+    """
+    time_slots = scheduler.get_time_slots(scheduler.get_department_by_year(year))
+    jfile = scheduler.ttlist.year_to_json(year)
+    days = list(jfile.keys())
+    header_row = ["Time"] + days
+
+    data_rows = []
+    day_subjects = jfile.values()
+
+    for slot_time, *values in zip(time_slots, *day_subjects):
+        # * before values means receive the remaining elements as a list.
+        values2 = [f"{elem['subject']} ({elem['professor']})" for elem in values]
+        row = [slot_time] + values2
+        data_rows.append(row)
+
+    return [header_row] + data_rows
+
+
+def write_csv(rows: list[list[str]], csv_filename: str) -> str:
+    """Writes the rows of `csv_rows` to a CSV file and returns its path."""
+    with open(csv_filename, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(rows[0])  # Writing column headers
+        writer.writerows(rows[1:])  # Writing data rows
+
+    return csv_filename
+
+
+def export_csv(scheduler, year: str, directory: str = ".") -> str:
+    """
+    Exports a timetable to a CSV file for a given year.
+
+    Returns:
+        str: The path of the CSV file.
+    """
+    csv_filename = os.path.join(directory, f"{year} timetable.csv")
+    return write_csv(csv_rows(scheduler, year), csv_filename)
+
+
+def csv_jobs(scheduler, years, directory: str = ".") -> list[tuple]:
+    """
+    Returns the rows and path of the CSV file of every year, so the files can
+    be written while the timetable keeps changing.
+    """
+    return [
+        (csv_rows(scheduler, year), os.path.join(directory, f"{year} timetable.csv"))
+        for year in years
+    ]
+
+
+def write_csvs(jobs: list[tuple], progress=None) -> list[str]:
+    """
+    Writes the CSV files of `csv_jobs`.
+
+    Args:
+        jobs (list[tuple]): The rows and path of every file.
+        progress (Callable[[int, int, str], None] | None): Called with the
+            files done, the total and the path of every finished file.
+
+    Returns:
+        list[str]: The paths of the CSV files.
+    """
+    paths: list[str] = []
+    for rows, csv_filename in jobs:
+        paths.append(write_csv(rows, csv_filename))
+        if progress is not None:
+            progress(len(paths), len(jobs), csv_filename)
+
+    return paths
+
+
+def prof_pdf_rows(scheduler, professor: str) -> list[list[str]]:
+    """
+    Returns the weekly view of a professor in the format of `pdf_rows`, with
+    the clock time of every row in the first column.
+    """
+    days = list(scheduler.ttlist.days)
+    times, lectures = scheduler.get_professor_week(professor)
+
+    def cell(day: str, row: int) -> str:
+        scheduled = lectures.get((day, row))
+        if not scheduled:
+            return "Free Slot"
+        return "\n".join(f"{year}\n{subject}" for year, subject in scheduled)
+
+    return [["Time"] + days] + [
+        [time] + [cell(day, row) for day in days] for row, time in enumerate(times)
+    ]
+
+
+def pdf_path(year: str, directory: str = ".") -> str:
+    """Returns the path of a year's PDF file."""
+    return os.path.join(directory, f"{year} timtable.pdf")
+
+
+def pdf_rows(scheduler, year: str) -> list[list[str]]:
+    """
+    Returns the days followed by the text of every lecture number of a year,
+    the picklable input of `write_pdf`.
+    """
+    timetable = scheduler.ttlist
+    return [list(timetable.days)] + [
+        [lecture_text(timetable, lecture) for lecture in lectures]
+        for lectures in zip(*(timetable.lectures(year, day) for day in timetable.days))
+    ]
+
+
+_pdf_styles: dict | None = None
+
+
+def pdf_styles() -> dict:
+    """
+    Returns the reportlab styles of timetable PDFs, built once per process.
+    """
+    global _pdf_styles
+
+    if _pdf_styles is None:
+        from reportlab.lib import colors
+        from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+        from reportlab.platypus import TableStyle
+
+        horizontal_padding = 5
+        vertical_padding = 5
+
+        _pdf_styles = {
+            "title": getSampleStyleSheet()["Title"],
+            # custom style for paragraphs class
+            "cell": ParagraphStyle(
+                name="p_style",
+                alignment=1,  # Center alignment
+            ),
+            "table": TableStyle(
+                [
+                    ("BACKGROUND", (0, 0), (-1, 0), colors.black),
+                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+                    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+                    (
+                        "VALIGN",
+                        (0, 0),
+                        (-1, -1),
+                        "MIDDLE",
+                    ),  # Set vertical alignment to 'MIDDLE'
+                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                    ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
+                    ("GRID", (0, 0), (-1, -1), 1, colors.black),
+                    ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.black),
+                    ("LEFTPADDING", (0, 0), (-1, -1), horizontal_padding),
+                    ("RIGHTPADDING", (0, 0), (-1, -1), horizontal_padding),
+                    ("TOPPADDING", (0, 0), (-1, -1), vertical_padding),
+                    ("BOTTOMPADDING", (0, 0), (-1, -1), vertical_padding),
+                    ("WORDWRAP", (0, 0), (-1, -1), 1),
+                ]
+            ),
+        }
+
+    return _pdf_styles
+
+
+def pdf_story(title: str, rows: list[list[str]]) -> list:
+    """
+    Returns the title, spacing and table flowables of one timetable, with
+    the first row of `rows` as the header and the others as cell text.
+    """
+    from reportlab.platypus import Paragraph, Spacer, Table
+
+    styles = pdf_styles()
+
+    # reportlab paragraph processes html not string
+    data_list = [rows[0]] + [
+        [Paragraph(text.replace("\n", "<br/>"), style=styles["cell"]) for text in row]
+        for row in rows[1:]
+    ]
+
+    table = Table(data_list)
+    table.setStyle(styles["table"])
+
+    # Add table to the document
+    header = Paragraph(f"{title} TimeTable", styles["title"])
+
+    return [header, Spacer(1, 10), table]
+
+
+def write_pdf(year: str, rows: list[list[str]], pdf_filename: str) -> str:
+    """
+    Writes a year's timetable PDF from `pdf_rows`. Runs in export worker
+    processes as well.
+
+    Returns:
+        str: The path of the PDF file.
+    """
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.platypus import SimpleDocTemplate
+
+    doc = SimpleDocTemplate(
+        pdf_filename, pagesize=landscape(A4), title=f"{year} Timtable"
+    )
+    doc.build(pdf_story(year, rows))
+
+    return pdf_filename
+
+
+def export_pdf(scheduler, year: str, directory: str = ".") -> str:
+    """
+    Exports a timetable to a PDF file for a given year.
+
+    Args:
+        scheduler (Scheduler): The scheduler holding the timetable.
+        year (str): The year for which the timetable is to be exported.
+        directory (str): The directory to write the PDF to.
+
+    Returns:
+        str: The path of the PDF file.
+
+    Example:
+        ```
+        export_pdf(scheduler, 'FY IT')
+        ```
+    """
+    return write_pdf(year, pdf_rows(scheduler, year), pdf_path(year, directory))
+
+
+def pdf_jobs(scheduler, years, directory: str = ".") -> list[tuple]:
+    """
+    Returns the year, rows and path of the PDF file of every year, the input
+    of `write_pdfs`.
+    """
+    return [
+        (year, pdf_rows(scheduler, year), pdf_path(year, directory)) for year in years
+    ]
+
+
+def write_pdfs(
+    jobs: list[tuple], workers: int | None = None, progress=None
+) -> list[str]:
+    """
+    Writes the PDF files of `pdf_jobs` across a process pool. Every worker
+    builds the styles once and only receives the text of its years.
+
+    Args:
+        jobs (list[tuple]): The year, rows and path of every file.
+        workers (int | None): Worker processes, all CPUs by default.
+        progress (Callable[[int, int, str], None] | None): Called with the
+            files done, the total and the path of every finished file. It
+            may raise to stop the export, files not started are skipped.
+
+    Returns:
+        list[str]: The paths of the PDF files, in the order they finished.
+    """
+    paths: list[str] = []
+
+    if len(jobs) <= 1:  # not worth starting processes
+        for job in jobs:
+            paths.append(write_pdf(*job))
+            if progress is not None:
+                progress(len(paths), len(jobs), paths[-1])
+        return paths
+
+    # multiprocessing is slow to import, load it with the first pool
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Export jobs run in threads next to each other. A forked worker could
+    # inherit the lock of a module another thread was importing right then,
+    # so workers are spawned, as they are on Windows and macOS anyway.
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=pdf_styles,
+    ) as executor:
+        futures = [executor.submit(write_pdf, *job) for job in jobs]
+        try:
+            for future in as_completed(futures):
+                paths.append(future.result())
+                if progress is not None:
+                    progress(len(paths), len(jobs), paths[-1])
+        except BaseException:
+            executor.shutdown(cancel_futures=True)
+            raise
+
+    return paths
+
+
+def export_pdfs(
+    scheduler, years, directory: str = ".", workers: int | None = None, progress=None
+) -> list[str]:
+    """
+    Exports the PDFs of several years across a process pool.
+
+    Args:
+        scheduler (Scheduler): The scheduler holding the timetable.
+        years (Iterable[str]): The years to export.
+        directory (str): The directory to write the PDFs to.
+        workers (int | None): Worker processes, all CPUs by default.
+        progress (Callable[[int, int, str], None] | None): See `write_pdfs`.
+
+    Returns:
+        list[str]: The paths of the PDF files, in the order they finished.
+    """
+    return write_pdfs(pdf_jobs(scheduler, years, directory), workers, progress)
+
+
+def master_pdf_pages(scheduler, years, professors: bool = False) -> list[tuple]:
+    """
+    Returns the title and rows of every page of the single PDF, the years
+    first and then, if `professors` is set, every professor's week.
+    """
+    pages = [(year, pdf_rows(scheduler, year)) for year in years]
+    if professors:
+        pages += [
+            (professor, prof_pdf_rows(scheduler, professor))
+            for professor in sorted(scheduler.profs)
+        ]
+
+    return pages
+
+
+def write_master_pdf(pages: list[tuple], pdf_filename: str, progress=None) -> str:
+    """
+    Writes the pages of `master_pdf_pages` into one PDF in one pass.
+
+    Args:
+        pages (list[tuple]): The title and rows of every page.
+        pdf_filename (str): The path of the PDF file.
+        progress (Callable[[int, int, str], None] | None): Called with the
+            pages done, the total and the path as pages are drawn. A page of
+            `pages` is done once its last part is drawn, as a long table
+            runs over several physical pages. It may raise to stop the
+            export.
+
+    Returns:
+        str: The path of the PDF file.
+    """
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.platypus import PageBreak, SimpleDocTemplate
+    from reportlab.platypus.flowables import CallerMacro
+
+    def page_done(done: int) -> CallerMacro:
+        # draws nothing, reportlab calls it once the rows before it are drawn
+        return CallerMacro(lambda flowable: progress(done, len(pages), pdf_filename))
+
+    story: list = []
+    for done, (title, rows) in enumerate(pages, start=1):
+        story += pdf_story(title, rows)
+        if progress is not None:
+            story.append(page_done(done))
+        story.append(PageBreak())
+
+    doc = SimpleDocTemplate(
+        pdf_filename, pagesize=landscape(A4), title="All Timetables"
+    )
+    doc.build(story[:-1])
+
+    return pdf_filename
+
+
+def export_master_pdf(
+    scheduler,
+    years,
+    directory: str = ".",
+    professors: bool = False,
+    pdf_filename: str = "All timetables.pdf",
+) -> str:
+    """
+    Exports the timetables of several years, one page each, into a single
+    PDF built in one pass.
+
+    Args:
+        scheduler (Scheduler): The scheduler holding the timetable.
+        years (Iterable[str]): The years to export.
+        directory (str): The directory to write the PDF to.
+        professors (bool): Whether to add the weekly view of every professor
+            after the years.
+        pdf_filename (str): The name of the PDF file.
+
+    Returns:
+        str: The path of the PDF file.
+    """
+    return write_master_pdf(
+        master_pdf_pages(scheduler, years, professors),
+        os.path.join(directory, pdf_filename),
+    )
+
+
+class ExportCancelled(Exception):
+    """Raised by the progress callback of a cancelled ExportJob."""
+
+
+class ExportJob:
+    """
+    An export running in a background thread.
+
+    `write` is one of the `write_*` functions and `args` its input taken from
+    the timetable beforehand (`csv_jobs`, `pdf_jobs`, ...), so the thread
+    never reads a timetable that is being edited. The job reports the files
+    or pages done through `done` and `total`, and `cancel()` stops it at the
+    next one.
+    """
+
+    def __init__(self, name: str, write, *args) -> None:
+        self.name = name
+        self.write = write
+        self.args = args
+        self.status = "queued"  # running, done, cancelled or failed
+        self.done = 0
+        self.total = 0
+        self.last_path = ""
+        self.error: Exception | None = None
+        self.started = 0.0
+        self.finished = 0.0
+        self._cancel = threading.Event()
+
+    def start(self) -> "ExportJob":
+        """Starts the job in a daemon thread."""
+        self.status = "running"
+        self.started = time.perf_counter()
+        threading.Thread(target=self._run, daemon=True).start()
+        return self
+
+    def cancel(self) -> None:
+        """Asks the job to stop before its next file or page."""
+        self._cancel.set()
+
+    @property
+    def running(self) -> bool:
+        """Whether the job is still running."""
+        return self.status == "running"
+
+    def progress(self, done: int, total: int, path: str) -> None:
+        """Progress callback handed to `write`."""
+        if self._cancel.is_set():
+            raise ExportCancelled
+        self.done, self.total, self.last_path = done, total, path
+
+    def eta(self) -> float | None:
+        """
+        Returns the seconds the job still needs at its rate so far, or None
+        before the first file or page is done.
+        """
+        if not self.running or not self.done:
+            return None
+        elapsed = time.perf_counter() - self.started
+        return elapsed / self.done * (self.total - self.done)
+
+    def _run(self) -> None:
+        try:
+            self.write(*self.args, progress=self.progress)
+            self.status = "done"
+        except ExportCancelled:
+            self.status = "cancelled"
+        except Exception as e:
+            traceback.print_exc()
+            self.error = e
+            self.status = "failed"
+        self.finished = time.perf_counter()
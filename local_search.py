@@ -0,0 +1,373 @@
+"""
+Local-search improvement pass for a finished timetable.
+
+Simulated annealing moves, swaps and removes lectures inside a year's
+timetable to make room for lectures that fill Empty Slots. Every move is
+scored incrementally from professor counts per stretch of clock time and the
+workload left per course, so a move costs O(1) no matter how large the
+timetable is.
+"""
+
+import bisect
+import math
+import random
+import time
+
+from scheduler import SchedulingCancelled
+from solver import collect_courses
+
+EMPTY = -1
+FIXED = -2
+
+
+class LocalSearch:
+    """
+    Simulated annealing over the scheduler's current timetable.
+
+    The score is the number of Empty Slots. Filling an empty cell scores -1,
+    moving a lecture to an empty cell or swapping two lectures of a year
+    scores 0 and removing a lecture scores +1, which is only accepted with
+    probability exp(-1 / temperature). Lectures that don't belong to a known
+    course (e.g. rescheduled by hand) stay where they are.
+    """
+
+    def __init__(
+        self,
+        scheduler,
+        iterations: int = 20000,
+        time_limit: float | None = None,
+        temperature: float = 0.5,
+        cooling: float = 0.9995,
+        seed: int | None = None,
+        cancel=None,
+    ) -> None:
+        self.scheduler = scheduler
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.cancel = cancel  # threading.Event that stops the search
+        self.temperature = temperature
+        self.cooling = cooling
+        self.random = random.Random(seed)
+
+        self.years: list[str] = list(scheduler.ttlist)
+        self.days: list[str] = list(scheduler.ttlist.days)
+        self.courses: list = []
+        self.year_courses: list[list[int]] = []
+        self.practical_masks: list[int] = []
+        self.remaining: list[int] = []
+
+        # grid[year][day][slot] is a course index, EMPTY or FIXED
+        self.grid: list[list[list[int]]] = []
+        # atoms[year][slot] are the stretches of clock time the slot covers
+        self.atoms: list[list[range]] = []
+        self.busy: dict[tuple[int, int], dict[str, int]] = {}
+        self.empties: list[tuple[int, int, int]] = []
+        self.empty_pos: dict[tuple[int, int, int], int] = {}
+
+        self.start_empties = 0
+        self.total_cells = 0
+        self.iterations_run = 0
+
+        self._build()
+
+    def _build(self) -> None:
+        """Maps the timetable onto courses, slot occupancy and empty cells."""
+        scheduler = self.scheduler
+        ttlist = scheduler.ttlist
+        self._build_atoms()
+
+        for year_idx, year in enumerate(self.years):
+            slots = scheduler.slot_table(scheduler.get_department_by_year(year))
+            no_of_lectures = slots.count
+            self.practical_masks.append(slots.practical_mask)
+
+            course_keys: dict = {}
+            course_ids: list[int] = []
+            no_of_cells = no_of_lectures * len(self.days)
+            for course in collect_courses(scheduler, year, year_idx, no_of_cells):
+                course_keys[(course.subtype, frozenset(course.members))] = len(
+                    self.courses
+                )
+                course_ids.append(len(self.courses))
+                self.courses.append(course)
+                self.remaining.append(max(course.capacity, 0))
+            self.year_courses.append(course_ids)
+
+            grid: list[list[int]] = []
+            for day_idx, day in enumerate(self.days):
+                row: list[int] = []
+                for slot, lecture in enumerate(ttlist.lectures(year, day)):
+                    if lecture is None:
+                        row.append(EMPTY)
+                        self._add_empty((year_idx, day_idx, slot))
+                        continue
+
+                    professors = ttlist.professor_names(lecture)
+                    members = zip(professors, ttlist.subject_names(lecture))
+                    key = (ttlist.subtype_name(lecture), frozenset(members))
+                    row.append(course_keys.get(key, FIXED))
+                    for prof in professors:
+                        self._occupy(prof, year_idx, day_idx, slot, 1)
+
+                grid.append(row)
+                self.total_cells += len(row)
+            self.grid.append(grid)
+
+        self.start_grid = [[list(row) for row in grid] for grid in self.grid]
+        self.start_empties = len(self.empties)
+
+    def _build_atoms(self) -> None:
+        """
+        Splits the day at every slot boundary of every year, so slots of
+        departments with other start times or lecture lengths overlap exactly
+        when they share an atom.
+        """
+        ttlist = self.scheduler.ttlist
+        slot_intervals = []
+        for year in self.years:
+            length = max(len(ttlist.lectures(year, day)) for day in self.days)
+            slot_intervals.append(
+                [self.scheduler.slot_interval(year, slot) for slot in range(length)]
+            )
+
+        bounds = sorted(
+            {
+                minute
+                for intervals in slot_intervals
+                for span in intervals
+                for minute in span
+            }
+        )
+        self.atoms = [
+            [
+                range(
+                    bisect.bisect_left(bounds, start), bisect.bisect_left(bounds, end)
+                )
+                for start, end in intervals
+            ]
+            for intervals in slot_intervals
+        ]
+
+    def _add_empty(self, cell: tuple[int, int, int]) -> None:
+        self.empty_pos[cell] = len(self.empties)
+        self.empties.append(cell)
+
+    def _remove_empty(self, cell: tuple[int, int, int]) -> None:
+        pos = self.empty_pos.pop(cell)
+        last = self.empties.pop()
+        if pos < len(self.empties):
+            self.empties[pos] = last
+            self.empty_pos[last] = pos
+
+    def _occupy(
+        self, professor: str, year_idx: int, day: int, slot: int, count: int
+    ) -> None:
+        for atom in self.atoms[year_idx][slot]:
+            busy = self.busy.setdefault((day, atom), {})
+            busy[professor] = busy.get(professor, 0) + count
+
+    def _is_free(self, course_idx: int, year_idx: int, day: int, slot: int) -> bool:
+        members = self.courses[course_idx].members
+        for atom in self.atoms[year_idx][slot]:
+            busy = self.busy.get((day, atom))
+            if busy and any(busy.get(prof) for prof, _ in members):
+                return False
+        return True
+
+    def _fits(self, course_idx: int, year_idx: int, slot: int) -> bool:
+        """Checks the practical-slot rule for a course in a slot."""
+        return self.courses[course_idx].subtype != "Practical" or bool(
+            self.practical_masks[year_idx] >> slot & 1
+        )
+
+    def _place(self, course_idx: int, cell: tuple[int, int, int]) -> None:
+        year_idx, day, slot = cell
+        self.grid[year_idx][day][slot] = course_idx
+        self.remaining[course_idx] -= 1
+        for prof, _ in self.courses[course_idx].members:
+            self._occupy(prof, year_idx, day, slot, 1)
+
+    def _clear(self, cell: tuple[int, int, int]) -> int:
+        year_idx, day, slot = cell
+        course_idx = self.grid[year_idx][day][slot]
+        self.grid[year_idx][day][slot] = EMPTY
+        self.remaining[course_idx] += 1
+        for prof, _ in self.courses[course_idx].members:
+            self._occupy(prof, year_idx, day, slot, -1)
+        return course_idx
+
+    def _random_lecture(self, year_idx: int) -> tuple[int, int, int] | None:
+        """Picks a random movable lecture of a year, if one is found quickly."""
+        grid = self.grid[year_idx]
+        for _ in range(8):
+            day = self.random.randrange(len(grid))
+            if not grid[day]:
+                continue
+            slot = self.random.randrange(len(grid[day]))
+            if grid[day][slot] >= 0:
+                return (year_idx, day, slot)
+        return None
+
+    def _try_fill(self, cell: tuple[int, int, int]) -> bool:
+        """Fills an empty cell with any course that fits (score -1)."""
+        year_idx, day, slot = cell
+        candidates = self.year_courses[year_idx]
+        start = self.random.randrange(len(candidates)) if candidates else 0
+
+        for offset in range(len(candidates)):
+            course_idx = candidates[(start + offset) % len(candidates)]
+            if (
+                self.remaining[course_idx] > 0
+                and self._fits(course_idx, year_idx, slot)
+                and self._is_free(course_idx, year_idx, day, slot)
+            ):
+                self._remove_empty(cell)
+                self._place(course_idx, cell)
+                return True
+        return False
+
+    def _try_relocate(self, cell: tuple[int, int, int]) -> bool:
+        """Moves a lecture of the same year into an empty cell (score 0)."""
+        year_idx, day, slot = cell
+        source = self._random_lecture(year_idx)
+        if source is None:
+            return False
+
+        course_idx = self.grid[year_idx][source[1]][source[2]]
+        if not (
+            self._fits(course_idx, year_idx, slot)
+            and self._is_free(course_idx, year_idx, day, slot)
+        ):
+            return False
+
+        self._clear(source)
+        self._remove_empty(cell)
+        self._place(course_idx, cell)
+        self._add_empty(source)
+        return True
+
+    def _try_swap(self, year_idx: int) -> bool:
+        """Swaps two lectures of a year (score 0)."""
+        first = self._random_lecture(year_idx)
+        second = self._random_lecture(year_idx)
+        if first is None or second is None or first[1:] == second[1:]:
+            return False
+
+        first_course = self._clear(first)
+        second_course = self._clear(second)
+
+        if (
+            self._fits(first_course, year_idx, second[2])
+            and self._fits(second_course, year_idx, first[2])
+            and self._is_free(first_course, year_idx, second[1], second[2])
+            and self._is_free(second_course, year_idx, first[1], first[2])
+        ):
+            self._place(first_course, second)
+            self._place(second_course, first)
+            return True
+
+        self._place(first_course, first)
+        self._place(second_course, second)
+        return False
+
+    def _try_remove(self, year_idx: int, temperature: float) -> bool:
+        """Removes a lecture (score +1), accepted with the annealing probability."""
+        if self.random.random() >= math.exp(-1 / temperature):
+            return False
+
+        cell = self._random_lecture(year_idx)
+        if cell is None:
+            return False
+
+        self._clear(cell)
+        self._add_empty(cell)
+        return True
+
+    def run(self) -> tuple[float, float]:
+        """
+        Runs the search, writes the best timetable back to the scheduler and
+        returns the fill rate (in %) before and after.
+
+        Raises:
+            SchedulingCancelled: If the cancel event is set, before anything
+                is written back.
+        """
+        deadline = (
+            time.perf_counter() + self.time_limit
+            if self.time_limit is not None
+            else None
+        )
+        temperature = self.temperature
+        best_empties = len(self.empties)
+        best_grid = [[list(row) for row in grid] for grid in self.grid]
+        best_remaining = list(self.remaining)
+
+        cancel = self.cancel
+        for iteration in range(self.iterations):
+            if cancel is not None and cancel.is_set():
+                raise SchedulingCancelled
+            if not self.empties:
+                break
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+
+            self.iterations_run = iteration + 1
+            cell = self.empties[self.random.randrange(len(self.empties))]
+
+            if not self._try_fill(cell):
+                move = self.random.random()
+                if move < 0.45:
+                    self._try_relocate(cell)
+                elif move < 0.9:
+                    self._try_swap(cell[0])
+                else:
+                    self._try_remove(cell[0], temperature)
+
+            if len(self.empties) < best_empties:
+                best_empties = len(self.empties)
+                best_grid = [[list(row) for row in grid] for grid in self.grid]
+                best_remaining = list(self.remaining)
+
+            temperature = max(temperature * self.cooling, 0.01)
+
+        self.grid = best_grid
+        self.remaining = best_remaining
+        self.apply()
+
+        return self.fill_rate(self.start_empties), self.fill_rate(best_empties)
+
+    def fill_rate(self, empties: int) -> float:
+        """Returns the percentage of filled cells for a number of Empty Slots."""
+        if not self.total_cells:
+            return 0.0
+        return (self.total_cells - empties) / self.total_cells * 100
+
+    def apply(self) -> None:
+        """Writes the grid back into the scheduler's timetable and workloads."""
+        scheduler = self.scheduler
+        ttlist = scheduler.ttlist
+
+        for year_idx, year in enumerate(self.years):
+            for day_idx, day in enumerate(self.days):
+                lectures = ttlist.lectures(year, day)
+                for slot, value in enumerate(self.grid[year_idx][day_idx]):
+                    if value == self.start_grid[year_idx][day_idx][slot]:
+                        continue
+                    if value == EMPTY:
+                        lectures[slot] = None
+                    else:
+                        course = self.courses[value]
+                        professors, subjects = zip(*course.members)
+                        lectures[slot] = ttlist.lecture(
+                            professors, subjects, course.subtype
+                        )
+
+        scheduler.rebuild_occupancy()
+
+        for course_idx, course in enumerate(self.courses):
+            used = max(course.capacity, 0) - self.remaining[course_idx]
+            if not used:
+                continue
+            year = self.years[course.year]
+            for prof, subject in course.members:
+                scheduler.ledger.consume(prof, year, subject, course.subtype, used)
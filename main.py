@@ -1,44 +1,45 @@
-import csv
+from __future__ import annotations
+
+from time import perf_counter
+
+STARTED = perf_counter()  # start of the --startup-timings breakdown
+
+import copy
 import datetime as dt
-import time
-import json
+import queue
+import sys
+from contextlib import contextmanager
+from collections import OrderedDict
+import threading
 import traceback
 import tkinter as tk
 import tkinter.font as tkFont
 from tkinter import messagebox
-import ttkbootstrap as tkb
 from tkinter.filedialog import askopenfilename
-from ttkbootstrap.tooltip import ToolTip
-
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4, landscape
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-
-frames = {}
-timetable_struct: dict = {
-    "Mon": [],
-    "Tue": [],
-    "Wed": [],
-    "Thurs": [],
-    "Fri": [],
-    "Sat": [],
-}
-
-today: dt.datetime = dt.datetime.now()
-
 
-def calc_college_time(
-    start_time: dt.datetime, end_time: dt.datetime, minutes_lecture: float
-) -> int:
-    """
-    Calculates the total number of college minutes between a start time and an end time,
-    given the duration of each lecture in minutes.
-    """
-
-    minutesofcollege = end_time - start_time
-    minutesofcollege = minutesofcollege.total_seconds() / 60.0
-    return int(minutesofcollege // minutes_lecture)
+import exporter
+from profiling import append_run_history
+from scheduler import (
+    CSVImportError,
+    JsonJournal,
+    Scheduler,
+    SchedulingCancelled,
+    calc_college_time,
+    read_json,
+    read_profs_csv,
+    store_json,
+    today,
+)
+
+MAX_CACHED_PAGES = 16
+frames: OrderedDict = OrderedDict()  # page -> frame, least recently shown first
+shown_frame = None
+stale_pages: set = set()  # cached pages to refresh before they are shown
+schedule_cancel: threading.Event | None = None  # set while a run is in progress
+export_jobs: list = []  # exporter.ExportJob of this session, oldest first
+failed_exports: set = set()  # failed export jobs already reported
+MAX_SHOWN_EXPORTS = 8
+startup_timings: dict[str, float] = {}  # step -> seconds, see --startup-timings
 
 
 def frame_expansion(frame: tkb.Frame) -> None:
@@ -56,6 +57,76 @@ def frame_expansion(frame: tkb.Frame) -> None:
         frame.rowconfigure(row, weight=2)
 
 
+class CellPool:
+    """
+    Reusable grid cells of a frame.
+
+    `cell` creates a widget the first time a (row, column) is used and
+    afterwards only configures the options that changed. Cells that were not
+    used since `begin` are hidden by `end` and shown again when reused.
+    """
+
+    def __init__(self, master) -> None:
+        self.master = master
+        self.cells: dict[tuple[int, int], tk.Widget] = {}
+        self.options: dict[tuple[int, int], dict] = {}
+        self.hidden: set[tuple[int, int]] = set()
+        self.used: set[tuple[int, int]] = set()
+
+    def begin(self) -> None:
+        """Starts filling the grid."""
+        self.used = set()
+
+    def cell(self, row: int, column: int, factory, **options) -> tk.Widget:
+        """
+        Returns the widget of a cell, created with `factory(master, **options)`
+        the first time and reconfigured with the options that changed after.
+        """
+        key = (row, column)
+        self.used.add(key)
+        widget = self.cells.get(key)
+
+        if widget is None:
+            widget = self.cells[key] = factory(self.master, **options)
+            self.options[key] = options
+            widget.grid(row=row, column=column, sticky="NSEW")
+            return widget
+
+        old_options = self.options[key]
+        changed = {
+            name: value
+            for name, value in options.items()
+            if old_options.get(name) != value
+        }
+        if changed:
+            widget.configure(**changed)
+            self.options[key] = options
+        if key in self.hidden:
+            self.hidden.discard(key)
+            widget.grid()
+        return widget
+
+    def end(self) -> None:
+        """
+        Hides the cells that were not used since `begin` and expands the
+        frame like `frame_expansion`, except for rows and columns that only
+        have hidden cells, which stop taking space.
+        """
+        for key, widget in self.cells.items():
+            if key not in self.used and key not in self.hidden:
+                widget.grid_remove()
+                self.hidden.add(key)
+
+        frame_expansion(self.master)
+        rows = {row for row, _ in self.used}
+        columns = {column for _, column in self.used}
+        for row, column in self.hidden:
+            if row not in rows:
+                self.master.rowconfigure(row, weight=0)
+            if column not in columns:
+                self.master.columnconfigure(column, weight=0)
+
+
 def create_entry_frame() -> tkb.Frame:
     def take_info() -> None:
         """
@@ -98,17 +169,14 @@ def create_entry_frame() -> tkb.Frame:
             return
 
         # adding new professor if not in dict
-        if name not in profs:
-            profs[name] = {year: []}
+        if name not in engine.profs:
             all_profs.append(name)
             prof_OptionMenu["menu"].add_command(
                 label=name, command=lambda opt=name: prof_var.set(opt)
             )
 
-        # adding new year to professor if not in dict
-        elif name in profs:
-            if year not in profs[name]:
-                profs[name].update({year: []})
+        # adding new professor or year to professor if not in dict
+        engine.add_professor(name, year)
 
         # adding year to option menu
         if year not in all_years_temp:
@@ -117,7 +185,7 @@ def create_entry_frame() -> tkb.Frame:
                 label=year, command=lambda opt=year: year_var.set(opt)
             )
 
-        all_subjects = get_subjects_by_year(year)
+        all_subjects = engine.get_subjects_by_year(year)
 
         # TODO: Workload will not be added if option is both
         # checking if subject already exists
@@ -127,28 +195,28 @@ def create_entry_frame() -> tkb.Frame:
                 if (sub, sub_type_value) not in all_subjects:
                     sub_dict_copy = sub_dict.copy()
                     sub_dict_copy["Type"] = sub_type_value
-                    profs[name][year].append(sub_dict_copy)
+                    engine.add_subject(name, year, sub_dict_copy)
                     updated = True
 
             if not updated:
-                teaching_prof = get_professor_by_subject(sub, "Theory")
+                teaching_prof = engine.get_professor_by_subject(sub, "Theory")
                 aleart_pop_up(
                     f"Prof. {teaching_prof} is already teaching this subject!"
                 )
                 return
         else:
             if (sub, sub_type) not in all_subjects:
-                profs[name][year].append(sub_dict)
+                engine.add_subject(name, year, sub_dict)
             else:
-                teaching_prof = get_professor_by_subject(sub, sub_type)
+                teaching_prof = engine.get_professor_by_subject(sub, sub_type)
                 aleart_pop_up(
                     f"Prof. {teaching_prof} is already teaching this subject!"
                 )
                 return
 
-        store_json(PROFS_FILE, profs)
-        update_all_years()
-        create_all_pages()
+        profs_journal.set([name, year], engine.profs[name][year])
+        engine.update_all_years()
+        invalidate_data_pages([year])
         create_menu()
 
     vertical_padding = 10
@@ -167,7 +235,7 @@ def create_entry_frame() -> tkb.Frame:
     # variable for managing prof entries
     prof_var: tk.StringVar = tk.StringVar()
     prof_var.set("None")
-    all_profs: list = ["None"] + list(profs.keys())
+    all_profs: list = ["None"] + list(engine.profs.keys())
 
     prof_OptionMenu = tkb.OptionMenu(entry_frame, prof_var, *all_profs)
     prof_OptionMenu.configure(cursor="hand2")
@@ -186,7 +254,7 @@ def create_entry_frame() -> tkb.Frame:
     ################################
     dept_var: tk.StringVar = tk.StringVar()
     dept_var.set("None")
-    all_departments: list = ["None"] + get_all_departments()
+    all_departments: list = ["None"] + engine.get_all_departments()
 
     departments_OptionMenu = tkb.OptionMenu(entry_frame, dept_var, *all_departments)
     departments_OptionMenu.configure(cursor="hand2")
@@ -200,7 +268,7 @@ def create_entry_frame() -> tkb.Frame:
 
     year_var: tk.StringVar = tk.StringVar()
     year_var.set("None")
-    all_years_temp: list = ["None"] + get_all_years()
+    all_years_temp: list = ["None"] + engine.get_all_years()
 
     year_OptionMenu = tkb.OptionMenu(entry_frame, year_var, *all_years_temp)
     year_OptionMenu.configure(cursor="hand2")
@@ -291,12 +359,12 @@ def optional_subject_entry_frame() -> tkb.Frame:
         prof2 = prof2_var.get()
 
         if prof1 != "None":
-            sub1_list = get_all_subjects(prof1, year)
+            sub1_list = engine.get_all_subjects(prof1, year)
             print(f"{prof1} -> {sub1_list = }")
             update_menu_helper(sub1_list, sub1_var, sub1_OptionMenu)
 
         if prof2 != "None":
-            sub2_list = get_all_subjects(prof2, year)
+            sub2_list = engine.get_all_subjects(prof2, year)
             print(f"{prof2} -> {sub2_list = }")
             update_menu_helper(sub2_list, sub2_var, sub2_OptionMenu)
 
@@ -311,17 +379,16 @@ def optional_subject_entry_frame() -> tkb.Frame:
         selected_subject1, selected_subject_type1 = subject1.split(" - ")
         selected_subject2, selected_subject_type2 = subject2.split(" - ")
 
-        global profs
-        profs = read_json(PROFS_FILE)
+        engine.profs = read_json(PROFS_FILE)
 
-        for sub in profs[prof1][year]:
+        for sub in engine.profs[prof1][year]:
             if sub["Subject"] == selected_subject1:
                 if "Options" in sub:
                     sub["Options"].update({prof2: selected_subject2})
                 else:
                     sub["Options"] = {prof2: selected_subject2}
 
-        for sub in profs[prof2][year]:
+        for sub in engine.profs[prof2][year]:
             if sub["Subject"] == selected_subject2:
                 if "Options" in sub:
                     sub["Options"].update({prof1: selected_subject1})
@@ -329,7 +396,8 @@ def optional_subject_entry_frame() -> tkb.Frame:
                     sub["Options"] = {prof1: selected_subject1}
 
         print(f"{selected_subject1} -> {selected_subject2}")
-        store_json(PROFS_FILE, profs)
+        profs_journal.set([prof1, year], engine.profs[prof1][year])
+        profs_journal.set([prof2, year], engine.profs[prof2][year])
 
     vertical_padding = 10
     horizontal_padding = 15
@@ -342,13 +410,13 @@ def optional_subject_entry_frame() -> tkb.Frame:
     # Options menu vars
     year_var: tk.StringVar = tk.StringVar()
     year_var.set("None")
-    all_years_temp: list = ["None"] + get_all_years()
+    all_years_temp: list = ["None"] + engine.get_all_years()
 
     prof1_var: tk.StringVar = tk.StringVar()
     prof2_var: tk.StringVar = tk.StringVar()
     prof1_var.set("None")
     prof2_var.set("None")
-    all_profs: list = ["None"] + list(profs.keys())
+    all_profs: list = ["None"] + list(engine.profs.keys())
 
     sub1_var: tk.StringVar = tk.StringVar()
     sub2_var: tk.StringVar = tk.StringVar()
@@ -410,35 +478,35 @@ def view_timetable_frame(year_key) -> tkb.Frame:
     def rewrap(event: tk.Event) -> None:
         event.widget.config(wraplength=event.width - 15)
 
-    def add_tooltip(widget: tk.Label | tkb.Label, lec_num, day_num_of_week) -> None:
-        days = {
-            0: "Mon",
-            1: "Tue",
-            2: "Wed",
-            3: "Thurs",
-            4: "Fri",
-            5: "Sat",
-        }
-        available_profs = check_professor_available(lec_num, days[day_num_of_week])
-        dept_profs = get_professors_by_year(profs, year_key)
+    def show_available(event: tk.Event) -> None:
+        """
+        Lists the professors available for a hovered Empty Slot. The tooltip
+        is created on the first hover and its text updated on every hover.
+        """
+        label = event.widget
+        lec_num, day = empty_slots[label]
+        available_profs = "\n".join(
+            engine.get_available_professors(year_key, day, lec_num)
+        )
+        text = available_profs if available_profs else "No Professors Available!"
 
-        available_profs_lec_num = "\n".join(set(available_profs) & set(dept_profs))
+        tooltip = tooltips.get(label)
+        if tooltip is None:
+            from ttkbootstrap.tooltip import ToolTip
 
-        ToolTip(
-            widget,
-            text=available_profs_lec_num
-            if available_profs_lec_num
-            else "No Professors Available!",
-        )
+            # ToolTip replaces the <Enter> binding, keep updating its text
+            tooltip = tooltips[label] = ToolTip(label, text=text)
+            label.bind("<Enter>", show_available, add="+")
+            tooltip.enter(event)
+        tooltip.text = text
 
-    temp_var: dict = ttlist
     table_frame = tkb.Frame(window)
     vertical_pad = 10
     horizontal_pad = 20
     borderwidth = 1
     RELIEF_TYPE = "ridge"
 
-    if not settings:
+    if not engine.settings:
         label = tk.Label(
             table_frame,
             text="No Departments found!",
@@ -471,61 +539,84 @@ def view_timetable_frame(year_key) -> tkb.Frame:
         padding=10,
         bootstyle="inverse-primary",
     )
-
-    department: str = get_department_by_year(year_key)
-    start_time, end_time, minutes_lecture = get_department_time(department)
-    no_of_lectures = calc_college_time(start_time, end_time, minutes_lecture)
-
-    # creating time labels
-    temp_time = start_time
     time_label.grid(row=1, column=0, sticky="NSEW")
-    for row in range(1, int(no_of_lectures) + 1):
-        label = tk.Label(
-            master=table_frame,
-            text=f"{temp_time:%H:%M %p}",
-            relief=RELIEF_TYPE,
-            pady=vertical_pad,
-            padx=horizontal_pad,
-            bg=LIGHT_GRAY_COLOR,
-            fg=DARK_GRAY_COLOR,
-            borderwidth=borderwidth,
-        )
-        label.grid(row=row + 1, column=0, sticky="NSEW")
-        temp_time = temp_time + dt.timedelta(minutes=minutes_lecture)
 
-    for col, value in enumerate(temp_var[year_key]):
-        label = tkb.Label(
-            master=table_frame,
-            text=f"{value}",
-            relief=RELIEF_TYPE,
-            anchor="center",
-            bootstyle="inverse-primary",
-        )
-        label.grid(row=1, column=col + 1, sticky="NSEW")
-
-        for row, value2 in enumerate(temp_var[year_key][value], start=2):
-            label_text = (
-                f"{value2['subject']}\n{value2['subtype']}\n{value2['professor']}"
+    def lecture_label(master, **options) -> tkb.Label:
+        label = tkb.Label(master, **options)
+        label.bind("<Configure>", rewrap)
+        return label
+
+    cells = CellPool(table_frame)
+    empty_slots: dict[tk.Widget, tuple[int, str]] = {}  # label -> (lec_num, day)
+    tooltips: dict = {}  # label -> ToolTip, made on the first hover
+
+    def refresh() -> None:
+        """Updates the cells to the current timetable and settings."""
+        department: str = engine.get_department_by_year(year_key)
+        slots = engine.slot_table(department)
+        cells.begin()
+
+        # creating time labels
+        for row, time_text in enumerate(slots.labels, start=1):
+            cells.cell(
+                row + 1,
+                0,
+                tk.Label,
+                text=time_text,
+                relief=RELIEF_TYPE,
+                pady=vertical_pad,
+                padx=horizontal_pad,
+                bg=LIGHT_GRAY_COLOR,
+                fg=DARK_GRAY_COLOR,
+                borderwidth=borderwidth,
             )
 
-            label = tkb.Label(
-                master=table_frame,
-                text=label_text,
-                relief="sunken",
-                borderwidth=1,
+        for col, day in enumerate(engine.ttlist.days):
+            cells.cell(
+                1,
+                col + 1,
+                tkb.Label,
+                text=f"{day}",
+                relief=RELIEF_TYPE,
                 anchor="center",
-                padding=10,
-                justify="center",
-                bootstyle="inverse-secondary" if "Empty Slot" in label_text else "",
-                wraplength=140,
+                bootstyle="inverse-primary",
             )
-            label.grid(row=row, column=col + 1, sticky="NSEW")
-            label.bind("<Configure>", rewrap)
 
-            if "Empty Slot" in label_text:
-                add_tooltip(label, row - 2, col)
+            lectures = engine.ttlist.lectures(year_key, day)
+            for row, lecture in enumerate(lectures, start=2):
+                cell = engine.ttlist.to_dict(lecture)
+                label_text = (
+                    f"{cell['subject']}\n{cell['subtype']}\n{cell['professor']}"
+                )
+
+                label = cells.cell(
+                    row,
+                    col + 1,
+                    lecture_label,
+                    text=label_text,
+                    relief="sunken",
+                    borderwidth=1,
+                    anchor="center",
+                    padding=10,
+                    justify="center",
+                    bootstyle="inverse-secondary" if lecture is None else "",
+                    wraplength=140,
+                )
+
+                if lecture is None:
+                    if label not in empty_slots:
+                        label.bind("<Enter>", show_available)
+                    empty_slots[label] = (row - 2, day)
+                elif label in empty_slots:
+                    del empty_slots[label]
+                    tooltips.pop(label, None)
+                    for sequence in ("<Enter>", "<Leave>", "<Motion>", "<ButtonPress>"):
+                        label.unbind(sequence)
 
-    frame_expansion(table_frame)
+        cells.end()
+
+    refresh()
+    table_frame.refresh = refresh
 
     return table_frame
 
@@ -537,7 +628,7 @@ def view_prof_tt_frame() -> tkb.Frame:
     borderwidth = 1
     RELIEF_TYPE = "ridge"
 
-    if not profs:
+    if not engine.profs:
         label = tk.Label(
             prof_tt_frame,
             text="No professors found!",
@@ -548,7 +639,7 @@ def view_prof_tt_frame() -> tkb.Frame:
         frame_expansion(prof_tt_frame)
         return prof_tt_frame
 
-    if not settings:
+    if not engine.settings:
         label = tk.Label(
             prof_tt_frame,
             text="No departments found!\nPlease add department first.",
@@ -560,15 +651,14 @@ def view_prof_tt_frame() -> tkb.Frame:
         return prof_tt_frame
 
     prof_var = tk.StringVar()
-    all_profs: list = list(sorted(profs.keys()))
+    all_profs: list = list(sorted(engine.profs.keys()))
 
     if not all_profs:
         all_profs = ["None"]
 
     prof_var.set(all_profs[0])
 
-    all_days: dict = list(ttlist.values())[0]
-    all_days: list = list(all_days.keys())
+    all_days: list = list(engine.ttlist.days)
 
     label = tk.Label(
         prof_tt_frame,
@@ -583,18 +673,22 @@ def view_prof_tt_frame() -> tkb.Frame:
 
     prof_OptionMenu.grid(row=0, column=3, columnspan=4, sticky="NSEW")
 
-    def generate_tt(*args):
-        for widget in prof_tt_frame.winfo_children():
-            if widget in [prof_OptionMenu, label]:
-                continue
-            widget.destroy()
-
-        prof = prof_var.get()
-        time_slots = get_time_slots_by_prof(prof)
+    time_label_header = tk.Label(
+        master=prof_tt_frame,
+        text="Time",
+        relief=RELIEF_TYPE,
+        pady=vertical_pad,
+        padx=horizontal_pad,
+        bg=TEAL_COLOR,
+        fg=WHITE_COLOR,
+        borderwidth=borderwidth,
+    )
+    time_label_header.grid(row=2, column=0, sticky="NSEW")
 
-        time_label_header = tk.Label(
+    for col, day in enumerate(all_days):
+        slot_label_header = tk.Label(
             master=prof_tt_frame,
-            text="Time",
+            text=day,
             relief=RELIEF_TYPE,
             pady=vertical_pad,
             padx=horizontal_pad,
@@ -602,47 +696,38 @@ def view_prof_tt_frame() -> tkb.Frame:
             fg=WHITE_COLOR,
             borderwidth=borderwidth,
         )
-        time_label_header.grid(row=2, column=0, sticky="NSEW")
-
-        for col, day in enumerate(all_days):
-            scheduled_lecs = get_lec_number(prof, day)
-            scheduled_lecs_sorted = {}
+        slot_label_header.grid(row=2, column=col + 1, sticky="NSEW")
 
-            for key, values in scheduled_lecs.items():
-                for value in values:
-                    scheduled_lecs_sorted[value] = key
+    cells = CellPool(prof_tt_frame)
 
-            scheduled_lecs_sorted = dict(sorted(scheduled_lecs_sorted.items()))
-
-            slot_label_header = tk.Label(
-                master=prof_tt_frame,
-                text=day,
+    def generate_tt(*args):
+        prof = prof_var.get()
+        time_slots, lectures = engine.get_professor_week(prof)
+        cells.begin()
+
+        for row, time in enumerate(time_slots):
+            cells.cell(
+                row + 3,
+                0,
+                tk.Label,
+                text=time,
                 relief=RELIEF_TYPE,
                 pady=vertical_pad,
                 padx=horizontal_pad,
-                bg=TEAL_COLOR,
-                fg=WHITE_COLOR,
+                bg=LIGHT_GRAY_COLOR,
+                fg=DARK_GRAY_COLOR,
                 borderwidth=borderwidth,
             )
-            slot_label_header.grid(row=2, column=col + 1, sticky="NSEW")
-
-            for lec_num, time in enumerate(time_slots):
-                slot_text = scheduled_lecs_sorted.get(lec_num, "Free Slot")
 
-                time_label = tk.Label(
-                    master=prof_tt_frame,
-                    text=time,
-                    relief=RELIEF_TYPE,
-                    pady=vertical_pad,
-                    padx=horizontal_pad,
-                    bg=LIGHT_GRAY_COLOR,
-                    fg=DARK_GRAY_COLOR,
-                    borderwidth=borderwidth,
-                )
-                time_label.grid(row=lec_num + 3, column=0, sticky="NSEW")
-
-                slot_label = tkb.Label(
-                    master=prof_tt_frame,
+        for col, day in enumerate(all_days):
+            for row in range(len(time_slots)):
+                years = [year for year, _ in lectures.get((day, row), ())]
+                slot_text = "\n".join(years) if years else "Free Slot"
+
+                cells.cell(
+                    row + 3,
+                    col + 1,
+                    tkb.Label,
                     text=slot_text,
                     padding=10,
                     anchor="center",
@@ -651,12 +736,11 @@ def view_prof_tt_frame() -> tkb.Frame:
                     justify="center",
                 )
 
-                slot_label.grid(row=lec_num + 3, column=col + 1, sticky="NSEW")
+        cells.end()
 
     prof_var.trace_add("write", generate_tt)
     generate_tt()
-
-    frame_expansion(prof_tt_frame)
+    prof_tt_frame.refresh = generate_tt
 
     return prof_tt_frame
 
@@ -664,7 +748,7 @@ def view_prof_tt_frame() -> tkb.Frame:
 # TODO:Complete this
 def create_professors_frame() -> tkb.Frame:
     def show_options(*args):
-        years = get_years_by_department(dept_var.get())
+        years = engine.get_years_by_department(dept_var.get())
         departments_OptionMenu.grid(columnspan=len(years) + 1)
 
         for widget in professors_frame.winfo_children():
@@ -692,7 +776,7 @@ def create_professors_frame() -> tkb.Frame:
         professor_label.grid(row=1, column=0, sticky="NSEW")
 
         for row, professor in enumerate(
-            get_professors_by_department(dept_var.get()), start=2
+            engine.get_professors_by_department(dept_var.get()), start=2
         ):
             professors_label = tk.Label(
                 master=professors_frame,
@@ -704,7 +788,7 @@ def create_professors_frame() -> tkb.Frame:
             professors_label.grid(row=row, column=0, sticky="NSEW")
 
             for col, year in enumerate(years):  # starting from 1 because added none.
-                subjects = get_all_subjects(professor, year)
+                subjects = engine.get_all_subjects(professor, year)
                 label_text = ""
                 if subjects:
                     for sub in subjects:
@@ -726,7 +810,7 @@ def create_professors_frame() -> tkb.Frame:
     RELIEF_TYPE = "ridge"
 
     # early exit if no professors found
-    if not profs:
+    if not engine.profs:
         label = tk.Label(
             professors_frame,
             text="No professors found!",
@@ -736,7 +820,7 @@ def create_professors_frame() -> tkb.Frame:
         return professors_frame
 
     dept_var = tk.StringVar()
-    all_departments: list = get_all_departments()
+    all_departments: list = engine.get_all_departments()
     dept_var.set(all_departments[0])
     departments_OptionMenu = tkb.OptionMenu(
         professors_frame, dept_var, None, *all_departments, bootstyle="outline"
@@ -785,21 +869,27 @@ def create_options_frame() -> tkb.Frame:
         Total number of lectures are {int(nooflectures)}."""
         )
 
-        settings[department] = {
-            "start_time": dt.datetime.strftime(start_time, "%H:%M"),
-            "end_time": dt.datetime.strftime(end_time, "%H:%M"),
-            "minutes_lecture": minutes_lecture,
-            "practical_slots": practical_slots,
-        }
-        store_json(SETTINGS_FILE, settings)
+        engine.set_department_settings(
+            department,
+            {
+                "start_time": dt.datetime.strftime(start_time, "%H:%M"),
+                "end_time": dt.datetime.strftime(end_time, "%H:%M"),
+                "minutes_lecture": minutes_lecture,
+                "practical_slots": practical_slots,
+            },
+        )
+        store_json(SETTINGS_FILE, engine.settings, COMPACT_JSON)
+        invalidate_tt_pages(engine.get_years_by_department(department))
 
         if ask_pop_up("Do you want to reset timetable?"):
-            auto_schedule_helper()
+            schedule_with_progress(progress_bar)
 
     def show_options(*args):
-        start_time, end_time, minutes_lecture = get_department_time(dept_var.get())
-        nooflectures = calc_college_time(start_time, end_time, minutes_lecture)
-        practical_slots = get_practical_slots_by_department(dept_var.get())
+        slots = engine.slot_table(dept_var.get())
+        start_time, end_time = slots.start_time, slots.end_time
+        minutes_lecture = slots.minutes_lecture
+        nooflectures = slots.count
+        practical_slots = slots.practical_slots
 
         curr_time_label.config(
             text=f"""Current College time is {start_time:%H:%M %p} to {end_time:%H:%M %p}.
@@ -821,7 +911,7 @@ def create_options_frame() -> tkb.Frame:
     vertical_padding = 10
     options_frame = tkb.Frame(window, padding=(25, 20))
 
-    if not settings:
+    if not engine.settings:
         label = tk.Label(
             options_frame,
             text="No departments found!\nPlease create a department first",
@@ -831,7 +921,7 @@ def create_options_frame() -> tkb.Frame:
         return options_frame
 
     dept_var = tk.StringVar()
-    all_departments: list = get_all_departments()
+    all_departments: list = engine.get_all_departments()
     dept_var.set(all_departments[0])
 
     departments_OptionMenu = tkb.OptionMenu(
@@ -875,6 +965,14 @@ def create_options_frame() -> tkb.Frame:
         row=6, column=0, columnspan=2, pady=vertical_padding, sticky="NSEW"
     )
 
+    progress_bar = tkb.Progressbar(
+        options_frame,
+        orient="horizontal",
+        mode="determinate",
+        bootstyle="success-striped",
+    )
+    progress_bar.grid(row=7, column=0, columnspan=2, pady=vertical_padding, sticky="EW")
+
     frame_expansion(options_frame)
 
     return options_frame
@@ -936,7 +1034,7 @@ def create_menu() -> None:
 
     tt_menu = tk.Menu(menu)
 
-    for year in all_years:
+    for year in engine.all_years:
         tt_menu.add_command(label=year, command=lambda y=year: create_page(y))
 
     tt_menu.add_command(label="Clear TimeTable", command=set_default_tt)
@@ -966,13 +1064,110 @@ def create_menu() -> None:
     menu.add_cascade(label="Settings", menu=settings_menu)
 
 
-def schedule_with_progress(progress_bar) -> None:
-    """Uses auto_schedule_helper with a progress bar for better UX"""
-    for i in range(101):
-        progress_bar["value"] = i
-        window.update_idletasks()  # Ensure smooth progress bar updates
-        time.sleep(0.02)
-    auto_schedule_helper()
+def schedule_with_progress(
+    progress_bar,
+    solver: str = "greedy",
+    improve: bool = False,
+    runs: int = 1,
+    on_done=None,
+    years: list | None = None,
+) -> None:
+    """
+    Schedules in a background thread so the window stays responsive.
+
+    The worker schedules a copy of the professors and settings and reports
+    the years (or runs) done through a queue, which is polled with after()
+    to move the progress bar, if there is one. With `years` only those years
+    are scheduled and the others keep their lectures, see
+    Scheduler.schedule_years. Once the run finished the engine takes over
+    its timetable, unless professors or settings were edited meanwhile;
+    cancel_scheduling() keeps the current timetable.
+    """
+    global schedule_cancel
+
+    if schedule_cancel is not None:
+        return info_pop_up("A timetable is already being scheduled.")
+
+    worker_engine = Scheduler(
+        copy.deepcopy(engine.profs), copy.deepcopy(engine.settings)
+    )
+    if not worker_engine.profs:
+        return aleart_pop_up("No professor available to schedule a timetable!")
+    fingerprints = worker_engine.input_fingerprints()
+    if years is not None:
+        worker_engine.ttlist = copy.deepcopy(engine.ttlist)
+
+    updates: queue.Queue = queue.Queue()
+    cancel = schedule_cancel = threading.Event()
+
+    def show_progress(value: float) -> None:
+        # the bar's page may have been evicted meanwhile
+        if progress_bar is not None and progress_bar.winfo_exists():
+            progress_bar["value"] = value
+
+    show_progress(0)
+
+    def progress(done: int, total: int) -> None:
+        if cancel.is_set():
+            raise SchedulingCancelled
+        updates.put(("progress", done / total * 100))
+
+    def work() -> None:
+        try:
+            if years is not None:
+                worker_engine.schedule_years(years, progress)
+                improved = None
+            else:
+                improved = run_schedule(
+                    worker_engine, solver, improve, runs, progress, cancel
+                )
+            updates.put(("done", improved))
+        except SchedulingCancelled:
+            updates.put(("cancelled", None))
+        except Exception as e:
+            traceback.print_exc()
+            updates.put(("error", e))
+
+    def poll() -> None:
+        global schedule_cancel
+
+        try:
+            while True:
+                kind, value = updates.get_nowait()
+                if kind == "progress":
+                    show_progress(value)
+                    continue
+
+                schedule_cancel = None
+                if kind == "done" and engine.input_fingerprints() != fingerprints:
+                    show_progress(0)
+                    aleart_pop_up(
+                        "Professors or settings changed while scheduling, the new"
+                        " timetable was discarded. Please create it again."
+                    )
+                elif kind == "done":
+                    engine.adopt_schedule(worker_engine)
+                    finish_schedule(value)
+                    if on_done is not None:
+                        on_done()
+                elif kind == "cancelled":
+                    show_progress(0)
+                    info_pop_up("Scheduling cancelled, the timetable was kept.")
+                else:
+                    show_progress(0)
+                    aleart_pop_up(f"Scheduling failed: {value}")
+                return
+        except queue.Empty:
+            window.after(50, poll)
+
+    threading.Thread(target=work, daemon=True).start()
+    window.after(50, poll)
+
+
+def cancel_scheduling() -> None:
+    """Stops the background scheduling run, if there is one."""
+    if schedule_cancel is not None:
+        schedule_cancel.set()
 
 
 def create_timetable_page() -> tkb.Frame:
@@ -998,13 +1193,49 @@ def create_timetable_page() -> tkb.Frame:
     )
     progress_bar.grid(row=1, column=0, sticky="we")
 
+    solver_var = tk.StringVar(value="greedy")
+    solver_check = tkb.Checkbutton(
+        create_timetable_frame,
+        text="Use exact solver (fewer empty slots, slower)",
+        variable=solver_var,
+        onvalue="exact",
+        offvalue="greedy",
+    )
+    solver_check.grid(row=2, column=0, sticky="we")
+
+    improve_var = tk.BooleanVar(value=False)
+    improve_check = tkb.Checkbutton(
+        create_timetable_frame,
+        text="Fill empty slots with local search",
+        variable=improve_var,
+    )
+    improve_check.grid(row=3, column=0, sticky="we")
+
+    runs_frame = tkb.Frame(create_timetable_frame)
+    runs_label = tk.Label(runs_frame, text="Randomised runs (greedy):")
+    runs_label.pack(side="left")
+    runs_var = tk.IntVar(value=1)
+    runs_spinbox = tkb.Spinbox(runs_frame, from_=1, to=256, textvariable=runs_var)
+    runs_spinbox.pack(side="left", fill="x", expand=True)
+    runs_frame.grid(row=4, column=0, sticky="we")
+
     schedule_btn = tkb.Button(
         master=create_timetable_frame,
         text="Click Here",
-        command=lambda: schedule_with_progress(progress_bar),
+        command=lambda: schedule_with_progress(
+            progress_bar, solver_var.get(), improve_var.get(), runs_var.get()
+        ),
     )
 
-    schedule_btn.grid(row=2, column=0, sticky="we")
+    schedule_btn.grid(row=5, column=0, sticky="we")
+
+    cancel_btn = tkb.Button(
+        master=create_timetable_frame,
+        text="Cancel",
+        bootstyle="danger",
+        command=cancel_scheduling,
+    )
+    cancel_btn.grid(row=6, column=0, sticky="we")
 
     frame_expansion(create_timetable_frame)
 
@@ -1047,33 +1278,113 @@ def create_reschedule_page() -> tkb.Frame:
     return reschedule_frame
 
 
-def create_export_page() -> tkb.Frame:
-    def export_csv():
-        # TODO: Not working as expected
-        year_val = year_var.get()
+def start_export(job) -> None:
+    """
+    Starts an export job in the background and polls the running jobs with
+    after() to show their progress on the export page.
+    """
+    polling = any(other.running for other in export_jobs)
+    export_jobs.append(job.start())
+    if not polling:
+        window.after(200, poll_exports)
 
-        if year_val == "All":
-            for year in all_years:
-                department = get_department_by_year(year)
-                time_slots = get_time_slots(department)
-                export_file_csv(year, time_slots)
-        else:
-            department = get_department_by_year(year_val)
-            time_slots = get_time_slots(department)
-            export_file_csv(year_val, time_slots)
 
-        info_pop_up("Done!")
+def poll_exports() -> None:
+    """
+    Updates the export page while export jobs are running and reports the
+    failed ones.
+    """
+    frame = frames.get(create_export_page)
+    if frame is not None and frame.winfo_exists():
+        frame.show_jobs()
 
-    def export_pdf():
+    for job in export_jobs:
+        if job.status == "failed" and job not in failed_exports:
+            failed_exports.add(job)
+            aleart_pop_up(f"{job.name} export failed: {job.error}")
+
+    if any(job.running for job in export_jobs):
+        window.after(200, poll_exports)
+
+
+def describe_export(job) -> str:
+    """Returns the progress line of an export job."""
+    done = f"{job.done}/{job.total}" if job.total else "starting"
+    if job.running:
+        eta = job.eta()
+        left = f", about {eta:.0f}s left" if eta is not None else ""
+        return f"{job.name}: {done}{left}"
+    if job.status == "done":
+        return f"{job.name}: done in {job.finished - job.started:.1f}s"
+    if job.status == "cancelled":
+        return f"{job.name}: cancelled at {done}"
+    return f"{job.name}: failed ({job.error})"
+
+
+def create_export_page() -> tkb.Frame:
+    def export_years() -> list[str]:
         year_val = year_var.get()
+        return engine.all_years if year_val == "All" else [year_val]
 
-        if year_val == "All":
-            for year in all_years:
-                export_file_pdf(year)
-        else:
-            export_file_pdf(year_val)
+    def export_csv():
+        start_export(
+            exporter.ExportJob(
+                f"CSV ({year_var.get()})",
+                exporter.write_csvs,
+                exporter.csv_jobs(engine, export_years()),
+            )
+        )
+        show_jobs()
 
-        info_pop_up("Done!")
+    def export_pdf():
+        start_export(
+            exporter.ExportJob(
+                f"PDF ({year_var.get()})",
+                exporter.write_pdfs,
+                exporter.pdf_jobs(engine, export_years()),
+            )
+        )
+        show_jobs()
+
+    def export_master_pdf():
+        start_export(
+            exporter.ExportJob(
+                f"Single PDF ({year_var.get()})",
+                exporter.write_master_pdf,
+                exporter.master_pdf_pages(
+                    engine, export_years(), include_profs_var.get()
+                ),
+                "All timetables.pdf",
+            )
+        )
+        show_jobs()
+
+    job_rows: dict = {}  # job -> (label, cancel button)
+
+    def show_jobs():
+        shown = export_jobs[-MAX_SHOWN_EXPORTS:]
+        for job in list(job_rows):
+            if job not in shown:
+                for widget in job_rows.pop(job):
+                    widget.destroy()
+
+        for row, job in enumerate(shown):
+            if job not in job_rows:
+                label = tk.Label(jobs_frame, anchor="w")
+                cancel_btn = tkb.Button(
+                    master=jobs_frame,
+                    text="Cancel",
+                    command=job.cancel,
+                    bootstyle="danger-outline",
+                )
+                job_rows[job] = (label, cancel_btn)
+            label, cancel_btn = job_rows[job]
+            label.config(text=describe_export(job))
+            label.grid(row=row, column=0, sticky="we")
+            if job.running:
+                cancel_btn.grid(row=row, column=1, sticky="e")
+            else:
+                cancel_btn.grid_remove()
 
     horizontal_padding = 20
     vertical_padding = 10
@@ -1084,7 +1395,9 @@ def create_export_page() -> tkb.Frame:
     text1.grid(row=0, column=0, sticky="NSEW")
 
     year_var = tk.StringVar()
-    year_options: list[str] = ["All"] + all_years if all_years else ["None"]
+    year_options: list[str] = (
+        ["All"] + engine.all_years if engine.all_years else ["None"]
+    )
     year_var.set(year_options[0])
 
     prof_OptionMenu = tkb.OptionMenu(export_page_frame, year_var, *year_options)
@@ -1121,148 +1434,76 @@ def create_export_page() -> tkb.Frame:
         pady=vertical_padding / 2,
     )
 
-    frame_expansion(export_page_frame)
-
-    return export_page_frame
-
-
-def create_page(page):
-    """
-    page: function or string
-    Creates a new frame from the given page
-    """
-    temp = frames[page]
-
-    current_frame = frames.values()
-    for frm in current_frame:
-        # frm.forget()
-        frm.grid_forget()
+    export_master_btn = tkb.Button(
+        master=export_page_frame,
+        text="Export to single PDF",
+        command=export_master_pdf,
+    )
+    export_master_btn.grid(
+        row=4,
+        column=0,
+        sticky="NSEW",
+        pady=vertical_padding / 2,
+    )
 
-    temp.tkraise()
-    temp.grid(row=0, column=0, sticky="nsew")
-    # temp.grid(row=0, column=0)
+    include_profs_var = tk.BooleanVar(value=False)
+    include_profs_check = tkb.Checkbutton(
+        export_page_frame,
+        text="Include professor timetables in the single PDF",
+        variable=include_profs_var,
+    )
+    include_profs_check.grid(row=5, column=0, sticky="we")
 
+    jobs_frame = tkb.Frame(export_page_frame)
+    jobs_frame.columnconfigure(0, weight=1)
+    jobs_frame.grid(row=6, column=0, sticky="NSEW", pady=vertical_padding)
 
-def get_professor_by_subject(subject: str, subject_type=None):
-    """
-    Given a subject and an optional subject type,
-    return the professor who teaches the subject.
-    """
+    frame_expansion(export_page_frame)
 
-    for professor, subjects in profs.items():
-        for year, subject_list in subjects.items():
-            for subject_info in subject_list:
-                if subject_info["Subject"] == subject:
-                    if subject_type is None or subject_info["Type"] == subject_type:
-                        return professor
+    export_page_frame.show_jobs = show_jobs
+    show_jobs()
 
-    print(
-        f"No professor found for the given subject {subject} and subject type {subject_type}"
-    )
+    return export_page_frame
 
 
-# TODO: Check this function is working properly [updated functionality for options]
-def check_professor_available(lec_num: int, day: str) -> list:
+def create_page(page):
     """
-    Checks the availability of professors for a specific lecture number and day from timetable.
-
-    Args:
-     lec_num (int): The lecture number to check
-     day (str): The day of the week to check availability for
-
-    Returns:
-     list: A list of professor names that are available for the given lecture number and day
+    page: function or string
+    Shows the frame of the given page, building it on first use. Built frames
+    are kept in 'frames', the least recently shown ones are destroyed once
+    more than MAX_CACHED_PAGES are cached.
     """
+    global shown_frame
 
-    busy_professors = []
-
-    # finding which lecture at specified lec number
-    for year in ttlist.keys():
-        scheduled_lectures: list = ttlist[year][day]
+    frame = frames.get(page)
+    if frame is None:
+        frame = frames[page] = page() if callable(page) else view_timetable_frame(page)
+    elif page in stale_pages:
+        frame.refresh()
+    stale_pages.discard(page)
+    frames.move_to_end(page)
 
-        # number of scheduled lecture can't be less than lec number
-        if len(scheduled_lectures) - 1 >= lec_num:
-            busy_professors.append(scheduled_lectures[lec_num]["professor"])
-
-    all_busy_professors = split_strip_strings(busy_professors)
-
-    return [teacher for teacher in profs.keys() if teacher not in all_busy_professors]
-
-
-def get_lec_number(professor, day) -> dict[str, list]:
-    """
-    Returns the lecture number [index] of the given professor on the given day.
-    """
-    year_subject: dict = profs.get(professor)
-    # print(f"Prof. {professor} teaches = {subject}")
-    lec_num = {}
-    years_of_prof: list = list(year_subject.keys())
+    if shown_frame is not None and shown_frame is not frame:
+        shown_frame.grid_forget()
+        if shown_frame not in frames.values():  # invalidated while shown
+            shown_frame.destroy()
+    shown_frame = frame
 
-    for year in years_of_prof:
-        scheduled_lecs = get_professors_from_schedule(year, day)
-        indexes2 = [
-            idx
-            for idx in range(len(scheduled_lecs))
-            # if scheduled_lecs[idx] == professor
-            if professor in scheduled_lecs[idx]
-        ]
-        lec_num[year] = indexes2
+    frame.tkraise()
+    frame.grid(row=0, column=0, sticky="nsew")
 
-    return lec_num
+    while len(frames) > MAX_CACHED_PAGES:
+        old_page, old_frame = frames.popitem(last=False)
+        stale_pages.discard(old_page)
+        old_frame.destroy()
 
 
 def reschedule(professor: str, day: str) -> None:
     """
     Reschedule lecture of professor on specified day
     """
-    print("function reschedule ran...")
-
-    lec_nums: dict[str, list] = get_lec_number(professor, day)
-
-    for year in lec_nums:
-        print(f"year = {year} - {lec_nums[year]}")
-        for lec in lec_nums[year]:
-            available = check_professor_available(lec, day)[0]
-            print(f"available = {available}")
-            sub = get_subject(profs, available, year, "Theory")
-            ttlist[year][day][lec] = {
-                "subject": sub,
-                "subtype": "Theory",
-                "professor": available,
-            }
-
-    create_all_tt_pages()
-
-
-def store_json(file: str, read_var) -> None:
-    """
-    Stores data as JSON in a file.
-
-    Args:
-        file (str): The path to the JSON file.
-        read_var (Any): The data to be stored as JSON.
-    """
-
-    with open(file, "w") as f:
-        json.dump(read_var, f, indent=4)
-
-
-def read_json(file_path: str):
-    """
-    Reads a JSON file and returns the loaded data.
-
-    Args:
-        file_path (str): The path to the JSON file.
-
-    Returns:
-        dict: The loaded JSON data.
-
-    """
-
-    with open(file_path, "r") as f:
-        data = json.load(f)
-
-    return data
+    engine.reschedule(professor, day)
+    invalidate_tt_pages(list(engine.profs.get(professor, {})))
 
 
 def set_default_tt() -> None:
@@ -1272,394 +1513,66 @@ def set_default_tt() -> None:
     and displaying an information pop-up message.
     """
 
-    global ttlist
-    ttlist = {year: {day: [] for day in timetable_struct} for year in all_years}
-    store_json(TT_FILE, ttlist)
-    create_all_tt_pages()
+    engine.clear_timetable()
+    store_timetable()
+    invalidate_tt_pages()
     info_pop_up("Deleted all timetables!")
 
 
-def create_all_tt_pages():
-    """
-    Creates timetable frames for each year
-    and stores them in 'frames' dictionary.
-    """
-    for year in all_years:
-        year_page: tkb.Frame = view_timetable_frame(year)
-        frames[year] = year_page
-
-
-def create_all_pages():
-    """
-    Creates all the necessary pages for the application,
-    such as entry page, reschedule page, etc.
-    The created pages are stored in 'frames' dictionary.
+def invalidate_pages(*pages, refresh: bool = False) -> None:
     """
+    Drops the cached frames of pages whose data changed, so they are built
+    again on the next navigation. A page on screen stays until it is left.
 
-    entry_page = create_entry_frame()
-    reschedule_page = create_reschedule_page()
-    timetable_page = create_timetable_page()
-    prof_page = create_professors_frame()
-    option_page = create_options_frame()
-    export_csv_page = create_export_page()
-    prof_tt_page = view_prof_tt_frame()
-    add_department_page = create_add_department_frame()
-    delete_subject_page = delete_subject_frame()
-    optional_subject_entry_page = optional_subject_entry_frame()
-    change_theme_page = change_theme_frame()
-    get_csv_page = get_csv_frame()
-    stats_page = create_stats_frame()
-
-    frames[create_entry_frame] = entry_page
-    frames[create_reschedule_page] = reschedule_page
-    frames[create_timetable_page] = timetable_page
-    frames[create_options_frame] = option_page
-    frames[create_export_page] = export_csv_page
-    frames[view_prof_tt_frame] = prof_tt_page
-    frames[create_add_department_frame] = add_department_page
-    frames[delete_subject_frame] = delete_subject_page
-    frames[optional_subject_entry_frame] = optional_subject_entry_page
-    frames[change_theme_frame] = change_theme_page
-    frames[get_csv_frame] = get_csv_page
-    frames[create_professors_frame] = prof_page
-    frames[create_stats_frame] = stats_page
-
-
-def get_subjects_by_year(year_to_find: str) -> list[tuple]:
+    With `refresh`, frames that have a refresh() function keep their widgets
+    and are only updated: right away if on screen, else when next shown.
     """
-    Returns a list of subjects for a given year.
-
-    Args:
-        year_to_find (str): The year to find subjects for.
-
-    Returns:
-        A list of dictionaries representing the subjects found.
-
-    Example:
-        year = "FY IT"
-        subjects = get_subjects_by_year(year)
-        print(subjects)
-    """
-
-    all_subs: list = []
-
-    for year in profs.values():
-        if year_to_find in year.keys():
-            subject_list: list[dict] = year[year_to_find]
-            for subject in subject_list:
-                all_subs.append((subject["Subject"], subject["Type"]))
-
-    return all_subs
-
-
-def get_subject(subs, professor, year, subtype):
-    """
-    Args:
-    subs: profs
-      professor: The name of the professor.
-      year: The year of the course.
-      subtype: The type of the subject.
-
-    Returns:
-      A subject that the professor teaches to given year.
-    """
-
-    subjects = subs[professor].get(year)
-
-    if subjects:
-        for subject in subjects:
-            if subject["Type"] == subtype:
-                subjects.append(subjects.pop(0))
-                return subject["Subject"]
-
-    return None
-
-
-def get_all_subjects(professor, year):
-    """
-    Args:
-    subs: profs
-      professor: The name of the professor.
-      year: The year of the course.
-      subtype: The type of the subject.
-
-    Returns:
-      Subjects that the professor teaches.
-    """
-    subjects: list[dict] = profs[professor].get(year)
-
-    return subjects
-
-
-def get_professors_by_year(profs_dict: dict, year: str) -> list:
-    """
-    Given a dictionary of professors and year,
-    return a list of professors that teach to the given year
-    """
-
-    professors = []
-    for prof in profs_dict.keys():
-        if year in profs_dict[prof].keys():
-            professors.append(prof)
-
-    return professors
-
-
-def get_professors_from_schedule(year: str, day: str) -> list:
-    """
-    Returns a list of professors who teach on the specified day.
-    Note: This function will return optional prof with '/'
-    """
-    today_lec: list = ttlist[year][day]
-    professors = [subject["professor"] for subject in today_lec]
-
-    return professors
-
-
-def split_strip_strings(input_string_list: list[str]) -> list[str]:
-    words = []
-
-    for string in input_string_list:
-        split_words: list[str] = string.split("/")
-        split_words = [part.strip() for part in split_words]
-        words.extend(split_words)
-
-    return words
-
-
-def auto_schedule(professors: dict[str, dict[str, list]]) -> None:
-    """
-    Generate a timetable schedule based on the availability of professors
-    """
-
-    if not professors:
-        return aleart_pop_up("No professor available to schedule a timetable!")
-
-    global ttlist
-    ttlist = {year: {day: [] for day in timetable_struct} for year in all_years}
-
-    for year in all_years:
-        generate_year_wise_schedule(year, professors)
-
-    create_all_tt_pages()
-
-
-def generate_year_wise_schedule(
-    year: str, professors: dict[str, dict[str, list]]
-) -> None:
-    department: str = get_department_by_year(year)
-    start_time, end_time, minutes_lecture = get_department_time(department)
-    no_of_lectures = calc_college_time(start_time, end_time, minutes_lecture)
-    practical_slots = get_practical_slots_by_department(department)
-    professors_queue = get_professors_by_year(professors, year)
-
-    for lec_num in range(no_of_lectures):
-        generate_daily_schedule(year, lec_num, professors_queue, practical_slots)
-
-
-def generate_daily_schedule(
-    year: str, lec_num: int, professors_queue: list, practical_slots: list
-):
-    queue_len = len(professors_queue)
-    days = list(ttlist[year].keys())
-    number_of_days = len(days)
-    day_num = 0
-    count = 0
-    attepts = 0
-    pract_attepts = 0
-
-    def queue_next():
-        professors_queue.append(professors_queue.pop(0))
-
-    while day_num < number_of_days and count < 100:
-        count += 1
-        available_prof = check_professor_available(lec_num, days[day_num])
-        today_lecs = get_professors_from_schedule(year, days[day_num])
-        today_lecs = split_strip_strings(today_lecs)
-
-        scheduled: bool = (
-            professors_queue[0] not in today_lecs
-            or lec_num > queue_len
-            or attepts >= queue_len
-        )
-        available = professors_queue[0] in available_prof
-
-        # logic to schedule the lectures if practicals not available in practical slot
-        if lec_num in practical_slots:
-            subtype = "Theory" if pract_attepts >= queue_len else "Practical"
-        else:
-            subtype = "Theory"
-
-        # subtype = "Practical" if lec_num in practical_slots else "Theory"
-
-        if available and scheduled:
-            subject = get_subject(profs, professors_queue[0], year, subtype=subtype)
-            if subject:
-                if get_subject_workload(professors_queue[0], year, subject, subtype):
-                    optional_subjects = get_optional_subjects(
-                        professors_queue[0], year, subject, subtype
-                    )
-
-                    # TODO: Split this into multiple functions
-                    if optional_subjects:
-                        temp_sub = subject
-                        temp_professor = professors_queue[0]
-
-                        # print(optional_subjects)
-
-                        for opt_professor, opt_subject in optional_subjects.items():
-                            temp_sub += f" / {opt_subject}"
-                            temp_professor += f" / {opt_professor}"
-
-                        ttlist[year][days[day_num]].append(
-                            {
-                                "subject": temp_sub,
-                                "subtype": subtype,
-                                "professor": temp_professor,
-                            }
-                        )
-                        # Note: Currently this does not reduce workload of all profs
-                        decrease_workload(professors_queue[0], year, subject, subtype)
-                        for opt_professor, opt_subject in optional_subjects.items():
-                            decrease_workload(opt_professor, year, opt_subject, subtype)
-
-                    else:
-                        ttlist[year][days[day_num]].append(
-                            {
-                                "subject": subject,
-                                "subtype": subtype,
-                                "professor": professors_queue[0],
-                            }
-                        )
-                        decrease_workload(professors_queue[0], year, subject, subtype)
-                    day_num += 1
-                    pract_attepts = 0
-
-        if count >= 100:
-            while day_num < number_of_days:
-                # print(f"Attempt exceeded! {year} {available} {day_num =} {lec_num = }")
-                ttlist[year][days[day_num]].append(
-                    {
-                        "subject": "Empty Slot",
-                        "subtype": "Empty Slot",
-                        "professor": "Empty Slot",
-                    }
-                )
-                day_num += 1
-                pract_attepts = 0
-
-        queue_next()
-        attepts += 1
-        pract_attepts += 1
-
-
-def get_subject_workload(
-    professor: str, year: str, subject: str, subject_type: str
-) -> bool:
-    """
-    Checks if a workload is available for a given professor,
-    year, subject, and subject type.
-    """
-    for sub in profs[professor][year]:
-        if (
-            subject == sub["Subject"]
-            and sub["Type"] == subject_type
-            and "Workload" in sub
-        ):
-            if sub["Workload"] > 0:
-                return True
+    for page in pages:
+        frame = frames.get(page)
+        if frame is None:
+            continue
+        if refresh and hasattr(frame, "refresh"):
+            if frame is shown_frame:
+                frame.refresh()
             else:
-                return False
-    return True
+                stale_pages.add(page)
+            continue
 
+        del frames[page]
+        stale_pages.discard(page)
+        if frame is not shown_frame:
+            frame.destroy()
 
-def decrease_workload(
-    professor: str, year: str, subject: str, subject_type: str
-) -> None:
-    """
-    Decreases the workload of a professor for a given subject and year.
-    If the workload value exists and is greater than 0, it decreases the workload.
 
-    Args:
-    professor (str): The name of the professor.
-    year (str): The academic year.
-    subject (str): The subject name.
-    subject_type (str): The subject type, e.g. "Core".
-
-    Returns:
-    None
+def invalidate_tt_pages(years=None) -> None:
     """
-
-    for sub in profs[professor][year]:
-        if (
-            subject == sub["Subject"]
-            and sub["Type"] == subject_type
-            and "Workload" in sub
-        ):
-            if sub["Workload"] > 0:
-                sub["Workload"] -= 1
-
-
-def get_optional_subjects(
-    professor: str, year: str, subject: str, subject_type: str
-) -> dict | None:
-    for sub in profs[professor][year]:
-        if (
-            subject == sub["Subject"]
-            and sub["Type"] == subject_type
-            and "Options" in sub
-        ):
-            return sub["Options"]
-
-    return None
-
-
-def get_department_by_year(year: str) -> str:
+    Updates the timetable pages of the given years (all by default) and the
+    professors' timetable, and drops the statistics page.
     """
-    Returns the department associated with a given year.
-
-    Returns:
-        str: The department associated with the given year.
-    """
-
-    for department in all_departments:
-        if department in year:
-            return department
-    return ""
-
-
-def get_all_years() -> list:
-    """
-    return all years available in prof JSON
-    """
-    all_years = set()
-
-    for year in profs.values():
-        all_years.update(year.keys())
-
-    return sorted(all_years)
-
-
-def update_all_years():
-    """
-    Updates the global variable `all_years` with the latest list of years.
-
-    Returns:
-        None
-    """
-    global all_years
-    all_years = get_all_years()
+    if years is None:
+        years = [page for page in frames if isinstance(page, str)]
+    invalidate_pages(*years, view_prof_tt_frame, refresh=True)
+    invalidate_pages(create_stats_frame)
 
 
-def update_all_departments():
+def invalidate_data_pages(years=()) -> None:
     """
-    Updates the global variable `all_years` with the latest list of years.
-
-    Returns:
-        None
+    Drops the pages built from professors, years, departments or settings,
+    and updates the timetable pages of `years`, whose tooltips list
+    professors.
     """
-    global all_departments
-    all_departments = get_all_departments()
+    invalidate_pages(
+        create_entry_frame,
+        create_options_frame,
+        create_export_page,
+        view_prof_tt_frame,
+        create_add_department_frame,
+        delete_subject_frame,
+        optional_subject_entry_frame,
+        create_professors_frame,
+        create_stats_frame,
+    )
+    invalidate_pages(*years, refresh=True)
 
 
 def aleart_pop_up(message):
@@ -1696,194 +1609,14 @@ def set_window_options(window):
     # window.option_add("*Button*cursor", "hand2")
 
 
-def get_time_slots(department: str) -> list[str]:
-    """
-    Retrieves the time slots for a given department.
-
-    Args:
-        department (str): The department to retrieve the time slots for.
-
-    Returns:
-        list[str]: A list of time slots in the format "%H:%M %p".
-
-    """
-
-    start_time, end_time, minutes_lecture = get_department_time(department)
-    no_of_lectures = calc_college_time(start_time, end_time, minutes_lecture)
-    temp_time: dt.datetime = start_time
-    time_slots = []
-
-    for _ in range(no_of_lectures):
-        time_slots.append(f"{temp_time:%H:%M %p}")
-        temp_time = temp_time + dt.timedelta(minutes=minutes_lecture)
-
-    return time_slots
-
-
-def get_departments_by_prof(professor: str) -> set[str]:
-    """
-    Retrieves the departments associated with a given professor.
-
-    Args:
-        professor (str): The name of the professor.
-
-    Returns:
-        set[str]: A set of department names.
-    """
-
-    years = profs[professor].keys()
-    departments: set[str] = {get_department_by_year(year) for year in years}
-
-    return departments
-
-
-def get_time_slots_by_prof(professor: str) -> list[str]:
-    """
-    Retrieves max time slots for a given professor.
-    """
-    departments = get_departments_by_prof(professor)
-    time_slots = [get_time_slots(department) for department in departments]
-
-    return max(time_slots, key=len)
-
-
-def get_practical_slots_by_department(department: str):
-    """
-    Retrieves the practical slots for a given department from settings.
-    """
-
-    return settings[department]["practical_slots"]
-
-
-def get_department_time(department: str) -> tuple[dt.datetime, dt.datetime, int]:
-    """
-    Retrieves the start time, end time, and duration of a lecture
-    for a given department from settings.
-    """
-    minutes_lecture: int = settings[department]["minutes_lecture"]
-    start_time = dt.datetime.strptime(settings[department]["start_time"], "%H:%M")
-    end_time = dt.datetime.strptime(settings[department]["end_time"], "%H:%M")
-
-    start_time = dt.datetime.combine(today.date(), start_time.time())
-    end_time = dt.datetime.combine(today.date(), end_time.time())
-
-    return start_time, end_time, minutes_lecture
-
-
-def export_file_csv(year: str, time_slots: list):
-    """
-    Exports a timetable to a CSV file for a given year and time slots.
-    """
-    jfile = ttlist[year]
-    days = list(jfile.keys())
-    header_row = ["Time"] + days
-
-    data_rows = []
-    day_subjects = jfile.values()
-
-    for time, *values in zip(time_slots, *day_subjects):
-        # * before values means receive the remaining elements as a list.
-        values2 = [f"{elem['subject']} ({elem['professor']})" for elem in values]
-        row = [time] + values2
-        data_rows.append(row)
-
-    with open(f"{year} timetable.csv", "w", newline="") as file:
-        writer = csv.writer(file)
-        writer.writerow(header_row)  # Writing column headers
-        writer.writerows(data_rows)  # Writing data rows
-
-
-def export_file_pdf(year: str) -> None:
-    """
-    Exports a timetable to a PDF file for a given year.
-
-    Args:
-        year (str): The year for which the timetable is to be exported.
-
-    Returns:
-        None
-
-    Example:
-        ```
-        export_file_pdf('FY IT')
-        ```
-    """
-
-    styles = getSampleStyleSheet()
-
-    # custom style for paragraphs class
-    p_style = ParagraphStyle(
-        name="p_style",
-        alignment=1,  # Center alignment
-    )
-
-    # data to process
-    year_data = ttlist[year]
-    days = [list(year_data.keys())]  # days for header of PDF
-    subjects = [
-        list(values) for values in zip(*year_data.values())
-    ]  # scheduled lectures
-    data_list = days + subjects
-    pdf_filename = f"{year} timtable.pdf"  # pdf name
-
-    for elem in range(len(subjects)):
-        for string in range(len(subjects[elem])):
-            var = subjects[elem][string]
-            var = var.replace(
-                "\n", "<br/>"
-            )  # reportlab paragraph processes html not string
-            subjects[elem][string] = Paragraph(var, style=p_style)
-
-    doc = SimpleDocTemplate(
-        pdf_filename, pagesize=landscape(A4), title=f"{year} Timtable"
-    )
-    table = Table(data_list)
-
-    horizontal_padding = 5
-    vertical_padding = 5
-
-    style = TableStyle(
-        [
-            ("BACKGROUND", (0, 0), (-1, 0), colors.black),
-            ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-            ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-            (
-                "VALIGN",
-                (0, 0),
-                (-1, -1),
-                "MIDDLE",
-            ),  # Set vertical alignment to 'MIDDLE'
-            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-            ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-            ("GRID", (0, 0), (-1, -1), 1, colors.black),
-            ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.black),
-            ("LEFTPADDING", (0, 0), (-1, -1), horizontal_padding),
-            ("RIGHTPADDING", (0, 0), (-1, -1), horizontal_padding),
-            ("TOPPADDING", (0, 0), (-1, -1), vertical_padding),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), vertical_padding),
-            ("WORDWRAP", (0, 0), (-1, -1), 1),
-        ]
-    )
-
-    table.setStyle(style)
-
-    # Add table to the document
-    header = Paragraph(f"{year} TimeTable", styles["Title"])
-
-    content = [header, Spacer(1, 10), table]
-    doc.build(content)
-
-
 def delete_all_profs():
-    global profs
-    profs = {}
-    create_all_pages()
+    engine.profs = {}
+    invalidate_data_pages(engine.all_years)
     info_pop_up("Deleted all professors!")
 
 
 def create_add_department_frame() -> tkb.Frame:
     def take_info():
-        global settings
         department_name = department_entry.get().upper()
         temp = {
             "start_time": "00:00",
@@ -1891,12 +1624,14 @@ def create_add_department_frame() -> tkb.Frame:
             "minutes_lecture": 60,
             "practical_slots": [],
         }
-        settings.update({department_name: temp})
-        store_json(SETTINGS_FILE, settings)
-        text2.config(text=f"Available Departments: {', '.join(get_all_departments())}")
+        engine.set_department_settings(department_name, temp)
+        store_json(SETTINGS_FILE, engine.settings, COMPACT_JSON)
+        text2.config(
+            text=f"Available Departments: {', '.join(engine.get_all_departments())}"
+        )
         info_pop_up(f"Added new department: {department_name}")
-        update_all_departments()
-        create_all_pages()
+        engine.update_all_departments()
+        invalidate_data_pages()
 
     vertical_padding = 10
     horizontal_padding = 15
@@ -1917,7 +1652,7 @@ def create_add_department_frame() -> tkb.Frame:
 
     text2 = tk.Label(
         add_department_frame,
-        text=f"Available Departments: {', '.join(all_departments)}",
+        text=f"Available Departments: {', '.join(engine.all_departments)}",
     )
     text2.grid(row=3, column=0, pady=vertical_padding)
 
@@ -1926,13 +1661,6 @@ def create_add_department_frame() -> tkb.Frame:
     return add_department_frame
 
 
-def get_all_departments() -> list:
-    """
-    Returns a sorted list of all departments.
-    """
-    return sorted(list(settings.keys()))
-
-
 def delete_subject_frame():
     vertical_padding = 10
     horizontal_padding = 15
@@ -1943,7 +1671,7 @@ def delete_subject_frame():
         selected_prof = prof_var.get()
         selected_year = year_var.get()
 
-        all_subs = get_all_subjects(selected_prof, selected_year)
+        all_subs = engine.get_all_subjects(selected_prof, selected_year)
 
         # Clear the current options in the second OptionMenu
         sub_OptionMenu["menu"].delete(0, "end")
@@ -1976,17 +1704,18 @@ def delete_subject_frame():
         selected_sub = sub_var.get()
         selected_subject, selected_subject_type = selected_sub.split(" - ")
 
-        for elem in profs.get(selected_prof, {}).get(selected_year, []):
-            subject = elem.get("Subject")
-            subject_type = elem.get("Type")
-            if subject == selected_subject and subject_type == selected_subject_type:
-                profs[selected_prof][selected_year].remove(elem)
-                update_options()
-                create_all_pages()
-                store_json(PROFS_FILE, profs)
+        if engine.remove_subject(
+            selected_prof, selected_year, selected_subject, selected_subject_type
+        ):
+            update_options()
+            invalidate_data_pages([selected_year])
+            profs_journal.set(
+                [selected_prof, selected_year],
+                engine.profs[selected_prof][selected_year],
+            )
 
     prof_var: tk.StringVar = tk.StringVar()
-    all_profs: list = list(profs.keys())
+    all_profs: list = list(engine.profs.keys())
 
     if not all_profs:
         label = tk.Label(
@@ -2012,7 +1741,7 @@ def delete_subject_frame():
     prof_OptionMenu.grid(row=0, column=0, pady=vertical_padding, sticky="NSEW")
 
     year_var: tk.StringVar = tk.StringVar()
-    all_years_temp: list = get_all_years()
+    all_years_temp: list = engine.get_all_years()
     year_var.set(all_years_temp[0])
 
     year_OptionMenu = tkb.OptionMenu(
@@ -2046,20 +1775,64 @@ def delete_subject_frame():
     return delete_subject_frame
 
 
-def auto_schedule_helper() -> None:
+def run_schedule(
+    scheduler: Scheduler,
+    solver: str = "greedy",
+    improve: bool = False,
+    runs: int = 1,
+    progress=None,
+    cancel: threading.Event | None = None,
+) -> tuple[float, float] | None:
     """
-    Auto-schedules professors based on their preferences.
-    Reads in the professors data from the PROFS_FILE json.
-    Runs the auto_schedule7
-    function on the professors data to generate a schedule.
+    Schedules a timetable without touching any widget, so it can run in a
+    worker thread. Returns the fill rates of the local search, if it ran.
+    Setting `cancel` stops the exact solver and the local search.
     """
+    if solver == "greedy" and runs > 1:
+        scheduler.multi_start_schedule(runs, progress=progress)
+    else:
+        scheduler.auto_schedule(solver=solver, progress=progress, cancel=cancel)
+
+    if improve:
+        return scheduler.improve_schedule(cancel=cancel)
+    return None
 
-    global profs, settings, all_years, all_departments
-    profs = read_json(PROFS_FILE)
-    settings = read_json(SETTINGS_FILE)
-    all_years = get_all_years()
-    all_departments = get_all_departments()
-    auto_schedule(profs)
+
+def finish_schedule(improved: tuple[float, float] | None) -> None:
+    """Records the run of the engine and rebuilds timetable pages."""
+    if improved:
+        before, after = improved
+        info_pop_up(f"Local search raised fill rate from {before:.2f}% to {after:.2f}%")
+
+    append_run_history(engine.run_report(), HISTORY_FILE)
+    store_timetable(engine.input_fingerprints())
+    invalidate_tt_pages()
+
+
+def store_timetable(fingerprints: dict | None = None) -> None:
+    """
+    Stores the timetable along with the input fingerprints of the years it
+    was scheduled for. Without fingerprints every year is scheduled again on
+    the next start.
+    """
+    store_json(TT_FILE, engine.ttlist.to_json(), COMPACT_JSON)
+    store_json(FINGERPRINT_FILE, fingerprints or {}, COMPACT_JSON)
+
+
+def restore_timetable() -> None:
+    """
+    Keeps the saved timetable of the years whose professors and settings did
+    not change since it was scheduled, and only schedules the other years,
+    in the background.
+    """
+    try:
+        fingerprints = read_json(FINGERPRINT_FILE)
+    except (OSError, ValueError):
+        fingerprints = {}
+
+    changed = engine.changed_years(fingerprints)
+    if changed:
+        schedule_with_progress(None, years=changed)
 
 
 def change_theme_frame() -> tkb.Frame:
@@ -2083,13 +1856,18 @@ def create_stats_frame() -> tkb.Frame:
     stats_frame = tkb.Frame(window)
 
     num_of_profs = 0
-    temp_var: dict = ttlist
     vertical_pad = 10
     horizontal_pad = 10
     borderwidth = 1
     RELIEF_TYPE = "ridge"
 
-    for text_idx, text in enumerate(["Departments", "No. of Professors"]):
+    # NumPy is only needed for the statistics page
+    from analytics import department_report
+
+    department_stats = department_report(engine)
+    headers = ["Departments", "No. of Professors", "Utilisation", "Idle Minutes"]
+
+    for text_idx, text in enumerate(headers):
         header_label = tk.Label(
             master=stats_frame,
             text=text,
@@ -2102,7 +1880,7 @@ def create_stats_frame() -> tkb.Frame:
         header_label.grid(row=0, column=text_idx, sticky="NSEW")
 
     # creating table headers
-    for dept_idx, dept in enumerate(all_departments):
+    for dept_idx, dept in enumerate(engine.all_departments):
         dept_label = tk.Label(
             master=stats_frame,
             text=f"{dept}",
@@ -2115,7 +1893,7 @@ def create_stats_frame() -> tkb.Frame:
         )
         dept_label.grid(row=dept_idx + 1, column=0, sticky="NSEW")
 
-        prof_count = len(get_professors_by_department(dept))
+        prof_count = len(engine.get_professors_by_department(dept))
         prof_count_label = tk.Label(
             master=stats_frame,
             text=f"{prof_count}",
@@ -2128,7 +1906,23 @@ def create_stats_frame() -> tkb.Frame:
         )
         prof_count_label.grid(row=dept_idx + 1, column=1, sticky="NSEW")
 
-    empty_lecs, total_lecs, tt_score = tt_score_calc()
+        stats = department_stats[dept]
+        for col, text in enumerate(
+            [f"{stats['utilisation']:.1f}%", f"{stats['idle_minutes']}"], start=2
+        ):
+            stat_label = tk.Label(
+                master=stats_frame,
+                text=text,
+                relief=RELIEF_TYPE,
+                pady=vertical_pad,
+                padx=horizontal_pad,
+                bg=LIGHT_GRAY_COLOR,
+                fg=DARK_GRAY_COLOR,
+                borderwidth=borderwidth,
+            )
+            stat_label.grid(row=dept_idx + 1, column=col, sticky="NSEW")
+
+    empty_lecs, total_lecs, tt_score = engine.tt_score_calc()
     score_label = tk.Label(
         master=stats_frame,
         text=f"Total Lecture Slots: {total_lecs}\nEmpty Lecture Slots: {empty_lecs}\nTimetable Score {tt_score:.2f}%",
@@ -2139,130 +1933,53 @@ def create_stats_frame() -> tkb.Frame:
         fg=DARK_GRAY_COLOR,
         borderwidth=borderwidth,
     )
-    score_label.grid(row=dept_idx + 1, column=0, columnspan=2, sticky="NSEW")
+    score_label.grid(
+        row=len(engine.all_departments) + 1,
+        column=0,
+        columnspan=len(headers),
+        sticky="NSEW",
+    )
     frame_expansion(stats_frame)
     return stats_frame
 
 
-def tt_score_calc():
-    """Calculates the timetable score (filled lectures/total lectures)"""
-    empty_lecs = 0
-    total_lecs = 0
-    for year in ttlist:
-        for day in ttlist[year]:
-            for lecture in ttlist[year][day]:
-                if "Empty Slot" in lecture["subject"]:
-                    empty_lecs += 1
-                total_lecs += 1
-    filled_slots = total_lecs - empty_lecs
-    tt_score = (filled_slots / total_lecs) * 100
-    return empty_lecs, total_lecs, tt_score
-
-
-def create_department_settings(department_name):
-    """Create a new department settings in settings file."""
-    if department_name not in settings:
-        temp = {
-            "start_time": "00:00",
-            "end_time": "01:00",
-            "minutes_lecture": 60,
-            "practical_slots": [],
-        }
-        settings.update({department_name: temp})
-
-
 def get_csv_frame() -> tk.Frame | tkb.Frame:
-    def add_prof_new_dict(prof, year_dept) -> None:
-        """
-        Adds professor to new dict.
-        If year-department not available then it will be added
-        """
-        if prof not in new_dict:
-            new_dict[prof] = {}
-
-        if year_dept not in new_dict[prof]:
-            new_dict[prof][year_dept] = []
-
-    def add_optional_prof_new_dict(
-        optional_profs: list, optional_subs: list, year_dept: str
-    ) -> None:
-        for prof_idx, optional_prof in enumerate(optional_profs):
-            subs_dicts: list = new_dict[optional_prof][year_dept]
-
-            for sub_dict in subs_dicts:
-                if sub_dict["Subject"] == optional_subs[prof_idx]:
-                    opt_dict = {
-                        other_prof: other_sub
-                        for (other_prof, other_sub) in zip(
-                            optional_profs, optional_subs
-                        )
-                        if other_prof != optional_prof
-                    }
-                    sub_dict["Options"] = opt_dict
-
     def import_csv_data() -> None:
         """
         Imports CSV data from a file.
         """
-        try:
-            csv_file_path = askopenfilename(filetypes=[("CSV Files", "*.csv")])
-
-            with open(csv_file_path, newline="") as csvfile:
-                reader = csv.DictReader(csvfile)
-
-                # filling the new dict with the data
-                for row in reader:
-                    prof: str = row["Professor"].strip()
-                    year_dept = f"{row['College Year']} {row['Department']}"
-                    workload: str = row["Workload"]
-                    subject_info = {"Type": row["Subject Type"]}
-
-                    if workload:
-                        workload = int(workload)
-                        subject_info["Workload"] = workload
-
-                    if "/" in prof:
-                        optional_profs = prof.split("/")
-                        optional_subs = row["Subject"].split("/")
-
-                        for prof_idx, optional_prof in enumerate(optional_profs):
-                            add_prof_new_dict(optional_prof, year_dept)
-                            subject_info_copy = (
-                                subject_info.copy()
-                            )  # copy to modify dict
-                            subject_info_copy["Subject"] = optional_subs[prof_idx]
-
-                            new_dict[optional_prof][year_dept].append(subject_info_copy)
-
-                        add_optional_prof_new_dict(
-                            optional_profs, optional_subs, year_dept
-                        )
-                    else:
-                        add_prof_new_dict(prof, year_dept)
-                        subject_info["Subject"] = row["Subject"]
-                        new_dict[prof][year_dept].append(subject_info)
-
-                    if row["Department"] not in departments:
-                        departments.append(row["Department"])
-                        create_department_settings(row["Department"])
-
-            global profs
-            profs = new_dict
-            store_json(PROFS_FILE, profs)
-            store_json(SETTINGS_FILE, settings)
-            schedule_with_progress(progress_bar)
-            update_all_years()
-            create_all_pages()
-            create_menu()
-            info_pop_up("CSV imported!")
+        csv_file_path = askopenfilename(filetypes=[("CSV Files", "*.csv")])
+        if not csv_file_path:
+            return
 
+        try:
+            new_dict, departments = read_profs_csv(csv_file_path)
+        except CSVImportError as e:
+            errors = "\n".join(e.errors[:10])
+            more = f"\n... and {e.count - 10} more" if e.count > 10 else ""
+            return aleart_pop_up(
+                f"{e.count} invalid rows, nothing was imported:\n{errors}{more}"
+            )
         except Exception as e:
             traceback.print_exc()
-            info_pop_up("Error: Use a correct file format!")
+            return info_pop_up("Error: Use a correct file format!")
+
+        for department in departments:
+            engine.create_department_settings(department)
+
+        # the old timetable belongs to the old data
+        engine.load(new_dict, engine.settings)
+        engine.clear_timetable()
+        profs_journal.store(engine.profs)
+        store_json(SETTINGS_FILE, engine.settings, COMPACT_JSON)
+        store_timetable()
+        invalidate_pages(*frames)  # years may be gone, build every page again
+        create_menu()
+
+        if ask_pop_up("CSV imported! Do you want to create the timetable now?"):
+            schedule_with_progress(progress_bar)
 
     vertical_padding = 10
-    new_dict = {}  # dictionary to store new data
-    departments = get_all_departments()
 
     main_frame = tkb.Frame(window, padding=(20, 20))  # main frame to center csv frame
     csv_frame = tkb.Frame(main_frame)
@@ -2296,61 +2013,73 @@ def get_csv_frame() -> tk.Frame | tkb.Frame:
     return main_frame
 
 
-def get_years_by_department(department):
-    """Returns a list of years for a department"""
-    departments_years = {year for year in all_years if department in year}
-    return sorted(departments_years)
-
+@contextmanager
+def timed(step: str):
+    """Adds the wall time of the block to the startup timings."""
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        startup_timings[step] = perf_counter() - start
 
-def get_professors_by_department(department: str) -> list:
-    """Returns a list of professors that teaches to given department"""
-    departments_years = get_years_by_department(department)
-    department_profs = []
-    for year in departments_years:
-        department_profs.extend(get_professors_by_year(profs, year))
 
-    return sorted(set(department_profs))
+def print_startup_timings() -> None:
+    """Prints the time every startup step took, up to the first idle loop."""
+    total = perf_counter() - STARTED
+    print("Startup timings:")
+    for step, seconds in startup_timings.items():
+        print(f"  {step:<20} {seconds * 1000:8.1f} ms")
+    print(f"  {'window shown':<20} {total * 1000:8.1f} ms")
 
 
 if __name__ == "__main__":
+    startup_timings["imports"] = perf_counter() - STARTED
+
     TT_FILE: str = "timetable.json"
     PROFS_FILE: str = "professors.json"
     SETTINGS_FILE: str = "settings.json"
+    HISTORY_FILE: str = "run_history.jsonl"
+    FINGERPRINT_FILE: str = "timetable.fingerprints.json"
+    # --compact-json writes the JSON files without indentation
+    COMPACT_JSON: bool = "--compact-json" in sys.argv[1:]
 
     LIGHT_GRAY_COLOR = "#F5F5F5"  # Background Color
     DARK_GRAY_COLOR = "#333333"  # Heading Text Color
     TEAL_COLOR = "#008080"  # Button Color
     WHITE_COLOR = "#FFFFFF"  # Button Text Color
 
-    ttlist = read_json(TT_FILE)
-    profs = read_json(PROFS_FILE)
-    settings: dict[str, dict] = read_json(SETTINGS_FILE)
+    with timed("json_load"):
+        profs_journal = JsonJournal(PROFS_FILE, COMPACT_JSON)
+        engine = Scheduler.from_files(PROFS_FILE, SETTINGS_FILE, TT_FILE)
+
+    with timed("window"):
+        # worker processes import this module too, they need no theme engine
+        import ttkbootstrap as tkb
 
-    all_years: list = get_all_years()
-    all_departments: list = get_all_departments()
+        window = tkb.Window()
 
-    window = tkb.Window()
+        window.title("ClassSync")
+        # window.wm_attributes("-topmost", True)  # stays on top of other windows
+        # window.resizable(False, False)  # Prevent resizing in both dimensions
 
-    window.title("ClassSync")
-    # window.wm_attributes("-topmost", True)  # stays on top of other windows
-    # window.resizable(False, False)  # Prevent resizing in both dimensions
+        window.minsize(450, 350)
+        window.columnconfigure(0, weight=1)
+        window.rowconfigure(0, weight=1)
 
-    window.minsize(450, 350)
-    window.columnconfigure(0, weight=1)
-    window.rowconfigure(0, weight=1)
+        HEADING_FONT = tkFont.Font(family="Segoe UI", size=14, weight="bold")
+        SUBHEADING_FONT = tkFont.Font(family="Segoe UI", size=12)
+        SUBHEADING_FONT_BOLD = tkFont.Font(family="Segoe UI", size=12, weight="bold")
 
-    HEADING_FONT = tkFont.Font(family="Segoe UI", size=14, weight="bold")
-    SUBHEADING_FONT = tkFont.Font(family="Segoe UI", size=12)
-    SUBHEADING_FONT_BOLD = tkFont.Font(family="Segoe UI", size=12, weight="bold")
+        set_window_options(window)
 
-    set_window_options(window)
+    with timed("page_build"):
+        create_menu()
+        create_page(get_csv_frame)
 
-    if profs and settings:
-        auto_schedule(profs)
-        store_json(TT_FILE, ttlist)
+    if engine.profs and engine.settings:
+        # after the first frame is drawn, changed years may need scheduling
+        window.after_idle(restore_timetable)
 
-    create_menu()
-    create_all_pages()
-    create_all_tt_pages()
-    create_page(get_csv_frame)
+    if "--startup-timings" in sys.argv[1:]:
+        window.after_idle(print_startup_timings)
     window.mainloop()
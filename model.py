@@ -0,0 +1,197 @@
+"""
+Compact in-memory timetable model for PyAutoScheduler.
+
+Professors, years, subjects and subject types are interned as integer IDs.
+A lecture is a small __slots__ object holding tuples of IDs, and every cell
+that holds the same lecture shares one object. The dict-of-strings format of
+timetable.json is only used when a timetable is loaded or saved.
+"""
+
+EMPTY_SLOT = "Empty Slot"
+SEPARATOR = " / "
+
+
+class Interner:
+    """Maps names to dense integer IDs and back."""
+
+    __slots__ = ("ids", "names")
+
+    def __init__(self) -> None:
+        self.ids: dict = {}
+        self.names: list = []
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name) -> bool:
+        return name in self.ids
+
+    def intern(self, name) -> int:
+        """Returns the ID of a name, assigning a new one if needed."""
+        ident = self.ids.get(name)
+        if ident is None:
+            ident = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return ident
+
+    def get(self, name) -> int | None:
+        """Returns the ID of a name or None if it was never interned."""
+        return self.ids.get(name)
+
+
+class Lecture:
+    """
+    A scheduled lecture. Elective groups hold one professor and one subject
+    per member, in the same order. `mask` has the bit of every professor set.
+    """
+
+    __slots__ = ("professors", "subjects", "subtype", "mask")
+
+    def __init__(
+        self, professors: tuple[int, ...], subjects: tuple[int, ...], subtype: int
+    ) -> None:
+        self.professors = professors
+        self.subjects = subjects
+        self.subtype = subtype
+        self.mask = 0
+        for professor in professors:
+            self.mask |= 1 << professor
+
+
+def _split(text) -> tuple:
+    if not isinstance(text, str):
+        return (text,)
+    return tuple(text.split(SEPARATOR))
+
+
+class Timetable:
+    """
+    Lectures of every year and day, where an empty slot is None.
+
+    Iterating a timetable yields its years in the order they were added.
+    """
+
+    def __init__(self, years=(), days=()) -> None:
+        self.days: tuple[str, ...] = tuple(days)
+        self.years = Interner()
+        self.professors = Interner()
+        self.subjects = Interner()
+        self.types = Interner()
+        self.grid: list[list[list[Lecture | None]]] = []  # [year id][day index]
+        self._day_index = {day: idx for idx, day in enumerate(self.days)}
+        self._lectures: dict[tuple, Lecture] = {}
+
+        for year in years:
+            self.add_year(year)
+
+    def __iter__(self):
+        return iter(self.years.names)
+
+    def __contains__(self, year: str) -> bool:
+        return year in self.years
+
+    def __len__(self) -> int:
+        return len(self.years)
+
+    def add_year(self, year: str) -> int:
+        """Adds a year with no lectures, if it is missing, and returns its ID."""
+        if year not in self.years:
+            self.grid.append([[] for _ in self.days])
+        return self.years.intern(year)
+
+    def lectures(self, year: str, day: str) -> list:
+        """Returns the lectures of a year on a day, in slot order."""
+        return self.grid[self.years.ids[year]][self._day_index[day]]
+
+    def lecture(self, professors, subjects, subtype: str) -> Lecture:
+        """Returns the shared lecture for the given names."""
+        key = (
+            tuple(map(self.professors.intern, professors)),
+            tuple(map(self.subjects.intern, subjects)),
+            self.types.intern(subtype),
+        )
+        lecture = self._lectures.get(key)
+        if lecture is None:
+            lecture = self._lectures[key] = Lecture(*key)
+        return lecture
+
+    def append(self, year: str, day: str, lecture: Lecture | None) -> None:
+        """Appends a lecture, or an empty slot, to a year's day."""
+        self.lectures(year, day).append(lecture)
+
+    def replace(
+        self, year: str, day: str, lec_num: int, lecture: Lecture | None
+    ) -> None:
+        """Replaces the lecture in a slot."""
+        self.lectures(year, day)[lec_num] = lecture
+
+    def professor_names(self, lecture: Lecture | None) -> tuple:
+        """Returns the professors of a lecture, none for an empty slot."""
+        if lecture is None:
+            return ()
+        return tuple(self.professors.names[prof] for prof in lecture.professors)
+
+    def subject_names(self, lecture: Lecture | None) -> tuple:
+        """Returns the subjects of a lecture, none for an empty slot."""
+        if lecture is None:
+            return ()
+        return tuple(self.subjects.names[subject] for subject in lecture.subjects)
+
+    def subtype_name(self, lecture: Lecture | None) -> str:
+        """Returns the subject type of a lecture."""
+        if lecture is None:
+            return EMPTY_SLOT
+        return self.types.names[lecture.subtype]
+
+    def to_dict(self, lecture: Lecture | None) -> dict[str, str]:
+        """
+        Converts a lecture into the timetable.json format, where elective
+        groups are joined with " / ".
+        """
+        if lecture is None:
+            return {
+                "subject": EMPTY_SLOT,
+                "subtype": EMPTY_SLOT,
+                "professor": EMPTY_SLOT,
+            }
+
+        return {
+            "subject": SEPARATOR.join(map(str, self.subject_names(lecture))),
+            "subtype": self.subtype_name(lecture),
+            "professor": SEPARATOR.join(self.professor_names(lecture)),
+        }
+
+    def from_dict(self, lecture: dict) -> Lecture | None:
+        """Interns a lecture in the timetable.json format."""
+        if lecture["professor"] == EMPTY_SLOT:
+            return None
+        return self.lecture(
+            _split(lecture["professor"]), _split(lecture["subject"]), lecture["subtype"]
+        )
+
+    def year_to_json(self, year: str) -> dict[str, list[dict]]:
+        """Returns the lectures of a year in the timetable.json format."""
+        return {
+            day: [self.to_dict(lecture) for lecture in self.lectures(year, day)]
+            for day in self.days
+        }
+
+    def to_json(self) -> dict:
+        """Returns the whole timetable in the timetable.json format."""
+        return {year: self.year_to_json(year) for year in self}
+
+    @classmethod
+    def from_json(cls, data: dict, days=()) -> "Timetable":
+        """
+        Builds a timetable from the timetable.json format. Days are taken from
+        the data, or from `days` if it has no years.
+        """
+        first_year = next(iter(data.values()), None)
+        timetable = cls(data, first_year.keys() if first_year else days)
+
+        for year, year_days in data.items():
+            for day, lectures in year_days.items():
+                cells = timetable.lectures(year, day)
+                cells.extend(timetable.from_dict(lecture) for lecture in lectures)
+
+        return timetable
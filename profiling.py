@@ -0,0 +1,127 @@
+"""
+Run reports for PyAutoScheduler.
+
+Every call of Scheduler.auto_schedule fills a RunStats with the time spent
+in each phase and year, the attempts the greedy loop made for every lecture
+number and why slots were left empty. `append_run_history` adds the report
+of a run to a JSON-lines file, so a slower or worse schedule after a data
+change can be compared with the runs before it.
+"""
+
+import datetime as dt
+import json
+import time
+from contextlib import contextmanager
+
+# attempts generate_daily_schedule makes for a lecture number before the
+# remaining days are left empty
+ATTEMPT_BUDGET = 100
+
+# why the professor at the head of the queue was not placed
+REJECTIONS = ("busy", "teaches_that_day", "no_subject", "no_workload")
+
+
+class RunStats:
+    """
+    Counters and timings of one scheduling run.
+
+    `years[year]["iterations"][lec_num]` is the number of attempts the
+    greedy loop made for a lecture number. An Empty Slot is blamed on the
+    most frequent rejection since the last lecture placed in that slot.
+    """
+
+    def __init__(self, solver: str = "greedy", seed: int | None = None) -> None:
+        self.started = dt.datetime.now().isoformat(timespec="seconds")
+        self.solver = solver
+        self.seed = seed
+        self.phases: dict[str, float] = {}
+        self.years: dict[str, dict] = {}
+        self.availability_checks = 0
+        self.rejections = dict.fromkeys(REJECTIONS, 0)
+        self.empty_causes = dict.fromkeys(REJECTIONS, 0)
+        self.extra: dict = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        """Adds the wall time of the block to a phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def year(self, year: str) -> dict:
+        """Returns the stats of a year, adding it if needed."""
+        stats = self.years.get(year)
+        if stats is None:
+            stats = self.years[year] = {
+                "seconds": 0.0,
+                "iterations": [],
+                "exhausted": 0,
+                "empty_slots": 0,
+            }
+        return stats
+
+    def record_slot(
+        self, year: str, iterations: int, rejected: dict, since: dict, empties: int
+    ) -> None:
+        """
+        Adds the attempts made for one lecture number of a year.
+
+        Args:
+            year (str): The year that was scheduled.
+            iterations (int): Attempts of the greedy loop, one availability
+                check each.
+            rejected (dict): Rejections per reason over all attempts.
+            since (dict): Rejections per reason up to the last placed lecture.
+            empties (int): Days left as Empty Slots.
+        """
+        stats = self.year(year)
+        stats["iterations"].append(iterations)
+        self.availability_checks += iterations
+        if iterations >= ATTEMPT_BUDGET:
+            stats["exhausted"] += 1
+
+        for reason, count in rejected.items():
+            self.rejections[reason] += count
+
+        if empties:
+            stats["empty_slots"] += empties
+            cause = max(REJECTIONS, key=lambda reason: rejected[reason] - since[reason])
+            self.empty_causes[cause] += empties
+
+    def to_dict(self, score: tuple[int, int, float] | None = None) -> dict:
+        """Returns the report of the run in a JSON-friendly format."""
+        report = {
+            "started": self.started,
+            "solver": self.solver,
+            "seed": self.seed,
+            "seconds": round(sum(self.phases.values()), 6),
+            "phases": {name: round(secs, 6) for name, secs in self.phases.items()},
+        }
+        if score is not None:
+            empty, total, fill_rate = score
+            report["score"] = {
+                "empty_slots": empty,
+                "total_slots": total,
+                "fill_rate": round(fill_rate, 4),
+            }
+
+        report.update(
+            availability_checks=self.availability_checks,
+            exhausted_slots=sum(stats["exhausted"] for stats in self.years.values()),
+            rejections=self.rejections,
+            empty_causes=self.empty_causes,
+            years={
+                year: dict(stats, seconds=round(stats["seconds"], 6))
+                for year, stats in self.years.items()
+            },
+        )
+        report.update(self.extra)
+        return report
+
+
+def append_run_history(report: dict, history_file: str) -> None:
+    """Appends a run report as one line to a JSON-lines file."""
+    with open(history_file, "a") as f:
+        f.write(json.dumps(report) + "\n")
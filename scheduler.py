@@ -0,0 +1,1765 @@
+"""
+Headless scheduling engine for PyAutoScheduler.
+
+This module only depends on the standard library, so it can be imported on a
+server without a display. The Tk application in main.py is a client of the
+Scheduler class defined here.
+"""
+
+import argparse
+import bisect
+import csv
+import datetime as dt
+import hashlib
+import json
+import logging
+import os
+import random
+import shutil
+import threading
+import time
+
+from model import Interner, Lecture, Timetable
+from profiling import ATTEMPT_BUDGET, REJECTIONS, RunStats, append_run_history
+
+timetable_struct: dict = {
+    "Mon": [],
+    "Tue": [],
+    "Wed": [],
+    "Thurs": [],
+    "Fri": [],
+    "Sat": [],
+}
+
+today: dt.datetime = dt.datetime.now()
+
+JOURNAL_SUFFIX = ".journal"
+logger = logging.getLogger(__name__)
+
+
+def calc_college_time(
+    start_time: dt.datetime, end_time: dt.datetime, minutes_lecture: float
+) -> int:
+    """
+    Calculates the total number of college minutes between a start time and an end time,
+    given the duration of each lecture in minutes.
+    """
+
+    minutesofcollege = end_time - start_time
+    minutesofcollege = minutesofcollege.total_seconds() / 60.0
+    return int(minutesofcollege // minutes_lecture)
+
+
+def write_atomic(file: str, text: str) -> None:
+    """
+    Writes text to a temporary file next to `file` and renames it over the
+    file, so a crash leaves either the old or the new content.
+    """
+    # unique per thread, os.replace needs it on the same file system
+    tmp_file = f"{file}.{os.getpid()}-{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_file, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(file):
+            shutil.copymode(file, tmp_file)
+        os.replace(tmp_file, file)
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+
+
+def dump_json(data, compact: bool = False) -> str:
+    """Returns data as indented JSON, or without any whitespace if compact."""
+    if compact:
+        return json.dumps(data, separators=(",", ":"))
+    return json.dumps(data, indent=4)
+
+
+def store_json(file: str, read_var, compact: bool = False) -> None:
+    """
+    Stores data as JSON in a file, atomically.
+
+    Args:
+        file (str): The path to the JSON file.
+        read_var (Any): The data to be stored as JSON.
+        compact (bool): Leaves out indentation and spaces, which makes big
+            files about half the size and faster to write.
+    """
+
+    write_atomic(file, dump_json(read_var, compact))
+
+
+def parse_journal(text: str, source: str = "journal") -> list[dict]:
+    """
+    Returns the changes of a journal written by JsonJournal. A last line cut
+    short by a crash is ignored, any other invalid line is logged and
+    skipped, so one bad record never keeps the file from loading.
+    """
+    lines = text.splitlines()
+    changes = []
+    for line_num, line in enumerate(lines, 1):
+        try:
+            change = json.loads(line)
+        except ValueError:
+            change = None
+        if isinstance(change, dict) and isinstance(change.get("path"), list):
+            changes.append(change)
+        elif line_num < len(lines):
+            logger.warning("Skipping invalid change on line %d of %s", line_num, source)
+    return changes
+
+
+def read_journal(file_path: str) -> str:
+    """Returns the journal of a JSON file, empty if it has none."""
+    try:
+        with open(file_path + JOURNAL_SUFFIX, "r") as f:
+            return f.read()
+    except FileNotFoundError:
+        return ""
+
+
+def apply_change(data, change: dict):
+    """
+    Sets or, without a "value", deletes the value at a journaled path and
+    returns the data. An empty path replaces the whole data.
+    """
+    if not change["path"]:
+        return change["value"]
+
+    *parents, key = change["path"]
+    value = data
+    for parent in parents:
+        value = value.setdefault(parent, {})
+    if "value" in change:
+        value[key] = change["value"]
+    else:
+        value.pop(key, None)
+    return data
+
+
+def read_json(file_path: str):
+    """
+    Reads a JSON file and returns the loaded data, with the changes of its
+    journal applied.
+
+    Args:
+        file_path (str): The path to the JSON file.
+
+    Returns:
+        dict: The loaded JSON data.
+
+    """
+
+    # the journal is read first: compaction replaces the file before it
+    # trims the journal, and journaled changes can be applied twice
+    changes = parse_journal(read_journal(file_path), file_path + JOURNAL_SUFFIX)
+    with open(file_path, "r") as f:
+        data = json.load(f)
+
+    for change in changes:
+        data = apply_change(data, change)
+    return data
+
+
+class JsonJournal:
+    """
+    Append-only journal of changes to a JSON file, kept next to it in
+    FILE.journal and applied by read_json.
+
+    A change sets or deletes the value at a path of keys, so an edit writes
+    one short line instead of the whole file. Changes only ever set whole
+    values, so applying one twice is harmless. After `max_changes` changes
+    the journal is compacted into the file in a background thread, which
+    rebuilds the file from disk and never touches the caller's data.
+    """
+
+    def __init__(
+        self, file: str, compact: bool = False, max_changes: int = 100
+    ) -> None:
+        self.file = file
+        self.journal_file = file + JOURNAL_SUFFIX
+        self.compact = compact
+        self.max_changes = max_changes
+
+        journal = read_journal(file)
+        if journal and not journal.endswith("\n"):  # cut short by a crash
+            journal = journal[: journal.rfind("\n") + 1]
+            write_atomic(self.journal_file, journal)
+        self.changes = len(journal.splitlines())
+        self._lock = threading.Lock()  # guards the journal and the file
+        self._compacting = threading.Lock()
+        self._generation = 0  # bumped whenever the whole file is stored
+
+    def set(self, path: list, value) -> None:
+        """Journals a new value at a path of keys."""
+        self._append({"path": path, "value": value})
+
+    def delete(self, path: list) -> None:
+        """Journals the removal of the value at a path of keys."""
+        self._append({"path": path})
+
+    def _append(self, change: dict) -> None:
+        line = dump_json(change, compact=True) + "\n"
+        with self._lock:
+            with open(self.journal_file, "a") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self.changes += 1
+
+        if self.changes >= self.max_changes and not self._compacting.locked():
+            threading.Thread(target=self.compact_journal, daemon=True).start()
+
+    def store(self, data) -> None:
+        """
+        Stores the whole file and drops the journal.
+
+        The journal is first replaced by a single change that sets the whole
+        data, then the file is written and only then the journal removed, so
+        a crash at any point loads either the old data with its changes or
+        the new data.
+        """
+        with self._lock:
+            self._generation += 1
+            change = dump_json({"path": [], "value": data}, compact=True)
+            write_atomic(self.journal_file, change + "\n")
+            store_json(self.file, data, self.compact)
+            os.remove(self.journal_file)
+            self.changes = 0
+
+    def compact_journal(self) -> None:
+        """
+        Applies the journal to the file and trims the applied changes. The
+        file is rebuilt outside the lock, so changes can still be journaled
+        meanwhile.
+        """
+        with self._compacting:
+            with self._lock:
+                generation = self._generation
+                applied = read_journal(self.file)
+            if not applied:
+                return
+
+            with open(self.file, "r") as f:
+                data = json.load(f)
+            for change in parse_journal(applied, self.journal_file):
+                data = apply_change(data, change)
+
+            text = dump_json(data, self.compact)
+
+            with self._lock:
+                if generation != self._generation:  # stored meanwhile
+                    return
+                write_atomic(self.file, text)
+                remaining = read_journal(self.file)[len(applied) :]
+                if remaining:
+                    write_atomic(self.journal_file, remaining)
+                else:
+                    os.remove(self.journal_file)
+                self.changes = len(remaining.splitlines())
+
+
+def lecture_number_interval(year: str, lec_num: int) -> tuple[int, int]:
+    """Treats every lecture number as its own time window, for all years."""
+    return lec_num, lec_num + 1
+
+
+CSV_COLUMNS = (
+    "Subject",
+    "Professor",
+    "Department",
+    "College Year",
+    "Subject Type",
+    "Workload",
+)
+SUBJECT_TYPES = ("Theory", "Practical")
+MAX_CSV_ERRORS = 50  # errors kept for the message, the rest are only counted
+
+
+class CSVImportError(ValueError):
+    """
+    Raised when rows of a professors CSV file are invalid.
+
+    `errors` holds up to MAX_CSV_ERRORS messages prefixed with their line
+    number and `count` the number of invalid rows.
+    """
+
+    def __init__(self, errors: list[str], count: int) -> None:
+        self.errors = errors
+        self.count = count
+        more = f"\n... and {count - len(errors)} more" if count > len(errors) else ""
+        super().__init__("\n".join(errors) + more)
+
+
+def validate_csv_row(row: dict) -> str | None:
+    """Returns why a row of a professors CSV file is invalid, or None."""
+    missing = [column for column in CSV_COLUMNS[:-1] if not (row[column] or "").strip()]
+    if missing:
+        return f"missing {', '.join(missing)}"
+
+    if row["Subject Type"] not in SUBJECT_TYPES:
+        return f"Subject Type must be one of {', '.join(SUBJECT_TYPES)}"
+
+    workload = (row["Workload"] or "").strip()
+    if workload and not workload.isdigit():
+        return f"Workload {workload!r} is not a whole number"
+
+    # "/" only separates subjects in elective groups, "Cost A/C" is one subject
+    profs, subjects = row["Professor"].count("/"), row["Subject"].count("/")
+    if profs and profs != subjects:
+        return (
+            f"{profs + 1} professors but {subjects + 1} subjects, "
+            'both columns need the same number of "/"'
+        )
+    return None
+
+
+def _decode_lines(file):
+    """
+    Decodes the lines of a binary file as UTF-8, falling back to cp1252 (how
+    Excel on Windows saves CSV files) for lines that are not valid UTF-8.
+    """
+    for line in file:
+        try:
+            yield line.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            yield line.decode("cp1252", errors="replace")
+
+
+def read_profs_csv(csv_file: str) -> tuple[dict, list[str]]:
+    """
+    Reads professors and their subjects from a CSV file laid out like
+    "Input Template.csv". Elective groups are one row whose professors and
+    subjects are separated by "/".
+
+    Rows are streamed and validated one at a time while the professors dict
+    is built, so only the result is held in memory. Every invalid row is
+    reported, not only the first one.
+
+    Returns:
+        tuple[dict, list[str]]: The professors dict and the departments in
+        the order they first appear.
+
+    Raises:
+        CSVImportError: If the header misses a column or any row is invalid.
+    """
+
+    new_dict: dict[str, dict[str, list]] = {}
+    departments: dict[str, None] = {}  # ordered set
+    errors: list[str] = []
+    count = 0
+
+    def error(line_num: int, message: str) -> None:
+        nonlocal count
+        count += 1
+        if len(errors) < MAX_CSV_ERRORS:
+            errors.append(f"Line {line_num}: {message}")
+
+    with open(csv_file, "rb") as csvfile:
+        reader = csv.DictReader(_decode_lines(csvfile))
+
+        missing = [c for c in CSV_COLUMNS if c not in (reader.fieldnames or ())]
+        if missing:
+            raise CSVImportError([f"Line 1: missing columns {', '.join(missing)}"], 1)
+
+        for row in reader:
+            message = validate_csv_row(row)
+            if message:
+                error(reader.line_num, message)
+                continue
+            if count:
+                continue  # the import fails, only look for more errors
+
+            year_dept = f"{row['College Year']} {row['Department']}"
+            workload: str = row["Workload"].strip()
+            subject_info: dict = {"Type": row["Subject Type"]}
+
+            if workload:
+                subject_info["Workload"] = int(workload)
+
+            prof: str = row["Professor"].strip()
+            if "/" in prof:
+                group = list(zip(prof.split("/"), row["Subject"].split("/")))
+            else:
+                group = [(prof, row["Subject"])]
+
+            for member, subject in group:
+                member_info = dict(subject_info, Subject=subject)
+                if len(group) > 1:
+                    member_info["Options"] = {
+                        other: other_sub
+                        for other, other_sub in group
+                        if other != member
+                    }
+                new_dict.setdefault(member, {}).setdefault(year_dept, [])
+                new_dict[member][year_dept].append(member_info)
+
+            departments[row["Department"]] = None
+
+    if count:
+        raise CSVImportError(errors, count)
+
+    return new_dict, list(departments)
+
+
+class BusyIntervals:
+    """
+    Busy time of one professor on one day as disjoint intervals sorted by
+    start, in minutes since midnight. Overlapping lectures are merged.
+    """
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self) -> None:
+        self.starts: list[int] = []
+        self.ends: list[int] = []
+
+    def add(self, start: int, end: int) -> None:
+        """Marks an interval as busy, merging it with the ones it overlaps."""
+        low = bisect.bisect_left(self.ends, start)
+        high = bisect.bisect_right(self.starts, end)
+        if low < high:
+            start = min(start, self.starts[low])
+            end = max(end, self.ends[high - 1])
+        self.starts[low:high] = [start]
+        self.ends[low:high] = [end]
+
+    def overlaps(self, start: int, end: int) -> bool:
+        """Checks if any busy interval overlaps the given one."""
+        idx = bisect.bisect_left(self.starts, end)
+        return idx > 0 and self.ends[idx - 1] > start
+
+
+class OccupancyIndex:
+    """
+    Index of busy professors, kept up to date as lectures are placed.
+
+    Lectures are compared by clock time, not by lecture number, because
+    departments can start at different times and have different lecture
+    lengths. `slot_interval(year, lec_num)` gives the clock time of a lecture
+    and every (professor, day) keeps its busy time as BusyIntervals, so an
+    availability check is a bisect. Each (year, day) also stores a bitmask of
+    the professors already teaching that year on that day, using the bit of
+    their interned ID in the timetable.
+
+    `schedules` is the inverted index of the timetable: every professor ID
+    maps to the (day, lecture number, year, subject ID) of their lectures.
+    """
+
+    def __init__(self, professors: Interner | None = None, slot_interval=None) -> None:
+        self.professors = professors if professors is not None else Interner()
+        self.slot_interval = slot_interval or lecture_number_interval
+        self.busy: dict[tuple[int, str], BusyIntervals] = {}
+        self.year_days: dict[tuple[str, str], int] = {}
+        self.schedules: dict[int, list[tuple[str, int, str, int]]] = {}
+
+    @classmethod
+    def from_timetable(
+        cls, timetable: Timetable, slot_interval=None
+    ) -> "OccupancyIndex":
+        """Builds an index from an existing timetable."""
+        index = cls(timetable.professors, slot_interval)
+        for year in timetable:
+            for day in timetable.days:
+                for lec_num, lecture in enumerate(timetable.lectures(year, day)):
+                    index.mark(year, day, lec_num, lecture)
+        return index
+
+    def bit(self, professor: str) -> int:
+        """Returns the bit of a professor, interning them if needed."""
+        return 1 << self.professors.intern(professor)
+
+    def mark(self, year: str, day: str, lec_num: int, lecture: Lecture | None) -> None:
+        """Marks all professors of a scheduled lecture as busy."""
+        if lecture is None:
+            return
+
+        start, end = self.slot_interval(year, lec_num)
+        for professor, subject in zip(lecture.professors, lecture.subjects):
+            key = (professor, day)
+            if key not in self.busy:
+                self.busy[key] = BusyIntervals()
+            self.busy[key].add(start, end)
+            entry = (day, lec_num, year, subject)
+            self.schedules.setdefault(professor, []).append(entry)
+
+        key = (year, day)
+        self.year_days[key] = self.year_days.get(key, 0) | lecture.mask
+
+    def is_available(self, professor: str, year: str, day: str, lec_num: int) -> bool:
+        """Checks if a professor is free during a year's lecture on a day."""
+        busy = self.busy.get((self.professors.intern(professor), day))
+        return busy is None or not busy.overlaps(*self.slot_interval(year, lec_num))
+
+    def teaches_on(self, professor: str, year: str, day: str) -> bool:
+        """Checks if a professor already teaches the given year on the given day."""
+        return bool(self.year_days.get((year, day), 0) & self.bit(professor))
+
+    def available_professors(
+        self, professors, year: str, day: str, lec_num: int
+    ) -> list:
+        """Returns the professors from given list that are free in the slot."""
+        start, end = self.slot_interval(year, lec_num)
+        available = []
+        for prof in professors:
+            busy = self.busy.get((self.professors.intern(prof), day))
+            if busy is None or not busy.overlaps(start, end):
+                available.append(prof)
+        return available
+
+
+class WorkloadLedger:
+    """
+    Workload left per (professor, year, subject, type), built from profs.
+
+    Subject dicts of profs are kept by reference, so their "Options" stay
+    current, but scheduling only counts down the ledger and never the
+    "Workload" stored in profs. Every (professor, year, type) also has a
+    round-robin cursor over its subjects.
+    """
+
+    def __init__(self, profs: dict) -> None:
+        self.entries: dict[tuple[str, str, str, str], dict] = {}
+        self.remaining: dict[tuple[str, str, str, str], int] = {}
+        self.subjects: dict[tuple[str, str, str], list[str]] = {}
+        self.cursors: dict[tuple[str, str, str], int] = {}
+
+        for professor, years in profs.items():
+            for year, subjects in years.items():
+                for sub in subjects:
+                    self.add(professor, year, sub)
+
+    def add(self, professor: str, year: str, sub: dict) -> None:
+        """Adds a subject dict of profs to the ledger."""
+        key = (professor, year, sub["Subject"], sub["Type"])
+        if key not in self.entries:
+            self.subjects.setdefault((professor, year, sub["Type"]), []).append(
+                sub["Subject"]
+            )
+        self.entries[key] = sub
+        if "Workload" in sub:
+            self.remaining[key] = sub["Workload"]
+
+    def remove(
+        self, professor: str, year: str, subject: str, subject_type: str
+    ) -> None:
+        """Removes a subject from the ledger."""
+        key = (professor, year, subject, subject_type)
+        if self.entries.pop(key, None) is None:
+            return
+        self.remaining.pop(key, None)
+        self.subjects[(professor, year, subject_type)].remove(subject)
+
+    def reset(self) -> None:
+        """Restores every workload from profs and rewinds the cursors."""
+        self.remaining = {
+            key: sub["Workload"]
+            for key, sub in self.entries.items()
+            if "Workload" in sub
+        }
+        self.cursors = {}
+
+    def entry(
+        self, professor: str, year: str, subject: str, subject_type: str
+    ) -> dict | None:
+        """Returns the subject dict of profs, if there is one."""
+        return self.entries.get((professor, year, subject, subject_type))
+
+    def workload(
+        self, professor: str, year: str, subject: str, subject_type: str
+    ) -> int | None:
+        """Returns the workload left for a subject or None if it is unlimited."""
+        return self.remaining.get((professor, year, subject, subject_type))
+
+    def has_workload(
+        self, professor: str, year: str, subject: str, subject_type: str
+    ) -> bool:
+        """Checks if a subject has workload left."""
+        remaining = self.remaining.get((professor, year, subject, subject_type))
+        return remaining is None or remaining > 0
+
+    def consume(
+        self,
+        professor: str,
+        year: str,
+        subject: str,
+        subject_type: str,
+        count: int = 1,
+    ) -> None:
+        """
+        Uses up workload of a subject. A negative count gives workload back,
+        but never more than the workload in profs.
+        """
+        key = (professor, year, subject, subject_type)
+        if key in self.remaining:
+            remaining = max(self.remaining[key] - count, 0)
+            self.remaining[key] = min(remaining, self.entries[key]["Workload"])
+
+    def next_subject(self, professor: str, year: str, subject_type: str) -> str | None:
+        """Returns the professor's next subject of a type, round-robin."""
+        key = (professor, year, subject_type)
+        subjects = self.subjects.get(key)
+        if not subjects:
+            return None
+
+        cursor = self.cursors.get(key, 0)
+        self.cursors[key] = cursor + 1
+        return subjects[cursor % len(subjects)]
+
+
+class SlotTable:
+    """
+    Lecture slots of one department, compiled once from its settings.
+
+    Clock times are combined with today's date, like everywhere else in the
+    app, so slots of different departments can be compared.
+    """
+
+    __slots__ = (
+        "start_time",
+        "end_time",
+        "start_minute",
+        "minutes_lecture",
+        "count",
+        "starts",
+        "labels",
+        "practical_slots",
+        "practical_mask",
+    )
+
+    def __init__(self, department_settings: dict) -> None:
+        self.minutes_lecture: int = department_settings["minutes_lecture"]
+        start_time = dt.datetime.strptime(department_settings["start_time"], "%H:%M")
+        end_time = dt.datetime.strptime(department_settings["end_time"], "%H:%M")
+        self.start_time = dt.datetime.combine(today.date(), start_time.time())
+        self.end_time = dt.datetime.combine(today.date(), end_time.time())
+        self.start_minute = start_time.hour * 60 + start_time.minute
+        self.count = calc_college_time(
+            self.start_time, self.end_time, self.minutes_lecture
+        )
+
+        duration = dt.timedelta(minutes=self.minutes_lecture)
+        self.starts: tuple[dt.datetime, ...] = tuple(
+            self.start_time + duration * slot for slot in range(self.count)
+        )
+        self.labels: tuple[str, ...] = tuple(
+            f"{start:%H:%M %p}" for start in self.starts
+        )
+
+        self.practical_slots: tuple[int, ...] = tuple(
+            department_settings["practical_slots"]
+        )
+        self.practical_mask = 0
+        for slot in self.practical_slots:
+            self.practical_mask |= 1 << slot
+
+    def interval(self, slot: int) -> tuple[int, int]:
+        """Returns the clock time of a slot in minutes since midnight."""
+        start = self.start_minute + slot * self.minutes_lecture
+        return start, start + self.minutes_lecture
+
+    def is_practical(self, slot: int) -> bool:
+        """Checks if practicals may be placed in a slot."""
+        return bool(self.practical_mask >> slot & 1)
+
+
+class DerivedIndex:
+    """
+    Lookup maps derived from profs and the year and department lists.
+
+    Professors and subjects per year are built once up front, the lookups
+    that take free-form input are memoised on first use. The scheduler drops
+    its index whenever profs, settings, years or departments change.
+    """
+
+    def __init__(self, profs: dict, all_years: list, all_departments: list) -> None:
+        self.profs = profs
+        self.all_years = all_years
+        self.all_departments = all_departments
+
+        self.professors_by_year: dict[str, list[str]] = {}
+        self.subjects_by_year: dict[str, list[tuple[str, str]]] = {}
+        self.department_by_year: dict[str, str] = {}
+        self.years_by_department: dict[str, list[str]] = {}
+        self.professors_by_department: dict[str, list[str]] = {}
+        self.departments_by_prof: dict[str, set[str]] = {}
+
+        for professor, years in profs.items():
+            for year, subjects in years.items():
+                self.professors_by_year.setdefault(year, []).append(professor)
+                self.subjects_by_year.setdefault(year, []).extend(
+                    (sub["Subject"], sub["Type"]) for sub in subjects
+                )
+
+    def department(self, year: str) -> str:
+        """Returns the first department whose name is part of the year."""
+        if year not in self.department_by_year:
+            self.department_by_year[year] = next(
+                (dept for dept in self.all_departments if dept in year), ""
+            )
+        return self.department_by_year[year]
+
+    def years(self, department: str) -> list[str]:
+        """Returns the sorted years that contain the department's name."""
+        if department not in self.years_by_department:
+            self.years_by_department[department] = sorted(
+                {year for year in self.all_years if department in year}
+            )
+        return self.years_by_department[department]
+
+    def department_professors(self, department: str) -> list[str]:
+        """Returns the sorted professors teaching any year of a department."""
+        if department not in self.professors_by_department:
+            self.professors_by_department[department] = sorted(
+                {
+                    prof
+                    for year in self.years(department)
+                    for prof in self.professors_by_year.get(year, [])
+                }
+            )
+        return self.professors_by_department[department]
+
+    def professor_departments(self, professor: str) -> set[str]:
+        """Returns the departments of every year a professor teaches."""
+        if professor not in self.departments_by_prof:
+            self.departments_by_prof[professor] = {
+                self.department(year) for year in self.profs[professor]
+            }
+        return self.departments_by_prof[professor]
+
+
+class SchedulingCancelled(Exception):
+    """Raised by a progress callback to stop a scheduling run."""
+
+
+class Scheduler:
+    """
+    Holds professors, department settings and the timetable built from them.
+
+    Every instance owns its own state, so several schedules can be built in
+    one process, in threads or in worker processes.
+    """
+
+    def __init__(
+        self,
+        profs: dict | None = None,
+        settings: dict | None = None,
+        ttlist: Timetable | None = None,
+    ) -> None:
+        self._index: DerivedIndex | None = None
+        self._slot_tables: dict[str, SlotTable] = {}
+        self._available: dict[tuple[str, str, int], list[str]] = {}
+        self.profs = profs if profs is not None else {}
+        self.settings = settings if settings is not None else {}
+        self.ttlist = ttlist if ttlist is not None else Timetable(days=timetable_struct)
+        self.all_years: list = self.get_all_years()
+        self.all_departments: list = self.get_all_departments()
+        self.stats = RunStats()
+        self.rebuild_occupancy()
+
+    @property
+    def profs(self) -> dict[str, dict[str, list]]:
+        return self._profs
+
+    @profs.setter
+    def profs(self, profs: dict[str, dict[str, list]]) -> None:
+        self._profs = profs
+        self.ledger = WorkloadLedger(profs)
+        self.invalidate_index()
+
+    @property
+    def settings(self) -> dict[str, dict]:
+        return self._settings
+
+    @settings.setter
+    def settings(self, settings: dict[str, dict]) -> None:
+        self._settings = settings
+        self._slot_tables = {}
+        self.invalidate_index()
+
+    @property
+    def index(self) -> DerivedIndex:
+        """The lookup maps of the current data, built on first use."""
+        if self._index is None:
+            self._index = DerivedIndex(self.profs, self.all_years, self.all_departments)
+        return self._index
+
+    def invalidate_index(self) -> None:
+        """
+        Drops the lookup maps. Call it after changing profs or the department
+        list in place without going through the scheduler.
+        """
+        self._index = None
+        self._available.clear()
+
+    def rebuild_occupancy(self) -> None:
+        """Rebuilds the occupancy index from the current timetable."""
+        self.occupancy = OccupancyIndex.from_timetable(self.ttlist, self.slot_interval)
+        self._available.clear()
+
+    def slot_interval(self, year: str, lec_num: int) -> tuple[int, int]:
+        """
+        Returns the clock time of a year's lecture in minutes since midnight.
+        Years without department settings fall back to their lecture number.
+        """
+        department = self.get_department_by_year(year)
+        if department not in self.settings:
+            return lecture_number_interval(year, lec_num)
+        return self.slot_table(department).interval(lec_num)
+
+    def slot_table(self, department: str) -> SlotTable:
+        """Returns the compiled slots of a department."""
+        table = self._slot_tables.get(department)
+        if table is None:
+            table = self._slot_tables[department] = SlotTable(self.settings[department])
+        return table
+
+    def set_department_settings(
+        self, department: str, department_settings: dict
+    ) -> None:
+        """
+        Replaces the settings of a department and recompiles its slots.
+        Call `update_all_departments` afterwards for a new department.
+        """
+        self.settings[department] = department_settings
+        self._slot_tables.pop(department, None)
+        self.rebuild_occupancy()
+
+    @classmethod
+    def from_files(
+        cls, profs_file: str, settings_file: str, tt_file: str | None = None
+    ) -> "Scheduler":
+        """Creates a scheduler from professors, settings and timetable JSON files."""
+        ttlist = (
+            Timetable.from_json(read_json(tt_file), timetable_struct)
+            if tt_file
+            else None
+        )
+        return cls(read_json(profs_file), read_json(settings_file), ttlist)
+
+    def load(self, profs: dict, settings: dict) -> None:
+        """Replaces professors and settings, keeping the current timetable."""
+        self.profs = profs
+        self.settings = settings
+        self.update_all_years()
+        self.update_all_departments()
+        self.rebuild_occupancy()
+
+    def get_professor_by_subject(self, subject: str, subject_type=None):
+        """
+        Given a subject and an optional subject type,
+        return the professor who teaches the subject.
+        """
+
+        for professor, subjects in self.profs.items():
+            for year, subject_list in subjects.items():
+                for subject_info in subject_list:
+                    if subject_info["Subject"] == subject:
+                        if subject_type is None or subject_info["Type"] == subject_type:
+                            return professor
+
+        print(
+            f"No professor found for the given subject {subject} and subject type {subject_type}"
+        )
+
+    def check_professor_available(self, lec_num: int, day: str, year: str) -> list:
+        """
+        Checks the availability of professors for a year's lecture on a day from timetable.
+
+        Args:
+         lec_num (int): The lecture number to check
+         day (str): The day of the week to check availability for
+         year (str): The year whose slot times are used
+
+        Returns:
+         list: A list of professor names that are free during that lecture's clock time
+        """
+
+        return self.occupancy.available_professors(
+            self.profs.keys(), year, day, lec_num
+        )
+
+    def get_available_professors(self, year: str, day: str, lec_num: int) -> list:
+        """
+        Returns the professors of a year who are free during one of its
+        lectures. Results are memoised until the timetable, the settings or
+        the professors change.
+        """
+        key = (year, day, lec_num)
+        available = self._available.get(key)
+        if available is None:
+            available = self._available[key] = self.occupancy.available_professors(
+                self.get_professors_by_year(year), year, day, lec_num
+            )
+        return available
+
+    def place_lecture(self, year: str, day: str, lecture: Lecture | None) -> None:
+        """
+        Appends a lecture (None for an Empty Slot) to the timetable and marks
+        it in the occupancy index.
+        """
+        lectures: list = self.ttlist.lectures(year, day)
+        self.occupancy.mark(year, day, len(lectures), lecture)
+        lectures.append(lecture)
+        if self._available:
+            self._available.clear()
+
+    def get_professor_schedule(self, professor: str) -> list[tuple]:
+        """
+        Returns the (day, lecture number, year, subject) of every lecture of a
+        professor, looked up in the inverted index of the occupancy index.
+        """
+        prof_id = self.ttlist.professors.get(professor)
+        if prof_id is None:
+            return []
+
+        subjects = self.ttlist.subjects.names
+        return [
+            (day, lec_num, year, subjects[subject])
+            for day, lec_num, year, subject in self.occupancy.schedules.get(prof_id, ())
+        ]
+
+    def get_lec_number(self, professor, day) -> dict[str, list]:
+        """
+        Returns the lecture number [index] of the given professor on the given day.
+        """
+        lec_num: dict[str, list] = {year: [] for year in self.profs.get(professor, {})}
+
+        for lec_day, lec, year, _ in self.get_professor_schedule(professor):
+            if lec_day == day:
+                lec_num.setdefault(year, []).append(lec)
+
+        for lecs in lec_num.values():
+            lecs.sort()
+        return lec_num
+
+    def reschedule(self, professor: str, day: str) -> None:
+        """
+        Gives the lectures of a professor on a day to other professors of the
+        same year who are free then, with one of their theory subjects. A
+        lecture nobody can take becomes an Empty Slot.
+        """
+        for year, lec_nums in self.get_lec_number(professor, day).items():
+            for lec_num in lec_nums:
+                lecture = None
+                for available in self.occupancy.available_professors(
+                    self.get_professors_by_year(year), year, day, lec_num
+                ):
+                    subject = self.get_subject(available, year, "Theory")
+                    if subject:
+                        lecture = self.ttlist.lecture([available], [subject], "Theory")
+                        break
+
+                self.ttlist.replace(year, day, lec_num, lecture)
+                # the professor who took it is busy before the next lecture
+                # is given away; the freed professor is released below
+                self.occupancy.mark(year, day, lec_num, lecture)
+
+        self.rebuild_occupancy()
+
+    def clear_timetable(self) -> None:
+        """
+        Replaces the timetable with an empty one for each year and day.
+        """
+        self.ttlist = Timetable(self.all_years, timetable_struct)
+        self.occupancy = OccupancyIndex(self.ttlist.professors, self.slot_interval)
+        self._available.clear()
+
+    def get_subjects_by_year(self, year_to_find: str) -> list[tuple]:
+        """
+        Returns a list of subjects for a given year.
+
+        Args:
+            year_to_find (str): The year to find subjects for.
+
+        Returns:
+            A list of (subject, type) tuples for the subjects found.
+
+        Example:
+            year = "FY IT"
+            subjects = scheduler.get_subjects_by_year(year)
+            print(subjects)
+        """
+
+        return list(self.index.subjects_by_year.get(year_to_find, []))
+
+    def get_subject(self, professor, year, subtype):
+        """
+        Args:
+          professor: The name of the professor.
+          year: The year of the course.
+          subtype: The type of the subject.
+
+        Returns:
+          A subject that the professor teaches to given year.
+        """
+
+        return self.ledger.next_subject(professor, year, subtype)
+
+    def add_professor(self, professor: str, year: str) -> None:
+        """
+        Adds a professor teaching the given year, creating both if needed.
+        """
+        self.profs.setdefault(professor, {}).setdefault(year, [])
+        self.invalidate_index()
+
+    def add_subject(self, professor: str, year: str, sub_dict: dict) -> None:
+        """
+        Adds a subject to the given professor and year, creating both if needed.
+        """
+        self.profs.setdefault(professor, {}).setdefault(year, []).append(sub_dict)
+        self.ledger.add(professor, year, sub_dict)
+        self.invalidate_index()
+
+    def remove_subject(
+        self, professor: str, year: str, subject: str, subject_type: str
+    ) -> bool:
+        """
+        Removes a subject from the given professor and year.
+
+        Returns:
+            bool: True if the subject was found and removed.
+        """
+        sub = self.ledger.entry(professor, year, subject, subject_type)
+        if sub is None:
+            return False
+
+        self.profs[professor][year].remove(sub)
+        self.ledger.remove(professor, year, subject, subject_type)
+        self.invalidate_index()
+        return True
+
+    def get_all_subjects(self, professor, year):
+        """
+        Args:
+          professor: The name of the professor.
+          year: The year of the course.
+
+        Returns:
+          Subjects that the professor teaches.
+        """
+        subjects: list[dict] = self.profs[professor].get(year)
+
+        return subjects
+
+    def get_professors_by_year(self, year: str) -> list:
+        """
+        Return a list of professors that teach to the given year
+        """
+
+        return list(self.index.professors_by_year.get(year, []))
+
+    def get_professors_from_schedule(self, year: str, day: str) -> list[tuple]:
+        """
+        Returns the professors of every lecture on the specified day.
+        Note: Every lecture is a tuple, elective groups have several professors
+        and Empty Slots have none.
+        """
+        today_lec: list = self.ttlist.lectures(year, day)
+        professors = [self.ttlist.professor_names(lecture) for lecture in today_lec]
+
+        return professors
+
+    def auto_schedule(
+        self,
+        solver: str = "greedy",
+        time_limit: float = 5.0,
+        seed: int | None = None,
+        progress=None,
+        cancel: threading.Event | None = None,
+    ) -> None:
+        """
+        Generate a timetable schedule based on the availability of professors
+
+        Args:
+            solver (str): "greedy" rotates the professors queue for every slot,
+                "exact" runs the constraint-propagation search in solver.py
+                to minimise Empty Slots.
+            time_limit (float): Seconds the exact solver may search for.
+            seed (int | None): Shuffles the greedy professors queue of every
+                year with this seed. None keeps the order of professors.json.
+            progress (Callable[[int, int], None] | None): Called with the
+                steps done and the total, once per scheduled year (the exact
+                solver is a single step). It may raise SchedulingCancelled
+                to stop the run, leaving the timetable incomplete.
+            cancel (threading.Event | None): Stops the exact solver with
+                SchedulingCancelled once set, checked at every search node.
+
+        The timings and counters of the run are kept in `self.stats`, see
+        `run_report`.
+        """
+
+        if not self.profs:
+            return
+
+        self.stats = stats = RunStats(solver, seed)
+        self.ledger.reset()
+
+        if solver == "exact":
+            from solver import ExactSolver
+
+            if progress is not None:
+                progress(0, 1)
+            with stats.phase("solve"):
+                exact_solver = ExactSolver(self, time_limit=time_limit, cancel=cancel)
+                exact_solver.solve()
+            with stats.phase("apply"):
+                exact_solver.apply()
+            if progress is not None:
+                progress(1, 1)
+            return
+
+        with stats.phase("clear"):
+            self.clear_timetable()
+        rng = random.Random(seed) if seed is not None else None
+
+        with stats.phase("schedule"):
+            for done, year in enumerate(self.all_years, 1):
+                self.generate_year_wise_schedule(year, rng)
+                if progress is not None:
+                    progress(done, len(self.all_years))
+
+    def input_fingerprints(self) -> dict[str, str]:
+        """
+        Returns a content hash of the scheduling input of every year: the
+        days, the settings of its department and the subjects of every
+        professor teaching it, in the order of profs.
+
+        Other years only affect a year through the professors they share, so
+        a year whose fingerprint did not change can keep its lectures while
+        the changed years are scheduled around them.
+        """
+        subjects: dict[str, list] = {year: [] for year in self.all_years}
+        for professor, years in self.profs.items():
+            for year, year_subjects in years.items():
+                subjects.setdefault(year, []).append([professor, year_subjects])
+
+        fingerprints = {}
+        for year in self.all_years:
+            data = {
+                "days": list(timetable_struct),
+                "settings": self.settings.get(self.get_department_by_year(year)),
+                "subjects": subjects[year],
+            }
+            text = json.dumps(data, sort_keys=True)
+            fingerprints[year] = hashlib.sha256(text.encode()).hexdigest()
+
+        return fingerprints
+
+    def changed_years(self, fingerprints: dict[str, str]) -> list[str]:
+        """
+        Returns the years that are missing from the timetable or whose input
+        fingerprint differs from `fingerprints`, saved when the timetable was
+        scheduled.
+        """
+        current = self.input_fingerprints()
+        return [
+            year
+            for year in self.all_years
+            if year not in self.ttlist or fingerprints.get(year) != current[year]
+        ]
+
+    def schedule_years(self, years, progress=None) -> None:
+        """
+        Schedules the given years with the greedy scheduler and keeps the
+        lectures of the other years, whose workload is counted as used.
+        Years of the timetable that are no longer in profs are dropped.
+        Scheduling every year gives the same timetable as auto_schedule.
+
+        Args:
+            years (Iterable[str]): The years to schedule.
+            progress (Callable[[int, int], None] | None): See auto_schedule.
+        """
+        years = [year for year in self.all_years if year in set(years)]
+        kept = [
+            year for year in self.all_years if year in self.ttlist and year not in years
+        ]
+
+        self.stats = stats = RunStats("greedy")
+        stats.extra["kept_years"] = len(kept)
+
+        with stats.phase("clear"):
+            data = {
+                year: (
+                    self.ttlist.year_to_json(year)
+                    if year in kept
+                    else {day: [] for day in timetable_struct}
+                )
+                for year in self.all_years
+            }
+            self.ttlist = Timetable.from_json(data, timetable_struct)
+            self.rebuild_occupancy()
+
+            self.ledger.reset()
+            for year in kept:
+                for day in self.ttlist.days:
+                    for lecture in self.ttlist.lectures(year, day):
+                        if lecture is None:
+                            continue
+                        subtype = self.ttlist.subtype_name(lecture)
+                        for professor, subject in zip(
+                            self.ttlist.professor_names(lecture),
+                            self.ttlist.subject_names(lecture),
+                        ):
+                            self.ledger.consume(professor, year, subject, subtype)
+
+        with stats.phase("schedule"):
+            for done, year in enumerate(years, 1):
+                self.generate_year_wise_schedule(year)
+                if progress is not None:
+                    progress(done, len(years))
+
+    def adopt_schedule(self, other: "Scheduler") -> None:
+        """
+        Takes over the timetable, workloads left and run stats of a scheduler
+        built from the same professors and settings, e.g. in a worker thread.
+        """
+        self.ttlist = other.ttlist
+        self.ledger.remaining = dict(other.ledger.remaining)
+        self.ledger.cursors = dict(other.ledger.cursors)
+        self.stats = other.stats
+        self.rebuild_occupancy()
+
+    def run_report(self) -> dict:
+        """
+        Returns the report of the last scheduling run: time per phase and
+        year, attempts per lecture number, availability checks, rejections
+        and the causes of Empty Slots, along with the timetable score.
+        """
+        return self.stats.to_dict(self.tt_score_calc())
+
+    def multi_start_schedule(
+        self, runs: int, workers: int | None = None, seed: int = 0, progress=None
+    ) -> tuple[int | None, float]:
+        """
+        Runs the greedy scheduler with the original queue order and `runs - 1`
+        shuffled ones across a process pool, then keeps the best timetable.
+
+        The greedy scheduler is deterministic for a given seed, so workers
+        only send back scores and the winning seed is scheduled again here.
+        `progress` is called with the runs done and `runs`, and may raise
+        SchedulingCancelled like in auto_schedule.
+
+        Returns:
+            tuple[int | None, float]: The winning seed and its timetable score.
+        """
+
+        if not self.profs:
+            return None, 0.0
+
+        # multiprocessing is slow to import and most runs never need it
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        seeds: list[int | None] = [None] + [seed + run for run in range(runs - 1)]
+
+        started = time.perf_counter()
+        results = []
+        # the GUI runs this in a thread, and a forked worker could inherit a
+        # lock another thread holds, so workers are spawned like on Windows
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_variant_worker,
+            initargs=(self.profs, self.settings),
+        ) as executor:
+            try:
+                for result in executor.map(_score_variant, seeds):
+                    results.append(result)
+                    if progress is not None:
+                        progress(len(results), runs)
+            except SchedulingCancelled:
+                executor.shutdown(cancel_futures=True)
+                raise
+        elapsed = time.perf_counter() - started
+
+        # highest score wins, ties go to the earliest run
+        best_score, best_seed = max(
+            results, key=lambda result: (result[0], -seeds.index(result[1]))
+        )
+        self.auto_schedule(seed=best_seed)
+        self.stats.phases["multi_start"] = elapsed
+        self.stats.extra["runs"] = runs
+
+        return best_seed, best_score
+
+    def improve_schedule(
+        self,
+        iterations: int = 20000,
+        time_limit: float | None = None,
+        seed: int | None = None,
+        cancel: threading.Event | None = None,
+    ) -> tuple[float, float]:
+        """
+        Runs the local-search pass from local_search.py on the current
+        timetable to fill Empty Slots. Setting `cancel` stops it with
+        SchedulingCancelled and keeps the timetable as it was.
+
+        Returns:
+            tuple[float, float]: The fill rate (in %) before and after.
+        """
+        from local_search import LocalSearch
+
+        search = LocalSearch(
+            self, iterations=iterations, time_limit=time_limit, seed=seed, cancel=cancel
+        )
+        with self.stats.phase("improve"):
+            before, after = search.run()
+        self.stats.extra["improve"] = {"before": before, "after": after}
+        return before, after
+
+    def generate_year_wise_schedule(
+        self, year: str, rng: random.Random | None = None
+    ) -> None:
+        slots = self.slot_table(self.get_department_by_year(year))
+        professors_queue = self.get_professors_by_year(year)
+
+        if rng is not None:
+            rng.shuffle(professors_queue)
+
+        started = time.perf_counter()
+        for lec_num in range(slots.count):
+            self.generate_daily_schedule(year, lec_num, professors_queue, slots)
+        self.stats.year(year)["seconds"] += time.perf_counter() - started
+
+    def generate_daily_schedule(
+        self, year: str, lec_num: int, professors_queue: list, slots: SlotTable
+    ):
+        queue_len = len(professors_queue)
+        days = self.ttlist.days
+        number_of_days = len(days)
+        day_num = 0
+        count = 0
+        attepts = 0
+        pract_attepts = 0
+        empties = 0
+        # rejections of the professors at the head of the queue, in total and
+        # up to the last placed lecture, to blame Empty Slots on
+        rejected = dict.fromkeys(REJECTIONS, 0)
+        since = rejected.copy()
+
+        def queue_next():
+            professors_queue.append(professors_queue.pop(0))
+
+        while day_num < number_of_days and count < ATTEMPT_BUDGET:
+            count += 1
+
+            # a professor teaches a year once a day, until the queue runs out
+            once_a_day = lec_num <= queue_len and attepts < queue_len
+            scheduled: bool = not once_a_day or not self.occupancy.teaches_on(
+                professors_queue[0], year, days[day_num]
+            )
+            available = self.occupancy.is_available(
+                professors_queue[0], year, days[day_num], lec_num
+            )
+
+            # logic to schedule the lectures if practicals not available in practical slot
+            if slots.is_practical(lec_num):
+                subtype = "Theory" if pract_attepts >= queue_len else "Practical"
+            else:
+                subtype = "Theory"
+
+            if available and scheduled:
+                subject = self.get_subject(professors_queue[0], year, subtype=subtype)
+                if subject:
+                    if self.get_subject_workload(
+                        professors_queue[0], year, subject, subtype
+                    ):
+                        optional_subjects = self.get_optional_subjects(
+                            professors_queue[0], year, subject, subtype
+                        )
+                        clash = optional_subjects and self.elective_rejection(
+                            optional_subjects, year, days[day_num], lec_num, once_a_day
+                        )
+
+                        # TODO: Split this into multiple functions
+                        if clash:
+                            rejected[clash] += 1
+                        elif optional_subjects:
+                            self.place_lecture(
+                                year,
+                                days[day_num],
+                                self.ttlist.lecture(
+                                    [professors_queue[0], *optional_subjects],
+                                    [subject, *optional_subjects.values()],
+                                    subtype,
+                                ),
+                            )
+                            # Note: Currently this does not reduce workload of all profs
+                            self.decrease_workload(
+                                professors_queue[0], year, subject, subtype
+                            )
+                            for opt_professor, opt_subject in optional_subjects.items():
+                                self.decrease_workload(
+                                    opt_professor, year, opt_subject, subtype
+                                )
+
+                        else:
+                            self.place_lecture(
+                                year,
+                                days[day_num],
+                                self.ttlist.lecture(
+                                    [professors_queue[0]], [subject], subtype
+                                ),
+                            )
+                            self.decrease_workload(
+                                professors_queue[0], year, subject, subtype
+                            )
+                        if not clash:
+                            day_num += 1
+                            pract_attepts = 0
+                            since = rejected.copy()
+                    else:
+                        rejected["no_workload"] += 1
+                else:
+                    rejected["no_subject"] += 1
+            elif not available:
+                rejected["busy"] += 1
+            else:
+                rejected["teaches_that_day"] += 1
+
+            if count >= ATTEMPT_BUDGET:
+                while day_num < number_of_days:
+                    self.place_lecture(year, days[day_num], None)
+                    day_num += 1
+                    empties += 1
+                    pract_attepts = 0
+
+            queue_next()
+            attepts += 1
+            pract_attepts += 1
+
+        self.stats.record_slot(year, count, rejected, since, empties)
+
+    def elective_rejection(
+        self, options: dict, year: str, day: str, lec_num: int, once_a_day: bool
+    ) -> str | None:
+        """
+        Checks the other members of an elective group before their lecture is
+        placed, the same way as the professor at the head of the queue.
+
+        Returns:
+            str | None: The rejection of the first member that can't join the
+            lecture, or None when all of them can.
+        """
+        for professor in options:
+            if not self.occupancy.is_available(professor, year, day, lec_num):
+                return "busy"
+            if once_a_day and self.occupancy.teaches_on(professor, year, day):
+                return "teaches_that_day"
+        return None
+
+    def get_subject_workload(
+        self, professor: str, year: str, subject: str, subject_type: str
+    ) -> bool:
+        """
+        Checks if a workload is available for a given professor,
+        year, subject, and subject type.
+        """
+        return self.ledger.has_workload(professor, year, subject, subject_type)
+
+    def decrease_workload(
+        self, professor: str, year: str, subject: str, subject_type: str
+    ) -> None:
+        """
+        Decreases the workload of a professor for a given subject and year.
+        If the workload value exists and is greater than 0, it decreases the workload.
+
+        Args:
+        professor (str): The name of the professor.
+        year (str): The academic year.
+        subject (str): The subject name.
+        subject_type (str): The subject type, e.g. "Core".
+
+        Returns:
+        None
+        """
+
+        self.ledger.consume(professor, year, subject, subject_type)
+
+    def get_optional_subjects(
+        self, professor: str, year: str, subject: str, subject_type: str
+    ) -> dict | None:
+        sub = self.ledger.entry(professor, year, subject, subject_type)
+        return sub.get("Options") if sub else None
+
+    def get_department_by_year(self, year: str) -> str:
+        """
+        Returns the department associated with a given year.
+
+        Returns:
+            str: The department associated with the given year.
+        """
+
+        return self.index.department(year)
+
+    def get_all_years(self) -> list:
+        """
+        return all years available in prof JSON
+        """
+        all_years = set()
+
+        for year in self.profs.values():
+            all_years.update(year.keys())
+
+        return sorted(all_years)
+
+    def update_all_years(self) -> None:
+        """
+        Updates `all_years` with the latest list of years.
+        """
+        self.all_years = self.get_all_years()
+        self.invalidate_index()
+
+    def get_all_departments(self) -> list:
+        """
+        Returns a sorted list of all departments.
+        """
+        return sorted(list(self.settings.keys()))
+
+    def update_all_departments(self) -> None:
+        """
+        Updates `all_departments` with the latest list of departments.
+        """
+        self.all_departments = self.get_all_departments()
+        self.invalidate_index()
+
+    def get_time_slots(self, department: str) -> list[str]:
+        """
+        Retrieves the time slots for a given department.
+
+        Args:
+            department (str): The department to retrieve the time slots for.
+
+        Returns:
+            list[str]: A list of time slots in the format "%H:%M %p".
+
+        """
+
+        return list(self.slot_table(department).labels)
+
+    def get_departments_by_prof(self, professor: str) -> set[str]:
+        """
+        Retrieves the departments associated with a given professor.
+
+        Args:
+            professor (str): The name of the professor.
+
+        Returns:
+            set[str]: A set of department names.
+        """
+
+        return set(self.index.professor_departments(professor))
+
+    def get_time_slots_by_prof(self, professor: str) -> list[str]:
+        """
+        Retrieves max time slots for a given professor.
+        """
+        departments = self.index.professor_departments(professor)
+        time_slots = [self.slot_table(department).labels for department in departments]
+
+        return list(max(time_slots, key=len))
+
+    def get_professor_week(self, professor: str) -> tuple[list[str], dict]:
+        """
+        Retrieves the weekly view of a professor by clock time.
+
+        The same lecture number is a different time in departments with other
+        start times or lecture lengths, so rows are the distinct clock
+        intervals of the professor's departments rather than lecture numbers.
+
+        Args:
+            professor (str): The name of the professor.
+
+        Returns:
+            tuple[list[str], dict]: The time label of every row, and the
+            (year, subject) of the lectures in every (day, row). Rows are
+            labelled by start time, or by start and end time when two of
+            them start together.
+        """
+        intervals = {
+            self.slot_table(department).interval(slot)
+            for department in self.index.professor_departments(professor)
+            if department in self.settings
+            for slot in range(self.slot_table(department).count)
+        }
+        schedule = self.get_professor_schedule(professor)
+        intervals.update(
+            self.slot_interval(year, lec_num) for _, lec_num, year, _ in schedule
+        )
+        rows = sorted(intervals)
+        row_of = {interval: row for row, interval in enumerate(rows)}
+
+        lectures: dict[tuple[str, int], list[tuple[str, str]]] = {}
+        for day, lec_num, year, subject in schedule:
+            row = row_of[self.slot_interval(year, lec_num)]
+            lectures.setdefault((day, row), []).append((year, subject))
+
+        def label(minute: int) -> str:
+            clock = dt.datetime.combine(
+                today.date(), dt.time(minute // 60, minute % 60)
+            )
+            return f"{clock:%H:%M %p}"
+
+        if len({start for start, _ in rows}) == len(rows):
+            labels = [label(start) for start, _ in rows]
+        else:
+            labels = [f"{label(start)} - {label(end)}" for start, end in rows]
+        return labels, lectures
+
+    def get_practical_slots_by_department(self, department: str):
+        """
+        Retrieves the practical slots for a given department from settings.
+        """
+
+        return list(self.slot_table(department).practical_slots)
+
+    def get_department_time(
+        self, department: str
+    ) -> tuple[dt.datetime, dt.datetime, int]:
+        """
+        Retrieves the start time, end time, and duration of a lecture
+        for a given department from settings.
+        """
+        slots = self.slot_table(department)
+        return slots.start_time, slots.end_time, slots.minutes_lecture
+
+    def tt_score_calc(self):
+        """Calculates the timetable score (filled lectures/total lectures)"""
+        empty_lecs = 0
+        total_lecs = 0
+        for year_days in self.ttlist.grid:
+            for lectures in year_days:
+                empty_lecs += lectures.count(None)
+                total_lecs += len(lectures)
+        filled_slots = total_lecs - empty_lecs
+        tt_score = (filled_slots / total_lecs) * 100 if total_lecs else 0.0
+        return empty_lecs, total_lecs, tt_score
+
+    def create_department_settings(self, department_name):
+        """Create a new department settings in settings file."""
+        if department_name not in self.settings:
+            temp = {
+                "start_time": "00:00",
+                "end_time": "01:00",
+                "minutes_lecture": 60,
+                "practical_slots": [],
+            }
+            self.settings.update({department_name: temp})
+            self.invalidate_index()
+
+    def get_years_by_department(self, department):
+        """Returns a list of years for a department"""
+        return list(self.index.years(department))
+
+    def get_professors_by_department(self, department: str) -> list:
+        """Returns a list of professors that teaches to given department"""
+        return list(self.index.department_professors(department))
+
+
+_variant_data: tuple[dict, dict] = ({}, {})
+
+
+def _init_variant_worker(profs: dict, settings: dict) -> None:
+    """Keeps the input data in a worker process, so it is only sent once."""
+    global _variant_data
+    _variant_data = (profs, settings)
+
+
+def _score_variant(seed: int | None) -> tuple[float, int | None]:
+    """Schedules one seeded variant in a worker and returns its score."""
+    profs, settings = _variant_data
+    scheduler = Scheduler(profs, settings)
+    scheduler.auto_schedule(seed=seed)
+    return scheduler.tt_score_calc()[2], seed
+
+
+def main() -> None:
+    """Builds a timetable from the command line without starting the GUI."""
+    parser = argparse.ArgumentParser(description="Headless PyAutoScheduler")
+    parser.add_argument("--profs", default="professors.json")
+    parser.add_argument("--settings", default="settings.json")
+    parser.add_argument("--output", default="timetable.json")
+    parser.add_argument("--solver", choices=["greedy", "exact"], default="greedy")
+    parser.add_argument("--time-limit", type=float, default=5.0)
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=1,
+        help="number of greedy runs with shuffled professors, across processes",
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--improve",
+        type=int,
+        default=0,
+        metavar="ITERATIONS",
+        help="run the local-search pass for this many iterations",
+    )
+    parser.add_argument("--improve-seconds", type=float, default=None)
+    parser.add_argument(
+        "--report",
+        action="store_true",
+        help="print utilisation and idle minutes of every professor",
+    )
+    parser.add_argument(
+        "--run-report",
+        metavar="FILE",
+        help="write the timings and counters of the run to this JSON file",
+    )
+    parser.add_argument(
+        "--history",
+        default="run_history.jsonl",
+        metavar="FILE",
+        help="append the run report to this JSON-lines file, '' to disable",
+    )
+    parser.add_argument(
+        "--compact-json",
+        action="store_true",
+        help="write the timetable without indentation",
+    )
+    args = parser.parse_args()
+
+    scheduler = Scheduler.from_files(args.profs, args.settings)
+    if args.solver == "greedy" and args.runs > 1:
+        best_seed, _ = scheduler.multi_start_schedule(
+            args.runs, workers=args.workers, seed=args.seed
+        )
+        print(f"Best of {args.runs} runs: seed {best_seed}")
+    else:
+        scheduler.auto_schedule(solver=args.solver, time_limit=args.time_limit)
+
+    if args.improve or args.improve_seconds:
+        before, after = scheduler.improve_schedule(
+            iterations=args.improve or 10**9, time_limit=args.improve_seconds
+        )
+        print(f"Local search raised fill rate from {before:.2f}% to {after:.2f}%")
+    store_json(args.output, scheduler.ttlist.to_json(), args.compact_json)
+
+    run_report = scheduler.run_report()
+    if args.run_report:
+        store_json(args.run_report, run_report)
+    if args.history:
+        append_run_history(run_report, args.history)
+
+    empty_lecs, total_lecs, tt_score = scheduler.tt_score_calc()
+    print(
+        f"Total Lecture Slots: {total_lecs}\nEmpty Lecture Slots: {empty_lecs}\nTimetable Score {tt_score:.2f}%"
+    )
+
+    if args.report:
+        from analytics import professor_report
+
+        for professor, stats in sorted(professor_report(scheduler).items()):
+            print(
+                f"{professor}: {stats['lectures']} lectures on {stats['days']} days, "
+                f"{stats['utilisation']:.1f}% utilised, {stats['idle_minutes']} idle minutes"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+"""
+Exact constraint-propagation solver for PyAutoScheduler.
+
+The solver treats every (year, day, slot) cell of the timetable as a variable
+whose domain is the set of lectures that can still be placed there. It runs a
+depth-first branch-and-bound search with forward checking and returns the
+timetable with the fewest Empty Slots it could find within the time limit.
+"""
+
+import time
+
+from model import Timetable
+from scheduler import SchedulingCancelled, timetable_struct
+
+EMPTY = -1
+
+
+class Course:
+    """
+    A lecture that can be placed in a year's timetable.
+
+    Elective groups are a single course taught by all of its members at once.
+    """
+
+    __slots__ = ("year", "members", "subtype", "prof_mask", "bit", "capacity")
+
+    def __init__(self, year: int, members: list, subtype: str, capacity: int) -> None:
+        self.year = year
+        self.members: list[tuple[str, str]] = members  # (professor, subject)
+        self.subtype = subtype
+        self.prof_mask = 0
+        self.bit = 0
+        self.capacity = capacity
+
+
+def collect_courses(scheduler, year: str, year_idx: int, no_of_cells: int) -> list:
+    """
+    Returns the courses of a year. An elective group is collected once and is
+    limited by the member with the least workload left; subjects without a
+    workload can fill every cell of the year.
+    """
+    courses: list[Course] = []
+    seen: set = set()
+
+    for professor in scheduler.get_professors_by_year(year):
+        for sub in scheduler.profs[professor][year]:
+            members = [(professor, sub["Subject"])]
+            members += list(sub.get("Options", {}).items())
+            key = (sub["Type"], frozenset(members))
+            if key in seen:
+                continue
+            seen.add(key)
+
+            workloads = [
+                scheduler.ledger.workload(prof, year, subject, sub["Type"])
+                for prof, subject in members
+            ]
+            workloads = [load for load in workloads if load is not None]
+            capacity = min(workloads) if workloads else no_of_cells
+            courses.append(Course(year_idx, members, sub["Type"], capacity))
+
+    return courses
+
+
+class ExactSolver:
+    """
+    Branch-and-bound search over (year, day, slot) cells that minimises
+    Empty Slots while respecting the hard constraints of the scheduler:
+
+    - a professor is never in two lectures that overlap in clock time,
+    - a subject is never scheduled more times than its `Workload`,
+    - practical lectures are only placed in the department's practical slots.
+
+    Cells are picked with the minimum-remaining-values heuristic, and every
+    assignment prunes the domains of the cells it affects (forward checking).
+    """
+
+    def __init__(self, scheduler, time_limit: float = 5.0, cancel=None) -> None:
+        self.scheduler = scheduler
+        self.time_limit = time_limit
+        self.cancel = cancel  # threading.Event that stops the search
+
+        self.years: list[str] = list(scheduler.all_years)
+        self.days: list[str] = list(timetable_struct)
+        self.prof_bits: dict[str, int] = {}
+        self.courses: list[Course] = []
+        self.year_courses: list[list[int]] = [[] for _ in self.years]
+        self.cells: list[tuple[int, int, int]] = []  # (year, day, slot)
+        self.year_cells: list[list[int]] = [[] for _ in self.years]
+        # cells of other years on the same day whose clock times overlap
+        self.conflicts: list[list[int]] = []
+        self.overlaps: list[dict[int, int]] = []
+
+        self.domain: list[int] = []
+        self.assignment: list[int | None] = []
+        self.capacity: list[int] = []
+        self.unassigned: list[int] = []
+        self.year_capacity: list[int] = []
+        self.year_day_profs: dict[tuple[int, int], int] = {}
+        self.counters: dict[str, int] = {"empties": 0}
+        self.trail: list[tuple] = []
+
+        self.best_empties: float = float("inf")
+        self.best_assignment: list[int | None] = []
+        self.nodes = 0
+        self.elapsed = 0.0
+        self.optimal = False
+
+        self._build()
+
+    def _prof_bit(self, professor: str) -> int:
+        if professor not in self.prof_bits:
+            self.prof_bits[professor] = 1 << len(self.prof_bits)
+        return self.prof_bits[professor]
+
+    def _build(self) -> None:
+        """Builds courses, cells, initial domains and course overlaps."""
+        scheduler = self.scheduler
+
+        intervals: list[tuple[int, int, int, int]] = []  # (start, end, year, slot)
+        for year_idx, year in enumerate(self.years):
+            slots = scheduler.slot_table(scheduler.get_department_by_year(year))
+            no_of_lectures = slots.count
+            no_of_cells = no_of_lectures * len(self.days)
+
+            for course in collect_courses(scheduler, year, year_idx, no_of_cells):
+                if course.capacity <= 0:
+                    continue
+                for prof, _ in course.members:
+                    course.prof_mask |= self._prof_bit(prof)
+                course.bit = 1 << len(self.year_courses[year_idx])
+                self.year_courses[year_idx].append(len(self.courses))
+                self.courses.append(course)
+
+            theory_mask = practical_mask = 0
+            for course_idx in self.year_courses[year_idx]:
+                course = self.courses[course_idx]
+                practical_mask |= course.bit
+                if course.subtype != "Practical":
+                    theory_mask |= course.bit
+
+            for slot in range(no_of_lectures):
+                for day in range(len(self.days)):
+                    cell = len(self.cells)
+                    self.cells.append((year_idx, day, slot))
+                    self.year_cells[year_idx].append(cell)
+                    self.domain.append(
+                        practical_mask if slots.is_practical(slot) else theory_mask
+                    )
+                    self.assignment.append(None)
+
+            self.unassigned.append(no_of_cells)
+            intervals.extend(
+                (*scheduler.slot_interval(year, slot), year_idx, slot)
+                for slot in range(no_of_lectures)
+            )
+            self.year_capacity.append(
+                sum(self.courses[idx].capacity for idx in self.year_courses[year_idx])
+            )
+
+        self.capacity = [course.capacity for course in self.courses]
+        self._build_conflicts(intervals)
+
+        self.year_day_profs = {
+            (year_idx, day): 0
+            for year_idx in range(len(self.years))
+            for day in range(len(self.days))
+        }
+
+        # courses of other years that share a professor with each course
+        prof_courses: dict[str, list[int]] = {}
+        for course_idx, course in enumerate(self.courses):
+            for prof, _ in course.members:
+                prof_courses.setdefault(prof, []).append(course_idx)
+
+        for course in self.courses:
+            overlap: dict[int, int] = {}
+            for prof, _ in course.members:
+                for other_idx in prof_courses[prof]:
+                    other = self.courses[other_idx]
+                    if other.year != course.year:
+                        overlap[other.year] = overlap.get(other.year, 0) | other.bit
+            self.overlaps.append(overlap)
+
+    def _build_conflicts(self, intervals: list[tuple[int, int, int, int]]) -> None:
+        """
+        Links the cells of different years that overlap in clock time on the
+        same day, sweeping over the slots sorted by start time.
+        """
+        cell_of = {
+            (year_idx, day, slot): cell
+            for cell, (year_idx, day, slot) in enumerate(self.cells)
+        }
+        self.conflicts = [[] for _ in self.cells]
+        intervals.sort()
+
+        for idx, (start, end, year_idx, slot) in enumerate(intervals):
+            for other_start, _, other_year, other_slot in intervals[idx + 1 :]:
+                if other_start >= end:
+                    break
+                if other_year == year_idx:
+                    continue
+                for day in range(len(self.days)):
+                    cell = cell_of[(year_idx, day, slot)]
+                    other = cell_of[(other_year, day, other_slot)]
+                    self.conflicts[cell].append(other)
+                    self.conflicts[other].append(cell)
+
+    def _set(self, container, key, value) -> None:
+        """Changes a value of the search state, remembering it for undo."""
+        self.trail.append((container, key, container[key]))
+        container[key] = value
+
+    def _undo(self, mark: int) -> None:
+        trail = self.trail
+        while len(trail) > mark:
+            container, key, value = trail.pop()
+            container[key] = value
+
+    def _assign(self, cell: int, value: int) -> None:
+        """Assigns a course (or EMPTY) to a cell and propagates the change."""
+        year_idx, day, _ = self.cells[cell]
+        self._set(self.assignment, cell, value)
+        self._set(self.unassigned, year_idx, self.unassigned[year_idx] - 1)
+
+        if value == EMPTY:
+            self._set(self.counters, "empties", self.counters["empties"] + 1)
+            return
+
+        course = self.courses[value]
+        key = (year_idx, day)
+        self._set(self.year_day_profs, key, self.year_day_profs[key] | course.prof_mask)
+
+        # professors of this course are busy for every other year at this time
+        overlap = self.overlaps[value]
+        for other in self.conflicts[cell]:
+            if self.assignment[other] is not None:
+                continue
+            mask = overlap.get(self.cells[other][0])
+            if mask and self.domain[other] & mask:
+                self._set(self.domain, other, self.domain[other] & ~mask)
+
+        self._set(self.capacity, value, self.capacity[value] - 1)
+        self._set(self.year_capacity, year_idx, self.year_capacity[year_idx] - 1)
+
+        # workload exhausted, the course can't be placed anywhere else
+        if self.capacity[value] == 0:
+            for other in self.year_cells[year_idx]:
+                if self.assignment[other] is None and self.domain[other] & course.bit:
+                    self._set(self.domain, other, self.domain[other] & ~course.bit)
+
+    def _lower_bound(self) -> int:
+        """Empty Slots that any completion of the current state must contain."""
+        bound = self.counters["empties"]
+        for unassigned, capacity in zip(self.unassigned, self.year_capacity):
+            if unassigned > capacity:
+                bound += unassigned - capacity
+        return bound
+
+    def _select_cell(self) -> int | None:
+        """Returns the unassigned cell with the smallest domain."""
+        best_cell = None
+        best_size = 0
+        for cell, value in enumerate(self.assignment):
+            if value is not None:
+                continue
+            size = self.domain[cell].bit_count()
+            if best_cell is None or size < best_size:
+                best_cell, best_size = cell, size
+                if size == 0:
+                    break
+        return best_cell
+
+    def _ordered_values(self, cell: int) -> list[int]:
+        """
+        Orders the domain of a cell: professors who don't teach this year on
+        this day yet come first, then practicals, then courses with the most
+        workload left. EMPTY is always tried last.
+        """
+        year_idx, day, _ = self.cells[cell]
+        domain = self.domain[cell]
+        teaching = self.year_day_profs[(year_idx, day)]
+
+        values = [
+            course_idx
+            for course_idx in self.year_courses[year_idx]
+            if domain & self.courses[course_idx].bit
+        ]
+        values.sort(
+            key=lambda course_idx: (
+                bool(self.courses[course_idx].prof_mask & teaching),
+                self.courses[course_idx].subtype != "Practical",
+                -self.capacity[course_idx],
+            )
+        )
+        values.append(EMPTY)
+        return values
+
+    def solve(self) -> bool:
+        """
+        Runs the search and returns True if the best timetable found is
+        proven optimal within the time limit.
+
+        Raises:
+            SchedulingCancelled: If the cancel event is set.
+        """
+        start = time.perf_counter()
+        deadline = start + self.time_limit
+        root_bound = self._lower_bound()
+        frames: list[list] = []  # [cell, values, next value, trail mark]
+
+        cancel = self.cancel
+        while True:
+            self.nodes += 1
+            if cancel is not None and cancel.is_set():
+                self._undo(0)
+                raise SchedulingCancelled
+            if self._lower_bound() < self.best_empties:
+                cell = self._select_cell()
+                if cell is None:
+                    self.best_empties = self.counters["empties"]
+                    self.best_assignment = list(self.assignment)
+                    if self.best_empties <= root_bound:
+                        self.optimal = True
+                        break
+                else:
+                    frames.append(
+                        [cell, self._ordered_values(cell), 0, len(self.trail)]
+                    )
+
+            if self.best_assignment and time.perf_counter() > deadline:
+                break
+
+            while frames:
+                frame = frames[-1]
+                self._undo(frame[3])
+                if frame[2] < len(frame[1]):
+                    self._assign(frame[0], frame[1][frame[2]])
+                    frame[2] += 1
+                    break
+                frames.pop()
+            else:
+                self.optimal = True
+                break
+
+        self._undo(0)
+        self.elapsed = time.perf_counter() - start
+        return self.optimal
+
+    def timetable(self) -> Timetable:
+        """Converts the best assignment into a timetable."""
+        ttlist = Timetable(self.years, self.days)
+
+        for cell, value in enumerate(self.best_assignment):
+            year_idx, day, _ = self.cells[cell]
+            lectures = ttlist.lectures(self.years[year_idx], self.days[day])
+
+            if value == EMPTY:
+                lectures.append(None)
+                continue
+
+            course = self.courses[value]
+            professors, subjects = zip(*course.members)
+            lectures.append(ttlist.lecture(professors, subjects, course.subtype))
+
+        return ttlist
+
+    def apply(self) -> None:
+        """Writes the best timetable into the scheduler and uses up workloads."""
+        scheduler = self.scheduler
+        scheduler.ttlist = self.timetable()
+        scheduler.rebuild_occupancy()
+
+        for value in self.best_assignment:
+            if value is None or value == EMPTY:
+                continue
+            course = self.courses[value]
+            year = self.years[course.year]
+            for prof, subject in course.members:
+                scheduler.decrease_workload(prof, year, subject, course.subtype)
@@ -0,0 +1,33 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmark import make_institution  # noqa: E402
+from scheduler import Scheduler  # noqa: E402
+
+
+@pytest.fixture
+def sample_scheduler() -> Scheduler:
+    """The sample professors.json and settings.json, not scheduled yet."""
+    return Scheduler.from_files(
+        os.path.join(ROOT, "professors.json"), os.path.join(ROOT, "settings.json")
+    )
+
+
+@pytest.fixture
+def mixed_lengths_scheduler() -> Scheduler:
+    """
+    A generated institution whose departments have 40, 50 and 60 minute
+    lectures and share professors, not scheduled yet.
+    """
+    return Scheduler(*make_institution(lecture_lengths=(40, 50, 60), shared=0.3))
+
+
+@pytest.fixture(params=["sample", "mixed_lengths"])
+def scheduler(request) -> Scheduler:
+    """Each of the schedulers above in turn."""
+    return request.getfixturevalue(f"{request.param}_scheduler")
@@ -0,0 +1,48 @@
+import pytest
+
+import analytics
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(analytics, "np", None)
+    return request.param
+
+
+@pytest.fixture
+def scheduled(mixed_lengths_scheduler):
+    mixed_lengths_scheduler.auto_schedule()
+    return mixed_lengths_scheduler
+
+
+def test_lectures_are_counted_across_departments(backend, scheduled):
+    scheduler = scheduled
+    report = analytics.professor_report(scheduler)
+
+    for professor, stats in report.items():
+        schedule = scheduler.get_professor_schedule(professor)
+        assert stats["lectures"] == len(schedule)
+        assert stats["days"] == len({day for day, *_ in schedule})
+
+
+def test_idle_minutes_are_measured_by_clock_time(backend, scheduled):
+    scheduler = scheduled
+    report = analytics.professor_report(scheduler)
+
+    for professor, stats in report.items():
+        idle = 0
+        for day in scheduler.ttlist.days:
+            intervals = sorted(
+                scheduler.slot_interval(year, lec_num)
+                for lec_day, lec_num, year, _ in scheduler.get_professor_schedule(
+                    professor
+                )
+                if lec_day == day
+            )
+            idle += sum(
+                second[0] - first[1] for first, second in zip(intervals, intervals[1:])
+            )
+        assert stats["idle_minutes"] == idle
@@ -0,0 +1,87 @@
+import pytest
+
+from scheduler import MAX_CSV_ERRORS, CSVImportError, read_profs_csv
+
+HEADER = "Subject,Professor,Department,College Year,Subject Type,Workload\n"
+
+
+def write(tmp_path, text: str, encoding: str = "utf-8") -> str:
+    file = tmp_path / "professors.csv"
+    file.write_text(text, encoding=encoding)
+    return str(file)
+
+
+def import_errors(tmp_path, text: str) -> CSVImportError:
+    with pytest.raises(CSVImportError) as error:
+        read_profs_csv(write(tmp_path, text))
+    return error.value
+
+
+def test_valid_rows_and_elective_groups(tmp_path):
+    profs, departments = read_profs_csv(
+        write(
+            tmp_path,
+            HEADER
+            + "Cost A/C,Indiana Jones,BAF,FY,Theory,4\n"
+            + "Law/Tax,Ada/Alan,BMS,TY,Practical,\n",
+        )
+    )
+
+    assert departments == ["BAF", "BMS"]
+    assert profs["Indiana Jones"] == {
+        "FY BAF": [{"Type": "Theory", "Workload": 4, "Subject": "Cost A/C"}]
+    }
+    assert profs["Ada"]["TY BMS"] == [
+        {"Type": "Practical", "Subject": "Law", "Options": {"Alan": "Tax"}}
+    ]
+    assert profs["Alan"]["TY BMS"][0]["Options"] == {"Ada": "Law"}
+
+
+def test_every_invalid_row_is_reported(tmp_path):
+    error = import_errors(
+        tmp_path,
+        HEADER
+        + "Maths,Ada,BAF,FY,Theory,4\n"
+        + ",Ada,BAF,,Theory,4\n"
+        + "Maths,Ada,BAF,FY,Lab,4\n"
+        + "Maths,Ada,BAF,FY,Theory,four\n"
+        + "Law,Ada/Alan,BMS,TY,Theory,2\n",
+    )
+
+    assert error.count == 4
+    assert error.errors == [
+        "Line 3: missing Subject, College Year",
+        "Line 4: Subject Type must be one of Theory, Practical",
+        "Line 5: Workload 'four' is not a whole number",
+        'Line 6: 2 professors but 1 subjects, both columns need the same number of "/"',
+    ]
+
+
+def test_missing_columns(tmp_path):
+    error = import_errors(tmp_path, "Subject,Professor\nMaths,Ada\n")
+
+    assert error.errors == [
+        "Line 1: missing columns Department, College Year, Subject Type, Workload"
+    ]
+
+
+def test_errors_past_the_limit_are_counted(tmp_path):
+    error = import_errors(
+        tmp_path, HEADER + "Maths,Ada,BAF,FY,Lab,4\n" * (MAX_CSV_ERRORS + 5)
+    )
+
+    assert error.count == MAX_CSV_ERRORS + 5
+    assert len(error.errors) == MAX_CSV_ERRORS
+    assert str(error).endswith("\n... and 5 more")
+
+
+def test_excel_encoding_falls_back_to_cp1252(tmp_path):
+    profs, _ = read_profs_csv(
+        write(
+            tmp_path,
+            HEADER + "Business Communication – I,Ada,BAF,FY,Theory,4\n",
+            "cp1252",
+        )
+    )
+
+    assert profs["Ada"]["FY BAF"][0]["Subject"] == "Business Communication – I"
@@ -0,0 +1,86 @@
+from scheduler import Scheduler
+
+SETTINGS = {
+    "IT": {
+        "start_time": "08:00",
+        "end_time": "10:00",
+        "minutes_lecture": 60,
+        "practical_slots": [],
+    }
+}
+
+
+def make_scheduler() -> Scheduler:
+    profs = {"Ada": {"FY IT": [{"Subject": "Maths", "Type": "Theory"}]}}
+    return Scheduler(profs, {dept: dict(s) for dept, s in SETTINGS.items()})
+
+
+def warm_up(scheduler: Scheduler) -> None:
+    """Fills the memoised lookups so a stale index would be noticed."""
+    for year in scheduler.all_years:
+        scheduler.get_professors_by_year(year)
+        scheduler.get_subjects_by_year(year)
+        scheduler.get_department_by_year(year)
+    for department in scheduler.all_departments:
+        scheduler.get_years_by_department(department)
+        scheduler.get_professors_by_department(department)
+    for professor in scheduler.profs:
+        scheduler.get_departments_by_prof(professor)
+
+
+def test_lookups_refresh_after_load():
+    scheduler = make_scheduler()
+    warm_up(scheduler)
+    profs = {
+        "Ada": {"FY CS": [{"Subject": "Logic", "Type": "Theory"}]},
+        "Grace": {"FY IT": [{"Subject": "Compilers", "Type": "Theory"}]},
+    }
+    settings = {"CS": dict(SETTINGS["IT"]), "IT": dict(SETTINGS["IT"])}
+
+    scheduler.load(profs, settings)
+
+    assert scheduler.get_professors_by_year("FY IT") == ["Grace"]
+    assert scheduler.get_subjects_by_year("FY CS") == [("Logic", "Theory")]
+    assert scheduler.get_department_by_year("FY CS") == "CS"
+    assert scheduler.get_years_by_department("CS") == ["FY CS"]
+    assert scheduler.get_professors_by_department("IT") == ["Grace"]
+    assert scheduler.get_departments_by_prof("Ada") == {"CS"}
+
+
+def test_lookups_refresh_after_subject_edits():
+    scheduler = make_scheduler()
+    warm_up(scheduler)
+
+    scheduler.add_subject("Grace", "SY IT", {"Subject": "Compilers", "Type": "Theory"})
+    scheduler.add_subject("Ada", "SY IT", {"Subject": "Algebra", "Type": "Theory"})
+    scheduler.update_all_years()
+
+    assert sorted(scheduler.get_professors_by_year("SY IT")) == ["Ada", "Grace"]
+    assert scheduler.get_years_by_department("IT") == ["FY IT", "SY IT"]
+    assert scheduler.get_professors_by_department("IT") == ["Ada", "Grace"]
+    assert scheduler.get_departments_by_prof("Grace") == {"IT"}
+
+    assert scheduler.remove_subject("Ada", "SY IT", "Algebra", "Theory")
+
+    assert scheduler.get_subjects_by_year("SY IT") == [("Compilers", "Theory")]
+    assert scheduler.get_subject("Ada", "SY IT", "Theory") is None
+
+
+def test_lookups_refresh_after_settings_edits():
+    scheduler = make_scheduler()
+    scheduler.add_subject("Grace", "FY CS", {"Subject": "Logic", "Type": "Theory"})
+    scheduler.update_all_years()
+    warm_up(scheduler)
+    assert scheduler.get_department_by_year("FY CS") == ""
+
+    scheduler.set_department_settings("CS", dict(SETTINGS["IT"], minutes_lecture=30))
+    scheduler.update_all_departments()
+
+    assert scheduler.get_department_by_year("FY CS") == "CS"
+    assert scheduler.get_years_by_department("CS") == ["FY CS"]
+    assert scheduler.get_departments_by_prof("Grace") == {"CS"}
+    assert scheduler.slot_interval("FY CS", 1) == (8 * 60 + 30, 9 * 60)
+
+    scheduler.set_department_settings("IT", dict(SETTINGS["IT"], start_time="09:00"))
+
+    assert scheduler.slot_interval("FY IT", 0) == (9 * 60, 10 * 60)
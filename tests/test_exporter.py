@@ -0,0 +1,22 @@
+import pytest
+
+from exporter import master_pdf_pages, write_master_pdf
+
+
+def test_master_pdf_progress_counts_pages_of_the_export(tmp_path, sample_scheduler):
+    pytest.importorskip("reportlab")
+    scheduler = sample_scheduler
+    scheduler.auto_schedule()
+    pages = master_pdf_pages(scheduler, scheduler.all_years, professors=True)
+    # a table too long for one sheet of paper
+    title, rows = pages[0]
+    pages.append(("Long", rows[:1] + rows[1:] * 10))
+
+    reported = []
+    write_master_pdf(
+        pages,
+        str(tmp_path / "all.pdf"),
+        lambda done, total, path: reported.append((done, total)),
+    )
+
+    assert reported == [(done, len(pages)) for done in range(1, len(pages) + 1)]
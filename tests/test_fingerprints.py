@@ -0,0 +1,81 @@
+import json
+
+from scheduler import Scheduler, read_json, store_json
+
+
+def grids(scheduler: Scheduler) -> dict:
+    return {year: scheduler.ttlist.year_to_json(year) for year in scheduler.ttlist}
+
+
+def test_only_the_year_with_changed_professors_is_scheduled(sample_scheduler):
+    scheduler = sample_scheduler
+    scheduler.auto_schedule()
+    fingerprints = scheduler.input_fingerprints()
+    before = grids(scheduler)
+
+    professor, years = next(iter(scheduler.profs.items()))
+    year = next(iter(years))
+    subject = years[year][0]
+    scheduler.remove_subject(professor, year, subject["Subject"], subject["Type"])
+
+    assert scheduler.changed_years(fingerprints) == [year]
+    scheduler.schedule_years([year])
+
+    after = grids(scheduler)
+    assert after[year] != before[year]
+    assert {y: grid for y, grid in after.items() if y != year} == {
+        y: grid for y, grid in before.items() if y != year
+    }
+    assert scheduler.stats.extra["kept_years"] == len(before) - 1
+
+
+def test_only_the_years_of_changed_settings_are_scheduled(sample_scheduler):
+    scheduler = sample_scheduler
+    scheduler.auto_schedule()
+    fingerprints = scheduler.input_fingerprints()
+    before = grids(scheduler)
+
+    department = "BCOM"
+    settings = dict(scheduler.settings[department], end_time="09:20")
+    scheduler.set_department_settings(department, settings)
+    changed = scheduler.changed_years(fingerprints)
+
+    assert set(changed) == set(scheduler.get_years_by_department(department))
+    scheduler.schedule_years(changed)
+
+    after = grids(scheduler)
+    for year in before:
+        if year in changed:
+            assert all(len(after[year][day]) == 3 for day in after[year])
+        else:
+            assert after[year] == before[year]
+
+
+def test_unchanged_inputs_keep_the_saved_timetable(sample_scheduler, tmp_path):
+    scheduler = sample_scheduler
+    scheduler.auto_schedule()
+    tt_file, fp_file = str(tmp_path / "tt.json"), str(tmp_path / "fp.json")
+    store_json(tt_file, scheduler.ttlist.to_json())
+    store_json(fp_file, scheduler.input_fingerprints())
+    profs_file, settings_file = str(tmp_path / "p.json"), str(tmp_path / "s.json")
+    store_json(profs_file, scheduler.profs)
+    store_json(settings_file, scheduler.settings)
+
+    restored = Scheduler.from_files(profs_file, settings_file, tt_file)
+    changed = restored.changed_years(read_json(fp_file))
+    restored.schedule_years(changed)
+
+    assert changed == []
+    assert json.dumps(restored.ttlist.to_json()) == json.dumps(
+        scheduler.ttlist.to_json()
+    )
+
+
+def test_scheduling_every_year_equals_auto_schedule(sample_scheduler):
+    scheduler = sample_scheduler
+    scheduler.auto_schedule()
+    expected = scheduler.ttlist.to_json()
+
+    scheduler.schedule_years(scheduler.all_years)
+
+    assert scheduler.ttlist.to_json() == expected
@@ -0,0 +1,113 @@
+import copy
+import json
+import os
+
+import pytest
+
+import scheduler
+from scheduler import JOURNAL_SUFFIX, JsonJournal, read_json, store_json
+
+PROFS = {
+    "Ada": {"FY IT": [{"Subject": "Maths", "Type": "Theory", "Workload": 4}]},
+    "Alan": {"SY IT": [{"Subject": "Logic", "Type": "Practical", "Workload": 2}]},
+}
+
+
+def edit(journal: JsonJournal, profs: dict) -> None:
+    """Makes the same edits in profs and in the journal."""
+    profs["Grace"] = {"FY IT": [{"Subject": "COBOL", "Type": "Theory"}]}
+    journal.set(["Grace"], profs["Grace"])
+    profs["Ada"]["FY IT"][0]["Workload"] = 5
+    journal.set(["Ada", "FY IT"], profs["Ada"]["FY IT"])
+    del profs["Alan"]
+    journal.delete(["Alan"])
+
+
+def test_journal_replays_onto_the_stored_file(tmp_path):
+    file = str(tmp_path / "professors.json")
+    profs = copy.deepcopy(PROFS)
+    store_json(file, profs)
+
+    edit(JsonJournal(file), profs)
+
+    assert json.loads((tmp_path / "professors.json").read_text()) == PROFS
+    assert read_json(file) == profs
+
+
+def test_compacted_journal_equals_store_json(tmp_path):
+    file = str(tmp_path / "professors.json")
+    expected = str(tmp_path / "expected.json")
+    profs = copy.deepcopy(PROFS)
+    store_json(file, profs)
+    journal = JsonJournal(file)
+    edit(journal, profs)
+
+    journal.compact_journal()
+
+    store_json(expected, profs)
+    assert not os.path.exists(file + JOURNAL_SUFFIX)
+    assert (tmp_path / "professors.json").read_text() == (
+        tmp_path / "expected.json"
+    ).read_text()
+    assert read_json(file) == profs
+
+    journal.set(["Ada"], {})
+    profs["Ada"] = {}
+    assert read_json(file) == profs
+
+
+def test_torn_last_change_is_dropped(tmp_path):
+    file = str(tmp_path / "professors.json")
+    store_json(file, PROFS)
+    JsonJournal(file).set(["Grace"], {})
+    with open(file + JOURNAL_SUFFIX, "a") as f:
+        f.write('{"path": ["Ada"], "val')
+
+    assert read_json(file) == dict(PROFS, Grace={})
+    journal = JsonJournal(file)
+    assert journal.changes == 1
+    journal.compact_journal()
+    assert json.loads((tmp_path / "professors.json").read_text()) == dict(
+        PROFS, Grace={}
+    )
+
+
+def test_invalid_change_in_the_middle_is_skipped(tmp_path, caplog):
+    file = str(tmp_path / "professors.json")
+    store_json(file, PROFS)
+    journal = JsonJournal(file)
+    journal.set(["Grace"], {})
+    with open(file + JOURNAL_SUFFIX, "a") as f:
+        f.write('{"path": ["Ada"], "val\n["not", "a", "change"]\n')
+    journal.delete(["Alan"])
+
+    expected = {"Ada": PROFS["Ada"], "Grace": {}}
+    assert read_json(file) == expected
+    assert "line 2" in caplog.text and "line 3" in caplog.text
+
+    journal.compact_journal()
+    assert read_json(file) == expected
+
+
+@pytest.mark.parametrize("crash_in", ["store_json", "remove"])
+def test_crash_while_storing_loads_the_new_data(tmp_path, monkeypatch, crash_in):
+    file = str(tmp_path / "professors.json")
+    store_json(file, PROFS)
+    journal = JsonJournal(file)
+    journal.set(["Grace"], {})
+    new_profs = {"Linus": {"FY IT": []}}
+
+    def crash(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    if crash_in == "store_json":
+        monkeypatch.setattr(scheduler, "store_json", crash)
+    else:
+        monkeypatch.setattr(scheduler.os, "remove", crash)
+    with pytest.raises(KeyboardInterrupt):
+        journal.store(new_profs)
+    monkeypatch.undo()
+
+    assert read_json(file) == new_profs
+    JsonJournal(file).compact_journal()
+    assert json.loads((tmp_path / "professors.json").read_text()) == new_profs
@@ -0,0 +1,71 @@
+from scheduler import Scheduler, WorkloadLedger
+
+
+def test_cursors_rotate_through_the_subjects_of_a_type():
+    profs = {
+        "Ada": {
+            "FY IT": [
+                {"Subject": "Maths", "Type": "Theory"},
+                {"Subject": "Physics", "Type": "Theory"},
+                {"Subject": "Lab", "Type": "Practical"},
+                {"Subject": "Logic", "Type": "Theory"},
+            ]
+        }
+    }
+    scheduler = Scheduler(profs, {})
+
+    picked = [scheduler.get_subject("Ada", "FY IT", "Theory") for _ in range(6)]
+
+    assert picked == ["Maths", "Physics", "Logic"] * 2
+    assert scheduler.get_subject("Ada", "FY IT", "Practical") == "Lab"
+    assert scheduler.get_subject("Ada", "SY IT", "Theory") is None
+
+    scheduler.ledger.reset()
+
+    assert scheduler.get_subject("Ada", "FY IT", "Theory") == "Maths"
+
+
+def test_cursor_skips_removed_subjects():
+    ledger = WorkloadLedger(
+        {
+            "Ada": {
+                "FY IT": [
+                    {"Subject": "Maths", "Type": "Theory"},
+                    {"Subject": "Physics", "Type": "Theory"},
+                ]
+            }
+        }
+    )
+    ledger.remove("Ada", "FY IT", "Maths", "Theory")
+
+    assert {ledger.next_subject("Ada", "FY IT", "Theory") for _ in range(3)} == {
+        "Physics"
+    }
+
+
+def test_workload_never_goes_negative(scheduler):
+    scheduler.auto_schedule()
+
+    ledger = scheduler.ledger
+    assert ledger.remaining
+    for key, remaining in ledger.remaining.items():
+        assert 0 <= remaining <= ledger.entries[key]["Workload"]
+
+    for key in list(ledger.remaining):
+        for _ in range(ledger.entries[key]["Workload"] + 2):
+            scheduler.decrease_workload(*key)
+
+        assert ledger.workload(*key) == 0
+        assert not scheduler.get_subject_workload(*key)
+
+
+def test_giving_workload_back_stops_at_profs():
+    sub = {"Subject": "Maths", "Type": "Theory", "Workload": 2}
+    ledger = WorkloadLedger({"Ada": {"FY IT": [sub]}})
+
+    ledger.consume("Ada", "FY IT", "Maths", "Theory", 5)
+    assert ledger.workload("Ada", "FY IT", "Maths", "Theory") == 0
+
+    ledger.consume("Ada", "FY IT", "Maths", "Theory", -5)
+    assert ledger.workload("Ada", "FY IT", "Maths", "Theory") == 2
+    assert sub["Workload"] == 2
@@ -0,0 +1,66 @@
+from scheduler import Scheduler
+
+
+def scanned_schedules(scheduler: Scheduler) -> dict[str, list[tuple]]:
+    """Returns the lectures of every professor found by scanning the timetable."""
+    ttlist = scheduler.ttlist
+    schedules = {professor: [] for professor in scheduler.profs}
+    for year in ttlist:
+        for day in ttlist.days:
+            for lec_num, lecture in enumerate(ttlist.lectures(year, day)):
+                for professor, subject in zip(
+                    ttlist.professor_names(lecture), ttlist.subject_names(lecture)
+                ):
+                    schedules[professor].append((day, lec_num, year, subject))
+    return {professor: sorted(lectures) for professor, lectures in schedules.items()}
+
+
+def indexed_schedules(scheduler: Scheduler) -> dict[str, list[tuple]]:
+    return {
+        professor: sorted(scheduler.get_professor_schedule(professor))
+        for professor in scheduler.profs
+    }
+
+
+def test_inverted_index_matches_the_timetable_after_scheduling(scheduler):
+    scheduler.auto_schedule()
+
+    assert indexed_schedules(scheduler) == scanned_schedules(scheduler)
+
+
+def test_inverted_index_matches_the_timetable_after_replace(sample_scheduler):
+    scheduler = sample_scheduler
+    scheduler.auto_schedule()
+    year = next(iter(scheduler.ttlist))
+    lectures = scheduler.ttlist.lectures(year, "Mon")
+    lec_num = next(i for i, lecture in enumerate(lectures) if lecture is not None)
+    professor = next(
+        prof
+        for prof in scheduler.get_professors_by_year(year)
+        if prof not in scheduler.ttlist.professor_names(lectures[lec_num])
+    )
+    subject = scheduler.profs[professor][year][0]["Subject"]
+
+    scheduler.ttlist.replace(
+        year, "Mon", lec_num, scheduler.ttlist.lecture([professor], [subject], "Theory")
+    )
+    scheduler.rebuild_occupancy()
+
+    assert (
+        "Mon",
+        lec_num,
+        year,
+        subject,
+    ) in scheduler.get_professor_schedule(professor)
+    assert indexed_schedules(scheduler) == scanned_schedules(scheduler)
+
+
+def test_inverted_index_matches_the_timetable_after_reschedule(scheduler):
+    scheduler.auto_schedule()
+    for professor in list(scheduler.profs)[:3]:
+        scheduler.reschedule(professor, "Mon")
+
+        assert scheduler.get_lec_number(professor, "Mon") == {
+            year: [] for year in scheduler.profs[professor]
+        }
+        assert indexed_schedules(scheduler) == scanned_schedules(scheduler)
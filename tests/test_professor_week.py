@@ -0,0 +1,52 @@
+from collections import Counter
+
+import pytest
+
+from exporter import prof_pdf_rows
+
+
+@pytest.fixture
+def scheduled(mixed_lengths_scheduler):
+    mixed_lengths_scheduler.auto_schedule()
+    return mixed_lengths_scheduler
+
+
+def clock(minute: int) -> str:
+    return f"{minute // 60:02}:{minute % 60:02}"
+
+
+def test_professor_week_keeps_lectures_with_the_same_number(scheduled):
+    scheduler = scheduled
+    collisions = 0
+
+    for professor in scheduler.profs:
+        schedule = scheduler.get_professor_schedule(professor)
+        times, lectures = scheduler.get_professor_week(professor)
+        collisions += len(schedule) - len({(day, num) for day, num, _, _ in schedule})
+
+        assert sum(map(len, lectures.values())) == len(schedule)
+        for day, lec_num, year, subject in schedule:
+            start, end = scheduler.slot_interval(year, lec_num)
+            rows = [
+                row
+                for row, time in enumerate(times)
+                if time.startswith(clock(start))
+                and (" - " not in time or time.split(" - ")[1].startswith(clock(end)))
+            ]
+            assert len(rows) == 1
+            assert (year, subject) in lectures[(day, rows[0])]
+
+    assert collisions, "no professor teaches one lecture number twice a day"
+
+
+def test_prof_pdf_rows_lists_every_lecture(scheduled):
+    scheduler = scheduled
+
+    for professor in scheduler.profs:
+        rows = prof_pdf_rows(scheduler, professor)
+        text = "\n".join(cell for row in rows[1:] for cell in row[1:])
+        schedule = scheduler.get_professor_schedule(professor)
+        for (year, subject), count in Counter(
+            (year, subject) for _, _, year, subject in schedule
+        ).items():
+            assert text.count(f"{year}\n{subject}") >= count
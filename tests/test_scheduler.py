@@ -0,0 +1,162 @@
+import threading
+from collections import Counter, defaultdict
+
+import pytest
+
+from scheduler import Scheduler, SchedulingCancelled
+
+
+def professor_clashes(scheduler: Scheduler) -> list[tuple]:
+    """Returns the (professor, day, interval, interval) of overlapping lectures."""
+    clashes = []
+    for day in scheduler.ttlist.days:
+        intervals = defaultdict(list)
+        for year in scheduler.ttlist:
+            for lec_num, lecture in enumerate(scheduler.ttlist.lectures(year, day)):
+                for professor in scheduler.ttlist.professor_names(lecture):
+                    intervals[professor].append(scheduler.slot_interval(year, lec_num))
+        for professor, spans in intervals.items():
+            spans.sort()
+            clashes += [
+                (professor, day, first, second)
+                for first, second in zip(spans, spans[1:])
+                if second[0] < first[1]
+            ]
+    return clashes
+
+
+def rule_violations(scheduler: Scheduler) -> list[str]:
+    """
+    Returns the lectures of a timetable that break a hard rule: a year with
+    more lectures than slots, a practical outside the practical slots or a
+    subject taught more often than its workload.
+    """
+    ttlist = scheduler.ttlist
+    violations = []
+    taught = Counter()
+
+    for year in ttlist:
+        slots = scheduler.slot_table(scheduler.get_department_by_year(year))
+        for day in ttlist.days:
+            lectures = ttlist.lectures(year, day)
+            if len(lectures) > slots.count:
+                violations.append(f"{year} {day}: {len(lectures)} lectures")
+            for lec_num, lecture in enumerate(lectures):
+                if lecture is None:
+                    continue
+                subtype = ttlist.subtype_name(lecture)
+                if subtype == "Practical" and not slots.is_practical(lec_num):
+                    violations.append(f"{year} {day} {lec_num}: practical")
+                for professor, subject in zip(
+                    ttlist.professor_names(lecture), ttlist.subject_names(lecture)
+                ):
+                    taught[professor, year, subject, subtype] += 1
+
+    for (professor, year, subject, subtype), count in taught.items():
+        for sub in scheduler.profs[professor][year]:
+            if (sub["Subject"], sub["Type"]) == (subject, subtype):
+                if count > sub.get("Workload", count):
+                    violations.append(f"{professor} {year} {subject}: {count}")
+    return violations
+
+
+def test_greedy_elective_members_never_clash(scheduler):
+    scheduler.auto_schedule()
+
+    assert any(
+        len(scheduler.ttlist.professor_names(lecture)) > 1
+        for year in scheduler.ttlist
+        for day in scheduler.ttlist.days
+        for lecture in scheduler.ttlist.lectures(year, day)
+    )
+    assert professor_clashes(scheduler) == []
+
+
+def test_exact_solver_keeps_the_hard_rules(scheduler):
+    scheduler.auto_schedule(solver="exact", time_limit=2.0)
+
+    assert scheduler.tt_score_calc()[2] > 0
+    assert professor_clashes(scheduler) == []
+    assert rule_violations(scheduler) == []
+
+
+def test_multi_start_keeps_the_best_variant(sample_scheduler):
+    scheduler = sample_scheduler
+    best_seed, best_score = scheduler.multi_start_schedule(runs=3, workers=2)
+
+    assert scheduler.tt_score_calc()[2] == best_score
+    for seed in (None, 0, 1):
+        variant = Scheduler(scheduler.profs, scheduler.settings)
+        variant.auto_schedule(seed=seed)
+        assert variant.tt_score_calc()[2] <= best_score
+
+
+def test_local_search_keeps_the_hard_rules(scheduler):
+    scheduler.auto_schedule()
+
+    before, after = scheduler.improve_schedule(iterations=5000, seed=1)
+
+    assert after > before
+    assert after == scheduler.tt_score_calc()[2]
+    assert professor_clashes(scheduler) == []
+    assert rule_violations(scheduler) == []
+
+
+def test_cancel_stops_the_exact_solver_and_local_search(sample_scheduler):
+    cancel = threading.Event()
+    cancel.set()
+    scheduler = sample_scheduler
+
+    with pytest.raises(SchedulingCancelled):
+        scheduler.auto_schedule(solver="exact", time_limit=60.0, cancel=cancel)
+
+    scheduler.auto_schedule()
+    timetable = scheduler.ttlist.to_json()
+    with pytest.raises(SchedulingCancelled):
+        scheduler.improve_schedule(iterations=10**9, cancel=cancel)
+    assert scheduler.ttlist.to_json() == timetable
+
+
+def test_reschedule_gives_lectures_to_free_professors_of_the_year(sample_scheduler):
+    scheduler = sample_scheduler
+    scheduler.auto_schedule()
+    professor = max(
+        scheduler.profs,
+        key=lambda prof: sum(map(len, scheduler.get_lec_number(prof, "Mon").values())),
+    )
+    moved = scheduler.get_lec_number(professor, "Mon")
+
+    scheduler.reschedule(professor, "Mon")
+
+    assert not any(scheduler.get_lec_number(professor, "Mon").values())
+    assert professor_clashes(scheduler) == []
+    for year, lec_nums in moved.items():
+        for lec_num in lec_nums:
+            lecture = scheduler.ttlist.lectures(year, "Mon")[lec_num]
+            for prof, subject in zip(
+                scheduler.ttlist.professor_names(lecture),
+                scheduler.ttlist.subject_names(lecture),
+            ):
+                assert subject in {
+                    sub["Subject"] for sub in scheduler.profs[prof][year]
+                }
+
+
+def test_reschedule_leaves_an_empty_slot_when_nobody_is_free():
+    settings = {
+        "IT": {
+            "start_time": "08:00",
+            "end_time": "10:00",
+            "minutes_lecture": 60,
+            "practical_slots": [],
+        }
+    }
+    profs = {"Ada": {"FY IT": [{"Subject": "Maths", "Type": "Theory"}]}}
+    scheduler = Scheduler(profs, settings)
+    scheduler.auto_schedule()
+    assert scheduler.get_lec_number("Ada", "Mon")["FY IT"]
+
+    scheduler.reschedule("Ada", "Mon")
+
+    assert scheduler.get_lec_number("Ada", "Mon")["FY IT"] == []
+    assert scheduler.ttlist.lectures("FY IT", "Mon")[0] is None